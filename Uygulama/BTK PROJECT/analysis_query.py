@@ -0,0 +1,185 @@
+from db_writer import sql_timestamp
+
+# Bileşik indeksler id ile biter: eşitlik + yaş aralığı taramasında satırlar tabloya gitmeden süzülür
+INDEX_SQL = [
+    "CREATE INDEX IF NOT EXISTS idx_analysis_emotion ON analysis_data(emotion)",
+    "CREATE INDEX IF NOT EXISTS idx_analysis_gender ON analysis_data(gender)",
+    "CREATE INDEX IF NOT EXISTS idx_analysis_gender_emotion ON analysis_data(gender, emotion)",
+    "CREATE INDEX IF NOT EXISTS idx_analysis_age_id ON analysis_data(age, id)",
+    "CREATE INDEX IF NOT EXISTS idx_analysis_gender_age_id ON analysis_data(gender, age, id)",
+    "CREATE INDEX IF NOT EXISTS idx_analysis_emotion_age_id ON analysis_data(emotion, age, id)",
+    "CREATE INDEX IF NOT EXISTS idx_analysis_timestamp_id ON analysis_data(timestamp, id)",
+]
+
+# Yukarıdakilerle aynı kolonları kapsayan eski indeksler
+OBSOLETE_INDEXES = ["idx_analysis_age", "idx_analysis_timestamp"]
+
+SELECT_COLUMNS = "id, gender, age, hair_color, eye_color, emotion, clothing_color"
+
+# Yoğunluk yoklaması: bu kadar eşleşmeden azı varsa filtre seçici sayılır ve indeksten okunur
+SELECTIVE_ROWS = 20000
+
+
+def ensure_indexes(connection):
+    """Filtre kolonları için indeksleri oluşturur (yalnızca ilk seferde sürer)."""
+    for name in OBSOLETE_INDEXES:
+        connection.execute(f"DROP INDEX IF EXISTS {name}")
+    for sql in INDEX_SQL:
+        connection.execute(sql)
+    connection.execute("PRAGMA optimize")
+    connection.commit()
+
+
+class AnalysisQuery:
+    """analysis_data üzerinde filtre + anahtar kümesi (keyset) sayfalaması.
+
+    Sayfalar `id > son_id ORDER BY id LIMIT n` ile okunur; OFFSET kullanılmaz.
+    Eşitlik filtreleri (cinsiyet/duygu) indeksleri id sırasında taradığı için her sayfa
+    sabit sürede gelir. Zaman filtresi ilk sorguda (timestamp, id) indeksinden kesin id
+    sınırlarına çevrilir, böylece tarama ilk eşleşen satırdan başlar. Yaş aralığında
+    eşleşmeler önce sınırlı bir yoklamayla sayılır: az eşleşme varsa bileşik yaş
+    indeksinden okunup sıralanır, çoksa id sırasındaki tarama kısa sürede sayfayı doldurur.
+    """
+
+    def __init__(self, connection, gender=None, emotion=None, min_age=None, max_age=None,
+                 since=None, until=None):
+        self.connection = connection
+        self.since = sql_timestamp(since) if since is not None else None
+        self.until = sql_timestamp(until) if until is not None else None
+        self.has_age = min_age is not None or max_age is not None
+        if gender is not None:
+            self.age_index = "idx_analysis_gender_age_id"
+        elif emotion is not None:
+            self.age_index = "idx_analysis_emotion_age_id"
+        else:
+            self.age_index = "idx_analysis_age_id"
+
+        # (koşul, parametre) çiftleri: eşitlik, yaş ve zaman grupları aynı sırayla birleştirilir
+        filters = [
+            ("gender = ?", gender),
+            ("emotion = ?", emotion),
+            ("age >= ?", min_age),
+            ("age <= ?", max_age),
+            ("timestamp >= ?", self.since),
+            ("timestamp < ?", self.until),
+        ]
+        filters = [(clause, value) for clause, value in filters if value is not None]
+        self.clauses = [clause for clause, _ in filters]
+        self.params = [value for _, value in filters]
+        self.where = " AND ".join(self.clauses)
+
+        # İlk sayfada çözülür: (alt id, üst id, seçici_mi)
+        self._plan = None
+
+    def _bound(self, condition, value, lowest):
+        """Zaman koşulunu sağlayan satırların kesin sınır id'si (`lowest` ise en küçüğü); eşleşme yoksa None.
+
+        Önce tablonun ilgili ucundaki SELECTIVE_ROWS satıra bakılır (filtre neredeyse tüm
+        tabloyu kapsıyorsa sınır orada bulunur). Bulunamazsa (timestamp, id) indeksinde
+        yalnızca eşleşen girdiler taranır; id'ler ekleme sırasıyla arttığından son 24 saat
+        veya bu oturum gibi filtrelerde bu birkaç milisaniyedir.
+        """
+        aggregate = "min" if lowest else "max"
+        edge = self.connection.execute(f"SELECT {aggregate}(id) FROM analysis_data").fetchone()[0]
+        if edge is None:
+            return None
+        if lowest:
+            window, window_params = "id < ?", [edge + SELECTIVE_ROWS]
+        else:
+            window, window_params = "id > ?", [edge - SELECTIVE_ROWS]
+        found = self.connection.execute(
+            f"SELECT {aggregate}(id) FROM analysis_data WHERE {window} AND {condition}",
+            window_params + [value]
+        ).fetchone()[0]
+        if found is not None:
+            return found
+        # +id, min/max'ın id sırasında tablo taramasına dönüşmesini engeller
+        return self.connection.execute(
+            f"SELECT {aggregate}(+id) FROM analysis_data INDEXED BY idx_analysis_timestamp_id WHERE {condition}",
+            [value]
+        ).fetchone()[0]
+
+    def _resolve_plan(self):
+        low, high = 0, None
+        if self.since is not None:
+            bound = self._bound("timestamp >= ?", self.since, lowest=True)
+            if bound is None:
+                return 0, 0, True
+            low = bound - 1
+        if self.until is not None:
+            bound = self._bound("timestamp < ?", self.until, lowest=False)
+            if bound is None:
+                return 0, 0, True
+            high = bound
+
+        selective = False
+        if self.has_age:
+            id_clauses = ["id > ?"] + (["id <= ?"] if high is not None else [])
+            id_params = [low] + ([high] if high is not None else [])
+            probe = self.connection.execute(
+                f"SELECT count(*) FROM (SELECT 1 FROM analysis_data INDEXED BY {self.age_index} "
+                f"WHERE {' AND '.join(id_clauses + self.clauses)} LIMIT ?)",
+                id_params + self.params + [SELECTIVE_ROWS]
+            ).fetchone()[0]
+            if probe == 0:
+                return 0, 0, True
+            selective = probe < SELECTIVE_ROWS
+        return low, high, selective
+
+    def page(self, after_id=0, limit=200):
+        """`after_id`'den sonraki en fazla `limit` satırı (id, ...) olarak döndürür."""
+        if self._plan is None:
+            self._plan = self._resolve_plan()
+        low, high, selective = self._plan
+        if high is not None and high <= low:
+            return []
+
+        clauses = ["id > ?"] + (["id <= ?"] if high is not None else [])
+        params = [max(after_id, low)] + ([high] if high is not None else [])
+        if selective:
+            # Az sayıda eşleşme: yaş indeksinden okunur, yalnızca bunlar sıralanır
+            source = f"analysis_data INDEXED BY {self.age_index}"
+            filters = self.clauses
+        else:
+            # Yaş kolonu indeks seçiminden çıkarılır; tarama id sırasında kalır ve sıralama gerekmez
+            source = "analysis_data"
+            filters = [clause.replace("age ", "+age ") for clause in self.clauses]
+        return self.connection.execute(
+            f"SELECT {SELECT_COLUMNS} FROM {source} WHERE {' AND '.join(clauses + filters)} ORDER BY id LIMIT ?",
+            params + self.params + [limit]
+        ).fetchall()
+
+    def count(self):
+        where = f"WHERE {self.where}" if self.where else ""
+        return self.connection.execute(f"SELECT COUNT(*) FROM analysis_data {where}", self.params).fetchone()[0]
+
+
+class LazyQueryResults:
+    """Sorgu sonuçlarını sonuç listesi görünümüne sayfa sayfa veren tembel imleç.
+
+    Görünüm `prefetch(n)` ile ihtiyaç duyduğu satır sayısını bildirir; yalnızca
+    eksik sayfalar okunur. `len()` şimdiye kadar yüklenen satır sayısıdır.
+    """
+
+    def __init__(self, query, page_size=200):
+        self.query = query
+        self.page_size = page_size
+        self._rows = []
+        self._last_id = 0
+        self.exhausted = False
+
+    def __len__(self):
+        return len(self._rows)
+
+    def prefetch(self, needed):
+        while not self.exhausted and len(self._rows) < needed:
+            page = self.query.page(self._last_id, self.page_size)
+            if len(page) < self.page_size:
+                self.exhausted = True
+            if page:
+                self._last_id = page[-1][0]
+                self._rows.extend(row[1:] for row in page)
+
+    def rows(self, start, stop):
+        self.prefetch(stop)
+        return self._rows[start:stop]
@@ -0,0 +1,223 @@
+"""Tkinter olmadan, klasörlerdeki resimleri paralel olarak analiz eden komut satırı aracı.
+
+Örnek:
+    python batch_analyze.py resimler/ --csv sonuc.csv --db face_analysis.db --workers 32
+"""
+import argparse
+import csv
+import multiprocessing
+import os
+import sqlite3
+import sys
+import time
+
+from db_writer import INSERT_SQL, configure_connection, db_row
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+CSV_COLUMNS = [
+    "Dosya", "Cinsiyet", "Yaş", "Saç Rengi", "Göz Rengi", "Duygu",
+    "Kıyafet Rengi", "Saç RGB", "Göz RGB", "Kıyafet RGB"
+]
+
+# Her işçi süreçte bir kez oluşturulan analiz motoru
+_analyzer = None
+
+
+def init_worker(threads_per_worker):
+    """İşçi süreci başlatır: iş parçacığı sınırlarını ayarlar ve modelleri bir kez yükler."""
+    global _analyzer
+    # Çekirdek başına bir süreç çalıştığında TF/OpenMP'nin çekirdekleri paylaşması engellenir
+    for var in ("OMP_NUM_THREADS", "TF_NUM_INTRAOP_THREADS", "TF_NUM_INTEROP_THREADS"):
+        os.environ[var] = str(threads_per_worker)
+    os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "2")
+
+    import cv2
+    from face_analyzer import FaceAnalyzer
+
+    cv2.setNumThreads(threads_per_worker)
+    _analyzer = FaceAnalyzer()
+    _analyzer.warmup()
+
+
+def analyze_paths(paths):
+    """Bir grup resmi analiz eder; tüm yüzler tek toplu çıkarımla işlenir.
+
+    Her resim için (yol, sonuçlar, hata) döndürür.
+    """
+    import cv2
+
+    outputs = []
+    frames = []
+    for path in paths:
+        try:
+            image = cv2.imread(path)
+            if image is None:
+                outputs.append((path, [], "Geçersiz resim dosyası"))
+                continue
+            frames.append((path, image, _analyzer.detector.detect(image)))
+        except Exception as e:
+            outputs.append((path, [], str(e)))
+
+    try:
+        batch_results = _analyzer.analyze_many([(image, detections) for _, image, detections in frames], draw=False)
+        outputs.extend((path, results, None) for (path, _, _), results in zip(frames, batch_results))
+    except Exception as e:
+        outputs.extend((path, [], str(e)) for path, _, _ in frames)
+    return outputs
+
+
+def iter_images(inputs):
+    """Verilen dosya/klasörlerdeki resim yollarını listeyi belleğe almadan üretir."""
+    for item in inputs:
+        if os.path.isfile(item):
+            if item.lower().endswith(IMAGE_EXTENSIONS):
+                yield item
+            continue
+        for dirpath, _, filenames in os.walk(item):
+            for filename in sorted(filenames):
+                if filename.lower().endswith(IMAGE_EXTENSIONS):
+                    yield os.path.join(dirpath, filename)
+
+
+def chunked(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def rgb_text(rgb):
+    return f"{rgb[0]},{rgb[1]},{rgb[2]}"
+
+
+class ResultSink:
+    """Sonuçları CSV ve/veya SQLite'a akış halinde yazar."""
+
+    def __init__(self, csv_path=None, db_path=None, commit_every=500, columns=CSV_COLUMNS):
+        self.csv_file = None
+        self.csv_writer = None
+        self.db_connection = None
+        self.pending_rows = []
+        self.commit_every = commit_every
+
+        if csv_path:
+            self.csv_file = open(csv_path, "w", newline="", encoding="utf-8-sig")
+            self.csv_writer = csv.writer(self.csv_file)
+            self.csv_writer.writerow(columns)
+
+        if db_path:
+            self.db_connection = sqlite3.connect(db_path)
+            configure_connection(self.db_connection)
+
+    def write(self, path, results):
+        timestamp = time.time()
+        for data in results:
+            hair_rgb, eye_rgb, clothing_rgb = data["RGB"]
+            if self.csv_writer:
+                self.csv_writer.writerow([
+                    path, data["Cinsiyet"], data["Yaş"], data["Saç Rengi"], data["Göz Rengi"],
+                    data["Duygu"], data["Kıyafet Rengi"],
+                    rgb_text(hair_rgb), rgb_text(eye_rgb), rgb_text(clothing_rgb)
+                ])
+            if self.db_connection:
+                self.pending_rows.append(db_row(data, timestamp))
+
+        if len(self.pending_rows) >= self.commit_every:
+            self.flush()
+
+    def flush(self):
+        if self.db_connection and self.pending_rows:
+            self.db_connection.executemany(INSERT_SQL, self.pending_rows)
+            self.db_connection.commit()
+            self.pending_rows = []
+        if self.csv_file:
+            self.csv_file.flush()
+
+    def close(self):
+        self.flush()
+        if self.csv_file:
+            self.csv_file.close()
+        if self.db_connection:
+            self.db_connection.close()
+
+
+def print_progress(image_count, face_count, error_count, start_time, final=False):
+    elapsed = max(time.perf_counter() - start_time, 1e-9)
+    prefix = "Tamamlandı" if final else "İlerleme"
+    print(
+        f"{prefix}: {image_count} resim, {face_count} yüz, {error_count} hata | "
+        f"{image_count / elapsed:.2f} resim/s, {face_count / elapsed:.2f} yüz/s | {elapsed:.1f} s",
+        flush=True
+    )
+
+
+def run_batch(inputs, csv_path=None, db_path=None, workers=None, threads_per_worker=1,
+              frame_batch=8, report_interval=5.0):
+    """Resimleri süreç havuzuna dağıtır, sonuçları akış halinde yazar ve sayaçları döndürür."""
+    workers = workers or os.cpu_count() or 1
+    sink = ResultSink(csv_path, db_path)
+
+    # TensorFlow fork ile güvenli değildir; her işçi temiz bir süreçte başlar
+    context = multiprocessing.get_context("spawn")
+    image_count = face_count = error_count = 0
+    start_time = time.perf_counter()
+    last_report = start_time
+
+    try:
+        with context.Pool(workers, initializer=init_worker, initargs=(threads_per_worker,)) as pool:
+            # Ölçüm havuz kurulduktan sonra başlar
+            start_time = last_report = time.perf_counter()
+            batches = chunked(iter_images(inputs), frame_batch)
+            for outputs in pool.imap_unordered(analyze_paths, batches):
+                for path, results, error in outputs:
+                    image_count += 1
+                    if error:
+                        error_count += 1
+                        print(f"Hata ({path}): {error}", file=sys.stderr)
+                    face_count += len(results)
+                    sink.write(path, results)
+
+                now = time.perf_counter()
+                if now - last_report >= report_interval:
+                    print_progress(image_count, face_count, error_count, start_time)
+                    last_report = now
+    finally:
+        sink.close()
+
+    print_progress(image_count, face_count, error_count, start_time, final=True)
+    return image_count, face_count, error_count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resim klasörlerini arayüz olmadan toplu analiz eder.")
+    parser.add_argument("inputs", nargs="+", help="Resim dosyaları veya klasörleri")
+    parser.add_argument("--csv", dest="csv_path", help="Sonuçların yazılacağı CSV dosyası")
+    parser.add_argument("--db", dest="db_path", help="Sonuçların yazılacağı SQLite veritabanı")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="İşçi süreç sayısı")
+    parser.add_argument("--threads-per-worker", type=int, default=1, help="İşçi başına TF/OpenCV iş parçacığı")
+    parser.add_argument("--frame-batch", type=int, default=8,
+                        help="İşçiye tek seferde gönderilen ve yüzleri birlikte çıkarıma giren resim sayısı")
+    parser.add_argument("--report-interval", type=float, default=5.0, help="İlerleme raporu aralığı (saniye)")
+    args = parser.parse_args(argv)
+
+    if not args.csv_path and not args.db_path:
+        parser.error("En az bir çıktı gerekli: --csv veya --db")
+
+    run_batch(
+        args.inputs,
+        csv_path=args.csv_path,
+        db_path=args.db_path,
+        workers=args.workers,
+        threads_per_worker=args.threads_per_worker,
+        frame_batch=args.frame_batch,
+        report_interval=args.report_interval
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+import logging
+import threading
+import time
+
+import cv2
+import numpy as np
+
+EMOTION_LABELS = ["angry", "disgust", "fear", "happy", "sad", "surprise", "neutral"]
+GENDER_LABELS = ["Woman", "Man"]
+
+# DeepFace model adı -> giriş boyutu (yükseklik, genişlik)
+EMBEDDING_INPUT_SIZES = {
+    "Facenet": (160, 160),
+    "Facenet512": (160, 160),
+    "VGG-Face": (224, 224),
+    "ArcFace": (112, 112),
+}
+
+# Isınma sırasında modele verilen boş girişin boyutu (yükseklik, genişlik, kanal)
+ATTRIBUTE_INPUT_SHAPES = {
+    "Emotion": (48, 48, 1),
+    "Gender": (224, 224, 3),
+    "Age": (224, 224, 3),
+    "Race": (224, 224, 3),
+}
+
+MODEL_LABELS = {"Emotion": "Duygu", "Gender": "Cinsiyet", "Age": "Yaş", "Race": "Irk"}
+
+
+def deepface():
+    """DeepFace'i (ve TensorFlow'u) ilk kullanımda içe aktarır; modül yüklemesi hızlı kalır."""
+    from deepface import DeepFace
+    return DeepFace
+
+
+def build_deepface_model(name):
+    DeepFace = deepface()
+    if name in ATTRIBUTE_INPUT_SHAPES:
+        # Yeni DeepFace sürümlerinde özellik modelleri görev adıyla istenir
+        try:
+            return DeepFace.build_model(name, task="facial_attribute")
+        except TypeError:
+            pass
+    return DeepFace.build_model(name)
+
+
+def resize_face(img, target_size):
+    """DeepFace'in resize_image adımının karşılığı: oranı koruyarak sığdırır, kenarları doldurur."""
+    factor = min(target_size[0] / img.shape[0], target_size[1] / img.shape[1])
+    dsize = (max(1, int(img.shape[1] * factor)), max(1, int(img.shape[0] * factor)))
+    img = cv2.resize(img, dsize)
+
+    diff_0 = target_size[0] - img.shape[0]
+    diff_1 = target_size[1] - img.shape[1]
+    img = np.pad(
+        img,
+        ((diff_0 // 2, diff_0 - diff_0 // 2), (diff_1 // 2, diff_1 - diff_1 // 2), (0, 0)),
+        "constant"
+    )
+    if img.shape[0:2] != tuple(target_size):
+        img = cv2.resize(img, (target_size[1], target_size[0]))
+    return img.astype(np.float32) / 255.0
+
+
+class DeepFaceBatchBackend:
+    """Bir veya birden fazla karedeki tüm yüz kesitlerini model başına tek tensörde çalıştırır.
+
+    DeepFace.analyze her yüz için ayrı ayrı üç tekli ileri geçiş yapar; burada kesitler
+    yığılır, her model bir kez (en fazla `max_batch` boyutlu parçalarla) çağrılır ve
+    çıktılar yüzlere geri dağıtılır. Model iç yapısına erişilemezse yüz başına
+    DeepFace.analyze çağrısına geri dönülür.
+    """
+
+    def __init__(self, max_batch=32):
+        self.max_batch = max_batch
+        self._models = {}
+        self._build_lock = threading.Lock()
+
+    def warmup(self, actions=("emotion", "gender", "age"), embedding_model=None):
+        for _, step in self.warmup_steps(actions, embedding_model):
+            step()
+
+    def warmup_steps(self, actions=("emotion", "gender", "age"), embedding_model=None):
+        """Isınma adımlarını (etiket, fonksiyon) olarak döndürür; ModelWarmup ile arka planda çalıştırılır."""
+        names = [action.capitalize() for action in actions]
+        if embedding_model:
+            names.append(embedding_model)
+        return [(MODEL_LABELS.get(name, name), lambda name=name: self.load(name)) for name in names]
+
+    def load(self, name):
+        """Modeli kurar ve boş bir girişle bir kez çalıştırır (ilk tahmindeki grafik kurulumunu öne alır)."""
+        model = self._model(name)
+        if name in ATTRIBUTE_INPUT_SHAPES:
+            shape = ATTRIBUTE_INPUT_SHAPES[name]
+        else:
+            shape = EMBEDDING_INPUT_SIZES.get(name, (160, 160)) + (3,)
+        model.predict_on_batch(np.zeros((1,) + shape, dtype=np.float32))
+
+    def _model(self, name):
+        if name not in self._models:
+            # Isınma iş parçacığı ile ilk analiz aynı modeli iki kez kurmasın
+            with self._build_lock:
+                if name not in self._models:
+                    built = build_deepface_model(name)
+                    # Yeni DeepFace sürümleri Keras modelini bir istemci nesnesine sarar
+                    self._models[name] = getattr(built, "model", built)
+        return self._models[name]
+
+    def _predict(self, name, batch):
+        model = self._model(name)
+        outputs = [
+            np.asarray(model.predict_on_batch(batch[i:i + self.max_batch]))
+            for i in range(0, len(batch), self.max_batch)
+        ]
+        return np.concatenate(outputs)
+
+    def analyze(self, crops, actions=("emotion", "gender", "age")):
+        """Her kesit için DeepFace.analyze benzeri bir sözlük (veya hata durumunda None) döndürür."""
+        valid = [i for i, crop in enumerate(crops) if crop is not None and crop.size > 0]
+        results = [{} if crop is not None and crop.size > 0 else None for crop in crops]
+        if not valid:
+            return results
+
+        try:
+            faces = np.stack([resize_face(crops[i], (224, 224)) for i in valid])
+
+            if "emotion" in actions:
+                gray = np.stack([cv2.resize(cv2.cvtColor(face, cv2.COLOR_BGR2GRAY), (48, 48)) for face in faces])
+                probs = self._predict("Emotion", gray[..., np.newaxis])
+                for i, p in zip(valid, probs):
+                    p = 100 * p / max(p.sum(), 1e-9)
+                    results[i]["emotion"] = dict(zip(EMOTION_LABELS, p.tolist()))
+                    results[i]["dominant_emotion"] = EMOTION_LABELS[int(np.argmax(p))]
+
+            if "gender" in actions:
+                probs = self._predict("Gender", faces)
+                for i, p in zip(valid, probs):
+                    results[i]["gender"] = dict(zip(GENDER_LABELS, (100 * p).tolist()))
+                    results[i]["dominant_gender"] = GENDER_LABELS[int(np.argmax(p))]
+
+            if "age" in actions:
+                probs = self._predict("Age", faces)
+                ages = probs @ np.arange(probs.shape[1])
+                for i, age in zip(valid, ages):
+                    results[i]["age"] = float(age)
+        except Exception as e:
+            logging.error(f"Toplu çıkarım başarısız, yüz başına analize dönülüyor: {str(e)}")
+            return [self._analyze_single(crop, actions) for crop in crops]
+
+        return results
+
+    def _analyze_single(self, crop, actions):
+        if crop is None or crop.size == 0:
+            return None
+        try:
+            return deepface().analyze(
+                crop, actions=list(actions), enforce_detection=False, detector_backend="skip", silent=True
+            )[0]
+        except Exception as e:
+            logging.error(f"DeepFace analiz hatası: {str(e)}")
+            return None
+
+    def represent(self, crops, model_name="Facenet"):
+        """Her kesit için embedding listesi (veya None) döndürür."""
+        embeddings = [None] * len(crops)
+        valid = [i for i, crop in enumerate(crops) if crop is not None and crop.size > 0]
+        if not valid:
+            return embeddings
+
+        try:
+            size = EMBEDDING_INPUT_SIZES.get(model_name, (160, 160))
+            faces = np.stack([resize_face(crops[i], size) for i in valid])
+            vectors = self._predict(model_name, faces)
+            for i, vector in zip(valid, vectors):
+                embeddings[i] = vector.tolist()
+        except Exception as e:
+            logging.error(f"Toplu embedding başarısız, yüz başına hesaplanıyor: {str(e)}")
+            for i in valid:
+                try:
+                    embeddings[i] = deepface().represent(
+                        img_path=crops[i], model_name=model_name,
+                        enforce_detection=False, detector_backend="skip"
+                    )[0]["embedding"]
+                except Exception as single_error:
+                    logging.error(f"Embedding çıkarılırken hata: {str(single_error)}")
+        return embeddings
+
+    def analyze_images(self, images, actions=("emotion", "gender", "age")):
+        """Tam resimler (yol veya BGR dizi) için DeepFace.analyze; resim başına yüz sözlükleri listesi döndürür."""
+        outputs = []
+        for image in images:
+            results = deepface().analyze(img_path=image, actions=list(actions), enforce_detection=False, silent=True)
+            outputs.append(results if isinstance(results, list) else [results])
+        return outputs
+
+    def represent_images(self, images, model_name="Facenet"):
+        """Tam resimler için DeepFace.represent (yüz DeepFace içinde bulunur); ilk yüzün embedding'ini döndürür."""
+        return [
+            deepface().represent(img_path=image, model_name=model_name, enforce_detection=False)[0]["embedding"]
+            for image in images
+        ]
+
+
+# Yalnızca StubBatchBackend için: model adı -> embedding boyutu
+EMBEDDING_DIMS = {"Facenet": 128, "Facenet512": 512, "VGG-Face": 4096, "ArcFace": 512}
+
+
+class StubBatchBackend:
+    """Model ağırlıkları olmadan DeepFaceBatchBackend arayüzünü taklit eden çıkarım katmanı.
+
+    Kamera, ağ veya TensorFlow olmadan benchmark ve çevrimdışı denemeler içindir.
+    Çıktılar kesitin piksellerinden deterministik olarak türetilir (aynı kesit aynı
+    sonucu verir); `batch_ms` + kesit başına `item_ms` gecikmesi model maliyetini taklit eder.
+    """
+
+    def __init__(self, batch_ms=0.0, item_ms=0.0):
+        self.batch_ms = batch_ms
+        self.item_ms = item_ms
+
+    def warmup(self, actions=("emotion", "gender", "age"), embedding_model=None):
+        pass
+
+    def warmup_steps(self, actions=("emotion", "gender", "age"), embedding_model=None):
+        return []
+
+    def _delay(self, count):
+        delay = (self.batch_ms + self.item_ms * count) / 1000.0
+        if delay > 0:
+            time.sleep(delay)
+
+    def analyze(self, crops, actions=("emotion", "gender", "age")):
+        valid = [crop is not None and crop.size > 0 for crop in crops]
+        self._delay(sum(valid))
+        results = []
+        for crop, ok in zip(crops, valid):
+            if not ok:
+                results.append(None)
+                continue
+            means = cv2.resize(crop, (2, 2), interpolation=cv2.INTER_AREA).reshape(-1).astype(np.float64)
+            result = {}
+            if "emotion" in actions:
+                p = np.resize(means, len(EMOTION_LABELS)) + 1.0
+                p = 100 * p / p.sum()
+                result["emotion"] = dict(zip(EMOTION_LABELS, p.tolist()))
+                result["dominant_emotion"] = EMOTION_LABELS[int(np.argmax(p))]
+            if "gender" in actions:
+                man = 100 * means[0] / 255.0
+                result["gender"] = {"Woman": 100 - man, "Man": man}
+                result["dominant_gender"] = "Man" if man >= 50 else "Woman"
+            if "age" in actions:
+                result["age"] = 15 + 50 * means[1] / 255.0
+            results.append(result)
+        return results
+
+    def represent(self, crops, model_name="Facenet"):
+        dim = EMBEDDING_DIMS.get(model_name, 128)
+        embeddings = []
+        valid = 0
+        for crop in crops:
+            if crop is None or crop.size == 0:
+                embeddings.append(None)
+                continue
+            valid += 1
+            gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY) if crop.ndim == 3 else crop
+            vector = cv2.resize(gray, (16, dim // 16), interpolation=cv2.INTER_AREA).reshape(-1).astype(np.float32)
+            vector -= vector.mean()
+            embeddings.append(vector.tolist())
+        self._delay(valid)
+        return embeddings
+
+    def analyze_images(self, images, actions=("emotion", "gender", "age")):
+        images = [cv2.imread(image) if isinstance(image, str) else image for image in images]
+        return [[result] if result is not None else [] for result in self.analyze(images, actions)]
+
+    def represent_images(self, images, model_name="Facenet"):
+        images = [cv2.imread(image) if isinstance(image, str) else image for image in images]
+        return self.represent(images, model_name)
@@ -0,0 +1,161 @@
+"""Baskın renk motorunu eski KMeans(n_init=10) yöntemiyle karşılaştırır.
+
+Hız farkını ve renk kaymasını (RGB uzayında Öklid mesafesi) raporlar.
+Resim klasörü verilmezse sentetik saç/göz/kıyafet bölgeleri kullanılır.
+
+Örnek:
+    python bench_colors.py --regions 300
+    python bench_colors.py --images resimler/ --json bench_colors.json
+"""
+import argparse
+import json
+import os
+import time
+
+import cv2
+import numpy as np
+from sklearn.cluster import KMeans
+
+from color_engine import DominantColorEngine
+
+
+def kmeans_dominant_color(image, k=3):
+    """face_app.py'deki eski detect_dominant_color uygulamasının birebir kopyası."""
+    if image.size == 0:
+        return (0, 0, 0)
+    img = cv2.cvtColor(image, cv2.COLOR_BGR2RGB).reshape((-1, 3))
+    kmeans = KMeans(n_clusters=k, n_init=10)
+    kmeans.fit(img)
+    counts = np.bincount(kmeans.labels_)
+    dominant_color = kmeans.cluster_centers_[np.argmax(counts)].astype(int)
+    return tuple(dominant_color)
+
+
+def synthetic_frame(rng, faces=3, size=(480, 640)):
+    """Gürültülü renk lekelerinden oluşan bir kare ve her yüz için 3 bölge üretir."""
+    h, w = size
+    frame = rng.integers(0, 256, size=(h, w, 3), dtype=np.uint8)
+    boxes = []
+    for _ in range(faces):
+        fw = int(rng.integers(60, 140))
+        fx = int(rng.integers(0, w - fw))
+        fy = int(rng.integers(fw, h - fw * 2))
+        for (x1, y1, x2, y2) in (
+            (fx, fy - int(fw * 0.6), fx + fw, fy),
+            (fx + int(fw * 0.2), fy + int(fw * 0.2), fx + int(fw * 0.8), fy + int(fw * 0.4)),
+            (fx, fy + fw, fx + fw, fy + fw + int(fw * 0.5)),
+        ):
+            # Bölgenin büyük kısmı tek renk, geri kalanı ikinci bir renk + gürültü
+            main = rng.integers(0, 256, size=3)
+            other = rng.integers(0, 256, size=3)
+            region = frame[y1:y2, x1:x2]
+            noise = rng.normal(0, 12, size=region.shape)
+            split = int(region.shape[0] * 0.3)
+            region[:split] = np.clip(other + noise[:split], 0, 255)
+            region[split:] = np.clip(main + noise[split:], 0, 255)
+            boxes.append((x1, y1, x2, y2))
+    return frame, boxes
+
+
+def load_frames(folder, analyzer_boxes):
+    """Klasördeki resimlerde Haar ile yüz bulur ve analiz bölgelerini döndürür."""
+    cascade = cv2.CascadeClassifier(cv2.data.haarcascades + "haarcascade_frontalface_default.xml")
+    for filename in sorted(os.listdir(folder)):
+        if not filename.lower().endswith((".jpg", ".jpeg", ".png", ".bmp")):
+            continue
+        image = cv2.imread(os.path.join(folder, filename))
+        if image is None:
+            continue
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        faces = cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(30, 30))
+        boxes = [box for face in faces for box in analyzer_boxes(face)]
+        if boxes:
+            yield image, boxes
+
+
+def face_boxes(face):
+    x, y, w, h = face
+    return [
+        (x, max(0, y - int(h * 0.6)), x + w, y),
+        (x + int(w * 0.2), y + int(h * 0.2), x + int(w * 0.8), y + int(h * 0.4)),
+        (x, y + h, x + w, y + h + int(h * 0.5)),
+    ]
+
+
+def crop(image, box):
+    x1, y1, x2, y2 = box
+    return image[max(0, y1):max(0, y2), max(0, x1):max(0, x2)]
+
+
+def run(frames, engines):
+    frames = list(frames)
+    region_count = sum(len(boxes) for _, boxes in frames)
+
+    start = time.perf_counter()
+    reference = [[kmeans_dominant_color(crop(image, box)) for box in boxes] for image, boxes in frames]
+    kmeans_time = time.perf_counter() - start
+
+    report = {
+        "regions": region_count,
+        "frames": len(frames),
+        "kmeans": {"seconds": kmeans_time, "ms_per_region": 1000 * kmeans_time / max(region_count, 1)},
+    }
+
+    for name, engine in engines.items():
+        start = time.perf_counter()
+        colors = [engine.dominant_colors(image, boxes) for image, boxes in frames]
+        elapsed = time.perf_counter() - start
+
+        drift = np.array([
+            np.linalg.norm(np.subtract(a, b, dtype=float))
+            for ref_frame, frame_colors in zip(reference, colors)
+            for a, b in zip(ref_frame, frame_colors)
+        ])
+        report[name] = {
+            "seconds": elapsed,
+            "ms_per_region": 1000 * elapsed / max(region_count, 1),
+            "speedup": kmeans_time / max(elapsed, 1e-9),
+            "drift_mean": float(drift.mean()) if drift.size else 0.0,
+            "drift_p95": float(np.percentile(drift, 95)) if drift.size else 0.0,
+            "within_20": float((drift <= 20).mean()) if drift.size else 0.0,
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Baskın renk motoru karşılaştırması")
+    parser.add_argument("--images", help="Gerçek resimlerin bulunduğu klasör (isteğe bağlı)")
+    parser.add_argument("--regions", type=int, default=300, help="Sentetik bölge sayısı")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", dest="json_path", help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args()
+
+    if args.images:
+        frames = load_frames(args.images, face_boxes)
+    else:
+        rng = np.random.default_rng(args.seed)
+        frames = [synthetic_frame(rng) for _ in range(max(1, args.regions // 9))]
+
+    engines = {
+        "histogram": DominantColorEngine(method="histogram"),
+        "kmeans_batched": DominantColorEngine(method="kmeans"),
+    }
+    report = run(frames, engines)
+
+    print(f"{report['regions']} bölge, {report['frames']} kare")
+    print(f"KMeans(n_init=10): {report['kmeans']['ms_per_region']:.2f} ms/bölge")
+    for name in engines:
+        r = report[name]
+        print(
+            f"{name}: {r['ms_per_region']:.3f} ms/bölge | {r['speedup']:.1f}x hızlı | "
+            f"kayma ort. {r['drift_mean']:.1f}, p95 {r['drift_p95']:.1f}, "
+            f"%{100 * r['within_20']:.1f} bölge 20 birim içinde"
+        )
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
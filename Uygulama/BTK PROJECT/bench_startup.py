@@ -0,0 +1,132 @@
+"""Uygulamaların açılış süresini ölçer: pencereye kadar geçen süre ve ilk sonuç süresi.
+
+Her ölçüm yeni bir Python sürecinde yapılır (soğuk içe aktarma). Süreler sürecin
+başlatıldığı andan itibaren sayılır:
+  - import     : uygulama modülünün içe aktarılması
+  - window     : pencerenin oluşturulup ilk kez çizilmesi
+  - warmup     : arka plan model ısınmasının bitmesi
+  - first      : ilk analiz sonucunun alınması (ısınma sürerken istenir)
+Ekran (DISPLAY) gerektirir. Çalışma dizini geçici bir klasördür; veritabanı vb. orada oluşur.
+
+Örnek:
+    python bench_startup.py --runs 3
+    python bench_startup.py --target app --image yuz.jpg --json bench_startup.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+IMAGES_DIR = os.path.join(HERE, "..", "images")
+
+
+def load_image(path):
+    import cv2
+
+    if path:
+        image = cv2.imread(path)
+        if image is None:
+            raise SystemExit(f"Resim okunamadı: {path}")
+        return image
+    # Sentetik yüz boyutunda kesit (modelleri çalıştırmak için yeterli)
+    return np.random.default_rng(0).integers(0, 256, size=(224, 224, 3), dtype=np.uint8)
+
+
+def child(target, image_path, started):
+    """Yeni süreçte çalışır: uygulamayı açar, süreleri JSON olarak yazdırır."""
+    sys.path.insert(0, HERE)
+    sys.path.insert(0, IMAGES_DIR)
+    os.makedirs("images", exist_ok=True)
+    timings = {}
+
+    import tkinter as tk
+    if target == "face_app":
+        import face_app
+        timings["import"] = time.time() - started
+        root = tk.Tk()
+        app = face_app.ModernFaceAnalysisApp(root)
+        close = app.on_closing
+
+        def first_result(image):
+            return app.analyzer.analyze_attributes([image])
+    else:
+        import app as app_module
+        timings["import"] = time.time() - started
+        root = tk.Tk()
+        app = app_module.DeepFaceApp(root)
+
+        def close():
+            app.gallery.stop()
+            root.destroy()
+
+        def first_result(image):
+            from batch_inference import deepface
+            return deepface().analyze(image, actions=["age", "gender", "race", "emotion"], enforce_detection=False)
+
+    root.update()
+    timings["window"] = time.time() - started
+
+    image = load_image(image_path)
+    first_result(image)
+    timings["first"] = time.time() - started
+    app.model_warmup.wait()
+    timings["warmup"] = time.time() - started
+    timings["warmup_error"] = app.model_warmup.error
+
+    close()
+    print(json.dumps(timings))
+
+
+def run_once(target, image_path):
+    with tempfile.TemporaryDirectory() as workdir:
+        command = [sys.executable, os.path.abspath(__file__), "--child", "--target", target,
+                   "--started", repr(time.time())]
+        if image_path:
+            command += ["--image", os.path.abspath(image_path)]
+        output = subprocess.run(command, cwd=workdir, capture_output=True, text=True)
+    if output.returncode != 0:
+        raise SystemExit(f"Ölçüm başarısız:\n{output.stderr.strip()}")
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Açılış süresi ölçümü")
+    parser.add_argument("--target", choices=["face_app", "app"], default="face_app")
+    parser.add_argument("--image", help="İlk analizde kullanılacak resim (varsayılan: sentetik)")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--json", dest="json_path", help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--started", type=float, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.target, args.image, args.started)
+        return
+
+    runs = [run_once(args.target, args.image) for _ in range(args.runs)]
+    report = {"target": args.target, "runs": runs}
+    for key in ("import", "window", "first", "warmup"):
+        report[key] = float(np.median([r[key] for r in runs]))
+
+    print(f"{args.target}: {args.runs} ölçüm (medyan)")
+    print(f"  içe aktarma     : {report['import']:.2f} sn")
+    print(f"  pencere         : {report['window']:.2f} sn")
+    print(f"  ilk sonuç       : {report['first']:.2f} sn")
+    print(f"  modeller hazır  : {report['warmup']:.2f} sn")
+    errors = {r["warmup_error"] for r in runs if r["warmup_error"]}
+    if errors:
+        print(f"  ısınma hataları : {', '.join(errors)}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,349 @@
+"""Analiz sıcak yollarının kamera ve ağ gerektirmeyen, tekrarlanabilir benchmark paketi.
+
+Kapsanan yollar:
+  - analyze_faces / analyze_detections (tespit + renkler + model katmanı)
+  - detect_dominant_color ve toplu renk çıkarımı
+  - get_eye_color_name / get_hair_color_name
+  - toplu.recognize_face(s), 10 ile 100k arası galeri boyutlarında
+  - save_to_db yolu (AnalysisDbWriter) ve save_dataset yolu (CSV/JSONL/Parquet/Arrow)
+  - önizleme dönüşümü (PreviewRenderer.convert)
+
+Model ağırlıkları varsayılan olarak kullanılmaz (StubBatchBackend); `--backend deepface`
+gerçek modelleri çalıştırır. Kareler sabit tohumla sentetik üretilir veya `--images`
+klasöründen okunur. Sonuçlar JSON olarak yazılır; `--compare` önceki bir çalıştırmayla
+medyan süreleri karşılaştırır ve `--tolerance` üzerindeki gerilemelerde 1 ile çıkar.
+
+Örnek:
+    python bench_suite.py --json bench.json
+    python bench_suite.py --quick --cases recognize,preview
+    python bench_suite.py --json yeni.json --compare bench.json --tolerance 0.15
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "images"))
+
+from batch_inference import DeepFaceBatchBackend, StubBatchBackend
+from db_writer import AnalysisDbWriter
+from embedding_index import EmbeddingIndex
+from exporters import EXPORTERS
+from face_analyzer import FaceAnalyzer
+from face_detection import DetectedFace
+from preview_renderer import PreviewRenderer
+from result_store import ResultStore
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+
+
+def measure(fn, repeat, warmup=1, items=1):
+    """`fn`'i `warmup` kez ısıtıp `repeat` kez ölçer; süreler milisaniyedir."""
+    for _ in range(warmup):
+        fn()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    ms = 1000 * np.array(times)
+    p50 = float(np.median(ms))
+    return {
+        "repeat": repeat,
+        "items": items,
+        "mean_ms": float(ms.mean()),
+        "p50_ms": p50,
+        "p95_ms": float(np.percentile(ms, 95)),
+        "min_ms": float(ms.min()),
+        "items_per_s": items / (p50 / 1000) if p50 > 0 else 0.0,
+    }
+
+
+# --- Veri üretimi ---
+
+def synthetic_frame(rng, faces=3, size=(480, 640)):
+    """Gürültülü arka plan üzerinde yüz boyutlu düz renkli bölgeler ve kutuları."""
+    h, w = size
+    frame = rng.integers(0, 256, size=(h, w, 3), dtype=np.uint8)
+    boxes = []
+    for _ in range(faces):
+        fw = int(rng.integers(80, 140))
+        x = int(rng.integers(0, w - fw))
+        y = int(rng.integers(fw // 2, h - 2 * fw))
+        frame[y:y + fw, x:x + fw] = rng.integers(60, 220, size=3, dtype=np.uint8)
+        boxes.append((x, y, fw, fw))
+    return frame, boxes
+
+
+def load_frames(folder, limit=50):
+    paths = sorted(p for p in os.listdir(folder) if p.lower().endswith(IMAGE_EXTENSIONS))[:limit]
+    frames = [cv2.imread(os.path.join(folder, p)) for p in paths]
+    return [f for f in frames if f is not None]
+
+
+def synthetic_results(rng, count):
+    """face_app'in kaydettiği biçimde sonuç sözlükleri."""
+    genders = ["Man", "Woman"]
+    emotions = ["angry", "disgust", "fear", "happy", "sad", "surprise", "neutral"]
+    colors = ["Siyah", "Kahverengi", "Sarışın", "Kızıl", "Bilinmiyor", "Mavi", "Yeşil"]
+    rgb = rng.integers(0, 256, size=(count, 3, 3))
+    results = []
+    for i in range(count):
+        hair, eye, clothing = (tuple(int(c) for c in part) for part in rgb[i])
+        results.append({
+            "Cinsiyet": genders[i % 2],
+            "Yaş": int(rng.integers(10, 80)),
+            "Saç Rengi": colors[i % len(colors)],
+            "Göz Rengi": colors[(i * 3) % len(colors)],
+            "Duygu": emotions[i % len(emotions)],
+            "Kıyafet Rengi": f"RGB({clothing[0]}, {clothing[1]}, {clothing[2]})",
+            "RGB": (hair, eye, clothing),
+        })
+    return results
+
+
+# --- Benchmark durumları ---
+
+def bench_analysis(report, analyzer, frames, boxes, args):
+    # Tespit dahil uçtan uca (sentetik karelerde Haar genellikle yüz bulmaz; yalnızca tespit maliyeti)
+    found = sum(len(analyzer.detector.detect(frame)) for frame in frames)
+    report["analyze_faces"] = measure(
+        lambda: [analyzer.analyze_faces(frame.copy(), draw=False) for frame in frames],
+        args.repeat, items=len(frames)
+    )
+    report["analyze_faces"]["faces_found"] = found
+
+    # Sabit tespitlerle yüz başına yol (renkler + model katmanı + sınıflandırma)
+    detections = [
+        [DetectedFace(box, frame[box[1]:box[1] + box[3], box[0]:box[0] + box[2]].copy(), []) for box in frame_boxes]
+        for frame, frame_boxes in zip(frames, boxes)
+    ]
+    faces = sum(len(d) for d in detections)
+    report["analyze_detections"] = measure(
+        lambda: [analyzer.analyze_detections(frame, dets, draw=False) for frame, dets in zip(frames, detections)],
+        args.repeat, items=faces
+    )
+    report["analyze_many"] = measure(
+        lambda: analyzer.analyze_many(list(zip(frames, detections)), draw=False),
+        args.repeat, items=faces
+    )
+
+
+def bench_colors(report, analyzer, frames, boxes, args):
+    regions = [
+        frame[y:y + h, x:x + w]
+        for frame, frame_boxes in zip(frames, boxes)
+        for x, y, w, h in frame_boxes
+    ]
+    report["detect_dominant_color"] = measure(
+        lambda: [analyzer.detect_dominant_color(region) for region in regions],
+        args.repeat, items=len(regions)
+    )
+    report["extract_face_colors"] = measure(
+        lambda: [analyzer.extract_face_colors(frame, frame_boxes) for frame, frame_boxes in zip(frames, boxes)],
+        args.repeat, items=3 * len(regions)
+    )
+
+    rgbs = [tuple(int(c) for c in rgb) for rgb in np.random.default_rng(args.seed).integers(0, 256, size=(10000, 3))]
+    report["get_eye_color_name"] = measure(
+        lambda: [analyzer.get_eye_color_name(rgb) for rgb in rgbs], args.repeat, items=len(rgbs)
+    )
+    report["get_hair_color_name"] = measure(
+        lambda: [analyzer.get_hair_color_name(rgb) for rgb in rgbs], args.repeat, items=len(rgbs)
+    )
+
+
+def bench_recognize(report, args):
+    import toplu
+
+    rng = np.random.default_rng(args.seed)
+    queries = [rng.standard_normal(128).astype(np.float32).tolist() for _ in range(8)]
+    for size in args.gallery_sizes:
+        vectors = rng.standard_normal((size, 128)).astype(np.float32)
+        index = EmbeddingIndex(metric="cosine")
+        index.add_many([f"kisi_{i % max(1, size // 3)}" for i in range(size)], vectors)
+        toplu.face_index = index
+
+        report[f"recognize_face[{size}]"] = measure(
+            lambda: [toplu.recognize_face(q) for q in queries], args.repeat, items=len(queries)
+        )
+        report[f"recognize_faces[{size}]"] = measure(
+            lambda: toplu.recognize_faces(queries), args.repeat, items=len(queries)
+        )
+
+
+def bench_storage(report, args, workdir):
+    rng = np.random.default_rng(args.seed)
+    results = synthetic_results(rng, args.rows)
+
+    # save_to_db: kamera gibi 10'arlı gönderim + flush (face_app.save_to_db bunu bekler)
+    def save_to_db():
+        path = os.path.join(workdir, f"bench_{time.perf_counter_ns()}.db")
+        writer = AnalysisDbWriter(path)
+        now = time.time()
+        for i in range(0, len(results), 10):
+            writer.submit(results[i:i + 10], now)
+        writer.flush()
+        writer.close()
+        os.remove(path)
+
+    report["save_to_db"] = measure(save_to_db, args.repeat, items=len(results))
+
+    store = ResultStore(capacity=max(len(results), 1))
+    store.extend(results)
+    for extension, exporter_cls in EXPORTERS.items():
+        path = os.path.join(workdir, f"bench{extension}")
+
+        def export():
+            with exporter_cls(path) as exporter:
+                exporter.sync(store)
+
+        try:
+            report[f"save_dataset{extension}"] = measure(export, args.repeat, items=len(results))
+            report[f"save_dataset{extension}"]["bytes"] = os.path.getsize(path)
+        except ImportError as e:
+            report[f"save_dataset{extension}"] = {"skipped": str(e)}
+    store.close()
+
+
+def bench_preview(report, args):
+    rng = np.random.default_rng(args.seed)
+    for width, height in ((640, 480), (1280, 720), (1920, 1080)):
+        frame = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+        renderer = PreviewRenderer(None, None, (960, 540))
+        report[f"preview_convert[{width}x{height}]"] = measure(
+            lambda: renderer.convert(frame), args.repeat * 20, items=1
+        )
+
+
+CASES = {
+    "analysis": bench_analysis,
+    "colors": bench_colors,
+    "recognize": bench_recognize,
+    "storage": bench_storage,
+    "preview": bench_preview,
+}
+
+
+def environment(args):
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE,
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "opencv": cv2.__version__,
+        "backend": args.backend,
+        "seed": args.seed,
+        "repeat": args.repeat,
+    }
+
+
+def compare(report, baseline_path, tolerance):
+    """Medyan süreleri karşılaştırır; gerileyen durumların listesini döndürür."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    regressions = []
+    print(f"\nKarşılaştırma: {baseline_path} (tolerans %{100 * tolerance:.0f})")
+    for name, result in report.items():
+        old = baseline.get(name, {})
+        if "p50_ms" not in result or "p50_ms" not in old:
+            continue
+        ratio = result["p50_ms"] / old["p50_ms"] if old["p50_ms"] > 0 else 1.0
+        flag = ""
+        if ratio > 1 + tolerance:
+            flag = "  <-- GERİLEME"
+            regressions.append(name)
+        print(f"  {name:36s} {old['p50_ms']:10.3f} -> {result['p50_ms']:10.3f} ms  x{ratio:.2f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Çevrimdışı analiz benchmark paketi")
+    parser.add_argument("--cases", default=",".join(CASES), help=f"Virgülle ayrılmış: {', '.join(CASES)}")
+    parser.add_argument("--backend", choices=["stub", "deepface"], default="stub")
+    parser.add_argument("--stub-item-ms", type=float, default=0.0, help="Stub modelde kesit başına gecikme")
+    parser.add_argument("--images", help="Gerçek karelerin bulunduğu klasör (isteğe bağlı)")
+    parser.add_argument("--frames", type=int, default=20, help="Sentetik kare sayısı")
+    parser.add_argument("--gallery-sizes", default="10,100,1000,10000,100000")
+    parser.add_argument("--rows", type=int, default=20000, help="Kayıt/dışa aktarma satır sayısı")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--quick", action="store_true", help="Küçük boyutlarla hızlı çalıştırma")
+    parser.add_argument("--json", dest="json_path", help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument("--compare", help="Karşılaştırılacak önceki JSON sonucu")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="İzin verilen medyan artışı (0.2 = %%20)")
+    args = parser.parse_args()
+
+    args.gallery_sizes = [int(s) for s in args.gallery_sizes.split(",") if s]
+    if args.quick:
+        args.frames = min(args.frames, 5)
+        args.rows = min(args.rows, 2000)
+        args.repeat = min(args.repeat, 3)
+        args.gallery_sizes = [s for s in args.gallery_sizes if s <= 10000]
+    cases = [c.strip() for c in args.cases.split(",") if c.strip()]
+    unknown = [c for c in cases if c not in CASES]
+    if unknown:
+        parser.error(f"Bilinmeyen durum: {', '.join(unknown)}")
+
+    rng = np.random.default_rng(args.seed)
+    if args.images:
+        frames = load_frames(args.images)
+        detector = FaceAnalyzer().detector
+        boxes = [[d.box for d in detector.detect(frame)] for frame in frames]
+    else:
+        frames, boxes = zip(*(synthetic_frame(rng) for _ in range(args.frames)))
+
+    backend = StubBatchBackend(item_ms=args.stub_item_ms) if args.backend == "stub" else DeepFaceBatchBackend()
+    analyzer = FaceAnalyzer(backend=backend)
+    backend.warmup()
+
+    report = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for case in cases:
+            started = time.perf_counter()
+            if case in ("analysis", "colors"):
+                CASES[case](report, analyzer, list(frames), list(boxes), args)
+            elif case == "storage":
+                CASES[case](report, args, workdir)
+            else:
+                CASES[case](report, args)
+            print(f"[{case}] {time.perf_counter() - started:.1f} sn")
+
+    print()
+    for name, result in report.items():
+        if "skipped" in result:
+            print(f"{name:38s} atlandı: {result['skipped']}")
+        else:
+            print(f"{name:38s} p50 {result['p50_ms']:10.3f} ms | p95 {result['p95_ms']:10.3f} ms | "
+                  f"{result['items_per_s']:12.1f} öğe/sn")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"environment": environment(args), "results": report}, f, indent=2, ensure_ascii=False)
+
+    if args.compare:
+        regressions = compare(report, args.compare, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} durumda gerileme: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
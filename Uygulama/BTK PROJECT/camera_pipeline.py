@@ -0,0 +1,227 @@
+import collections
+import itertools
+import logging
+import queue
+import threading
+import time
+
+import cv2
+
+from instrumentation import DISABLED_TIMER
+
+
+class LatestQueue:
+    """Sınırlı kuyruk: doluysa en eski eleman atılır (son kare kazanır)."""
+
+    def __init__(self, maxsize=1):
+        self._queue = queue.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def put(self, item):
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def get(self, timeout=None):
+        return self._queue.get(timeout=timeout)
+
+    def get_nowait(self):
+        return self._queue.get_nowait()
+
+
+class RateCounter:
+    """Son birkaç saniyedeki olay hızını (olay/s) ölçer."""
+
+    def __init__(self, window=2.0):
+        self.window = window
+        self._times = collections.deque()
+
+    def tick(self, now=None):
+        now = now if now is not None else time.perf_counter()
+        self._times.append(now)
+        while self._times and now - self._times[0] > self.window:
+            self._times.popleft()
+
+    def rate(self):
+        if len(self._times) < 2:
+            return 0.0
+        span = self._times[-1] - self._times[0]
+        return (len(self._times) - 1) / span if span > 0 else 0.0
+
+
+class CameraPipeline:
+    """Yakalama, çıkarım ve çizim aşamalarını ayıran canlı kamera hattı.
+
+    - Yakalama iş parçacığı kameradan sürekli okur (sürücü tamponunda bayat kare birikmez).
+    - `workers` adet çıkarım iş parçacığı, sınırlı kuyruktan en yeni kareyi alıp
+      `process_fn(seq, frame)` çağırır. Kuyruk doluysa en eski kare atılır.
+    - Çizim aşaması `display_fps` hızında en yeni kareyi, eldeki en yeni çıkarım
+      sonucuyla birlikte `render_fn(frame, overlay)` ile gösterir. Böylece ekran hızı
+      çıkarım hızından bağımsızdır.
+
+    process_fn, (overlay, payload) döndürür; overlay çizim için saklanır, payload
+    `on_result` ile iletilir. None dönerse kare atlanır. Daha yeni bir karenin sonucu
+    zaten varsa eski sonuçlar atılır. Kamera okunamazsa `on_stop` çağrılır.
+    Uçtan uca gecikme, çizilen sonucun ait olduğu karenin yakalanma anından ekrana
+    verilme anına kadar ölçülür. `timer` (StageTimer) verilirse yakalama, çizim ve
+    uçtan uca süreler de aşama olarak kaydedilir.
+    """
+
+    def __init__(self, source, process_fn, render_fn, on_result=None, on_stop=None, workers=1,
+                 queue_size=1, display_fps=30.0, latency_window=200, timer=None):
+        self.source = source
+        self.process_fn = process_fn
+        self.render_fn = render_fn
+        self.on_result = on_result
+        self.on_stop = on_stop
+        self.workers = max(1, workers)
+        self.display_interval = 1.0 / display_fps if display_fps else 0.0
+        self.timer = timer or DISABLED_TIMER
+
+        self.frame_queue = LatestQueue(queue_size)
+        self.stop_event = threading.Event()
+        self.cap = None
+        self._threads = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+        # (seq, yakalama zamanı, kare)
+        self._latest_frame = None
+        # (seq, yakalama zamanı, overlay)
+        self._latest_overlay = None
+        self._rendered_overlay_seq = -1
+
+        self.capture_rate = RateCounter()
+        self.inference_rate = RateCounter()
+        self.display_rate = RateCounter()
+        self.latencies = collections.deque(maxlen=latency_window)
+        self.stale_results = 0
+
+    @property
+    def latest_frame(self):
+        item = self._latest_frame
+        return item[2] if item else None
+
+    def start(self):
+        self.cap = cv2.VideoCapture(self.source)
+        if not self.cap.isOpened():
+            self.cap.release()
+            self.cap = None
+            return False
+        # Sürücü tamponunu küçült (destekleyen arka uçlarda)
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+        self.stop_event.clear()
+        self._threads = [threading.Thread(target=self._capture_loop, daemon=True, name="capture")]
+        self._threads += [
+            threading.Thread(target=self._inference_loop, daemon=True, name=f"inference-{i}")
+            for i in range(self.workers)
+        ]
+        self._threads.append(threading.Thread(target=self._render_loop, daemon=True, name="render"))
+        for thread in self._threads:
+            thread.start()
+        return True
+
+    def stop(self, timeout=2.0):
+        self.stop_event.set()
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout)
+        self._threads = []
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+    def _capture_loop(self):
+        while not self.stop_event.is_set():
+            with self.timer.span("capture"):
+                ret, frame = self.cap.read()
+            if not ret:
+                logging.error("Kameradan kare alınamadı, hat durduruluyor")
+                self.stop_event.set()
+                if self.on_stop is not None:
+                    self.on_stop()
+                break
+            now = time.perf_counter()
+            item = (next(self._seq), now, frame)
+            self._latest_frame = item
+            self.frame_queue.put(item)
+            self.capture_rate.tick(now)
+
+    def _inference_loop(self):
+        while not self.stop_event.is_set():
+            try:
+                seq, captured_at, frame = self.frame_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            try:
+                # Çizim aşaması aynı ham kareyi kullanır; process_fn kareyi değiştirmemelidir
+                output = self.process_fn(seq, frame)
+            except Exception as e:
+                logging.error(f"Kare işleme hatası: {str(e)}")
+                continue
+            if output is None:
+                self.stale_results += 1
+                continue
+            overlay, payload = output
+            self.inference_rate.tick()
+
+            with self._lock:
+                if self._latest_overlay is None or seq > self._latest_overlay[0]:
+                    self._latest_overlay = (seq, captured_at, overlay)
+                else:
+                    self.stale_results += 1
+            if self.on_result is not None and payload:
+                self.on_result(payload)
+
+    def _render_loop(self):
+        next_time = time.perf_counter()
+        last_drawn = None
+        while not self.stop_event.is_set():
+            frame_item = self._latest_frame
+            overlay_item = self._latest_overlay
+            drawn = (frame_item[0] if frame_item else None, overlay_item[0] if overlay_item else None)
+            # Yeni kare veya yeni sonuç yoksa aynı görüntü tekrar çizilmez
+            if frame_item is not None and drawn != last_drawn:
+                last_drawn = drawn
+                overlay = overlay_item[2] if overlay_item else None
+                try:
+                    with self.timer.span("render"):
+                        self.render_fn(frame_item[2].copy(), overlay)
+                except Exception as e:
+                    logging.error(f"Çizim hatası: {str(e)}")
+                now = time.perf_counter()
+                self.display_rate.tick(now)
+                if overlay_item is not None and overlay_item[0] != self._rendered_overlay_seq:
+                    self._rendered_overlay_seq = overlay_item[0]
+                    self.latencies.append(now - overlay_item[1])
+                    if self.timer.enabled:
+                        self.timer.record("e2e", now - overlay_item[1])
+
+            next_time += self.display_interval
+            delay = next_time - time.perf_counter()
+            if delay > 0:
+                self.stop_event.wait(delay)
+            else:
+                next_time = time.perf_counter()
+
+    def stats(self):
+        latencies = sorted(self.latencies)
+        p50 = latencies[len(latencies) // 2] if latencies else 0.0
+        p95 = latencies[int(len(latencies) * 0.95)] if latencies else 0.0
+        return {
+            "capture_fps": self.capture_rate.rate(),
+            "inference_fps": self.inference_rate.rate(),
+            "display_fps": self.display_rate.rate(),
+            "dropped_frames": self.frame_queue.dropped,
+            "stale_results": self.stale_results,
+            "latency_p50_ms": 1000 * p50,
+            "latency_p95_ms": 1000 * p95,
+        }
@@ -0,0 +1,130 @@
+import numpy as np
+
+
+class DominantColorEngine:
+    """Saç/göz/kıyafet bölgelerinin baskın rengini KMeans(n_init=10) yerine hızlıca bulur.
+
+    Her bölgeden en fazla `max_samples` piksel ızgara ile örneklenir. Bir karedeki
+    tüm bölgeler tek çağrıda, tek bir numpy geçişiyle işlenir.
+
+    method="histogram": renkler kanal başına `bits` bit ile nicelenir, komşularıyla
+        birlikte en kalabalık hücre seçilir ve oradaki piksellerin ortalaması döndürülür.
+    method="kmeans": örneklenmiş pikseller üzerinde, tüm bölgeler için aynı anda
+        çalışan küçük bir k-means (mini-batch) uygulanır.
+    """
+
+    def __init__(self, method="histogram", max_samples=1024, bits=4, k=3, iterations=8, seed=42):
+        if method not in ("histogram", "kmeans"):
+            raise ValueError(f"Bilinmeyen yöntem: {method}")
+        self.method = method
+        self.max_samples = max_samples
+        self.bits = bits
+        self.k = k
+        self.iterations = iterations
+        self.seed = seed
+
+    def dominant_color(self, image, to_rgb=True):
+        """Tek bir bölgenin baskın rengini döndürür."""
+        if image is None or image.ndim != 3 or image.shape[0] == 0 or image.shape[1] == 0:
+            return (0, 0, 0)
+        h, w = image.shape[:2]
+        return self.dominant_colors(image, [(0, 0, w, h)], to_rgb=to_rgb)[0]
+
+    def dominant_colors(self, image, boxes, to_rgb=True):
+        """Aynı karedeki (x1, y1, x2, y2) bölgelerinin baskın renklerini tek çağrıda döndürür.
+
+        Görüntü BGR kabul edilir; to_rgb=True ise sonuç RGB, değilse BGR sırasındadır.
+        Boş bölgeler için (0, 0, 0) döner.
+        """
+        colors = [(0, 0, 0)] * len(boxes)
+        if image is None or image.ndim != 3 or image.shape[2] < 3 or not boxes:
+            return colors
+
+        samples, owners = self._sample_regions(image, boxes)
+        if not samples:
+            return colors
+
+        if self.method == "histogram":
+            region_ids, centers = self._histogram_mode(samples, owners)
+        else:
+            region_ids, centers = self._batched_kmeans(samples, owners)
+
+        for region_id, center in zip(region_ids, centers):
+            b, g, r = (int(round(v)) for v in center)
+            colors[region_id] = (r, g, b) if to_rgb else (b, g, r)
+        return colors
+
+    def _sample_regions(self, image, boxes):
+        img_h, img_w = image.shape[:2]
+        samples = []
+        owners = []
+        for region_id, (x1, y1, x2, y2) in enumerate(boxes):
+            x1, y1 = max(0, int(x1)), max(0, int(y1))
+            x2, y2 = min(img_w, int(x2)), min(img_h, int(y2))
+            if x2 <= x1 or y2 <= y1:
+                continue
+            # Izgara adımı, örnek sayısı max_samples civarında kalacak şekilde seçilir
+            area = (x2 - x1) * (y2 - y1)
+            step = max(1, int(np.ceil(np.sqrt(area / self.max_samples))))
+            pixels = image[y1:y2:step, x1:x2:step, :3].reshape(-1, 3)
+            samples.append(pixels)
+            owners.append(region_id)
+        return samples, owners
+
+    def _histogram_mode(self, samples, owners):
+        bits = self.bits
+        side = 1 << bits
+        pixels = np.concatenate(samples)
+        region_of_pixel = np.repeat(np.arange(len(samples)), [len(s) for s in samples])
+
+        q = (pixels >> (8 - bits)).astype(np.int64)
+        cell = (q[:, 0] << (2 * bits)) | (q[:, 1] << bits) | q[:, 2]
+
+        counts = np.bincount(region_of_pixel * side ** 3 + cell, minlength=len(samples) * side ** 3)
+        counts = counts.reshape(len(samples), side, side, side)
+
+        # Gürültünün komşu hücrelere dağıttığı renkler 3x3x3 kutu filtresiyle toplanır
+        for axis in (1, 2, 3):
+            padded = np.pad(counts, [(1, 1) if a == axis else (0, 0) for a in range(4)])
+            counts = (
+                padded.take(range(0, side), axis=axis)
+                + padded.take(range(1, side + 1), axis=axis)
+                + padded.take(range(2, side + 2), axis=axis)
+            )
+        best_cell = counts.reshape(len(samples), -1).argmax(axis=1)
+        best_q = np.stack([best_cell >> (2 * bits), (best_cell >> bits) & (side - 1), best_cell & (side - 1)], axis=1)
+
+        # Kazanan hücre ve komşularındaki piksellerin ortalaması (niceleme kaymasını giderir)
+        in_best = (np.abs(q - best_q[region_of_pixel]) <= 1).all(axis=1)
+        winners = region_of_pixel[in_best]
+        totals = np.bincount(winners, minlength=len(samples)).astype(np.float64)
+        centers = np.stack([
+            np.bincount(winners, weights=pixels[in_best, c], minlength=len(samples))
+            for c in range(3)
+        ], axis=1) / totals[:, None]
+        return owners, centers
+
+    def _batched_kmeans(self, samples, owners):
+        rng = np.random.default_rng(self.seed)
+        m = min(self.max_samples, max(len(s) for s in samples))
+        k = self.k
+
+        # Her bölgeden sabit sayıda (yerine koyarak) örnek alınır: (bölge, m, 3)
+        batch = np.stack([s[rng.integers(0, len(s), size=m)] for s in samples]).astype(np.float32)
+        init = rng.integers(0, m, size=(len(samples), k))
+        centers = np.take_along_axis(batch, init[:, :, None], axis=1)
+
+        for _ in range(self.iterations):
+            dists = ((batch[:, :, None, :] - centers[:, None, :, :]) ** 2).sum(axis=3)
+            labels = dists.argmin(axis=2)
+            onehot = (labels[:, :, None] == np.arange(k)).astype(np.float32)
+            counts = onehot.sum(axis=1)
+            sums = np.einsum("nmk,nmc->nkc", onehot, batch)
+            # Boş kalan merkezler yerinde bırakılır
+            centers = np.where(counts[:, :, None] > 0, sums / np.maximum(counts, 1)[:, :, None], centers)
+
+        dists = ((batch[:, :, None, :] - centers[:, None, :, :]) ** 2).sum(axis=3)
+        labels = dists.argmin(axis=2)
+        counts = (labels[:, :, None] == np.arange(k)).sum(axis=1)
+        best = counts.argmax(axis=1)
+        return owners, centers[np.arange(len(samples)), best]
@@ -0,0 +1,144 @@
+import json
+import logging
+import os
+import queue
+import threading
+import time
+
+import cv2
+
+
+def safe_file_name(name):
+    return name.replace(" ", "_").replace("Tanımlanmamış", "Unknown")
+
+
+def crop_quality(crop):
+    """Basit kalite puanı: netlik (Laplace varyansı) x alanın karekökü."""
+    gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY) if crop.ndim == 3 else crop
+    sharpness = cv2.Laplacian(gray, cv2.CV_64F).var()
+    return sharpness * (gray.shape[0] * gray.shape[1]) ** 0.5
+
+
+class PackedCropArchive:
+    """Kesitleri tek bir dosyada (JPEG baytları art arda) ve yanında bir indeks dosyasında tutar.
+
+    İndeks her kayıt için bir JSON satırıdır: isim, konum, uzunluk, zaman ve kalite puanı.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.index_path = path + ".idx"
+        self._data = open(path, "ab")
+        self._index = open(self.index_path, "a", encoding="utf-8")
+
+    def append(self, name, jpeg_bytes, timestamp, score):
+        offset = self._data.seek(0, os.SEEK_END)
+        self._data.write(jpeg_bytes)
+        self._data.flush()
+        entry = {"name": name, "offset": offset, "length": len(jpeg_bytes), "time": timestamp, "score": score}
+        self._index.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._index.flush()
+
+    def close(self):
+        self._data.close()
+        self._index.close()
+
+    @staticmethod
+    def entries(path):
+        """İndeksteki kayıtları döndürür (yarım kalmış son satır atlanır)."""
+        entries = []
+        with open(path + ".idx", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    break
+        return entries
+
+    @staticmethod
+    def read(path, entry):
+        """Bir kaydın kesitini BGR görüntü olarak okur."""
+        import numpy as np
+
+        with open(path, "rb") as f:
+            f.seek(entry["offset"])
+            data = f.read(entry["length"])
+        return cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+
+
+class CropArchiver:
+    """Yüz kesitlerini kamera döngüsünü bekletmeden arka planda diske yazan aşama.
+
+    `submit()` kesiti sınırlı bir kuyruğa bırakır; kuyruk doluysa kesit atılır.
+    Kimlik başına bir kesit en fazla `min_interval` saniyede bir saklanır; bu süre
+    dolmadan yalnızca kalite puanı `improve_ratio` oranında iyileşen kesitler yazılır.
+    `packed_path` verilirse kesitler tek tek JPEG yerine tek bir indeksli arşive eklenir;
+    aksi halde `folder/<isim>.jpg` dosyası güncellenir.
+    """
+
+    def __init__(self, folder="faces", min_interval=5.0, improve_ratio=0.2, queue_size=64,
+                 packed_path=None, jpeg_quality=90):
+        self.folder = folder
+        self.min_interval = min_interval
+        self.improve_ratio = improve_ratio
+        self.encode_params = [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality]
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._last = {}
+
+        os.makedirs(folder, exist_ok=True)
+        self.archive = PackedCropArchive(packed_path) if packed_path else None
+
+        self.saved = 0
+        self.skipped = 0
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._run, daemon=True, name="crop-archiver")
+        self._thread.start()
+
+    def submit(self, name, crop):
+        """Kesiti yazılmak üzere kuyruğa bırakır; hiçbir zaman beklemez."""
+        if crop is None or crop.size == 0:
+            return
+        try:
+            self._queue.put_nowait((name, crop.copy(), time.time()))
+        except queue.Full:
+            self.dropped += 1
+
+    def _accept(self, name, score, timestamp):
+        last = self._last.get(name)
+        if last is not None:
+            last_time, last_score = last
+            if timestamp - last_time < self.min_interval and score <= last_score * (1 + self.improve_ratio):
+                return False
+        self._last[name] = (timestamp, score)
+        return True
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            name, crop, timestamp = item
+            try:
+                score = crop_quality(crop)
+                if not self._accept(name, score, timestamp):
+                    self.skipped += 1
+                    continue
+                self._write(name, crop, timestamp, score)
+                self.saved += 1
+            except Exception as e:
+                logging.error(f"Yüz fotoğrafı kaydedilirken hata oluştu: {e}")
+
+    def _write(self, name, crop, timestamp, score):
+        if self.archive is not None:
+            ok, encoded = cv2.imencode(".jpg", crop, self.encode_params)
+            if ok:
+                self.archive.append(name, encoded.tobytes(), timestamp, score)
+        else:
+            cv2.imwrite(os.path.join(self.folder, f"{safe_file_name(name)}.jpg"), crop, self.encode_params)
+
+    def stop(self, timeout=5.0):
+        """Kuyruktaki kesitleri yazar ve iş parçacığını durdurur."""
+        self._queue.put(None)
+        self._thread.join(timeout)
+        if self.archive is not None:
+            self.archive.close()
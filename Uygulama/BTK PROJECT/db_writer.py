@@ -0,0 +1,150 @@
+import collections
+import logging
+import sqlite3
+import threading
+import time
+
+CREATE_TABLE_SQL = '''
+    CREATE TABLE IF NOT EXISTS analysis_data (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+        gender TEXT,
+        hair_color TEXT,
+        eye_color TEXT,
+        emotion TEXT,
+        age INTEGER,
+        clothing_color TEXT
+    )
+'''
+
+INSERT_SQL = '''
+    INSERT INTO analysis_data
+    (timestamp, gender, hair_color, eye_color, emotion, age, clothing_color)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+
+
+def configure_connection(connection):
+    """Yoğun yazma için WAL günlüğü ve ayarlanmış pragmalar."""
+    connection.execute("PRAGMA journal_mode=WAL")
+    # WAL ile NORMAL, işlem sonunda fsync yapmaz; güç kesintisinde yalnızca son işlemler kaybolabilir
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.execute("PRAGMA temp_store=MEMORY")
+    connection.execute("PRAGMA cache_size=-16000")
+    connection.execute("PRAGMA busy_timeout=5000")
+    connection.execute(CREATE_TABLE_SQL)
+    connection.commit()
+
+
+def sql_timestamp(epoch):
+    """time.time() değerini CURRENT_TIMESTAMP ile aynı UTC metin biçimine çevirir."""
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(epoch))
+
+
+def db_row(result, timestamp):
+    """Sonuç sözlüğünü analysis_data satırına çevirir."""
+    return (
+        sql_timestamp(timestamp),
+        result["Cinsiyet"], result["Saç Rengi"], result["Göz Rengi"],
+        result["Duygu"], result["Yaş"], result["Kıyafet Rengi"]
+    )
+
+
+class AnalysisDbWriter:
+    """Sonuçları arka planda toplu işlemlerle SQLite'a yazan iş parçacığı.
+
+    `submit()` herhangi bir iş parçacığından çağrılabilir ve beklemez; satırlar
+    `flush_size` kadar birikince veya `flush_interval` saniye geçince tek işlemde
+    `executemany` ile yazılır. Her kayıt yalnızca bir kez gönderilir ve yazılır.
+    Bağlantı yalnızca yazıcı iş parçacığında kullanılır.
+    """
+
+    def __init__(self, db_path, flush_interval=1.0, flush_size=500):
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+
+        self._pending = collections.deque()
+        self._cond = threading.Condition()
+        self._stop = False
+        self._force = False
+        self._submitted = 0
+        self.written = 0
+        self.batches = 0
+        self.errors = 0
+        self._thread = threading.Thread(target=self._run, daemon=True, name="db-writer")
+        self._thread.start()
+
+    def submit(self, results, timestamp=None):
+        if not results:
+            return
+        timestamp = timestamp if timestamp is not None else time.time()
+        rows = [db_row(result, timestamp) for result in results]
+        with self._cond:
+            self._pending.extend(rows)
+            self._submitted += len(rows)
+            if len(self._pending) >= self.flush_size:
+                self._cond.notify_all()
+
+    def flush(self, timeout=10.0):
+        """Bekleyen tüm satırlar yazılana kadar bekler; başarılıysa True döner.
+
+        `timeout=0` beklemeden yalnızca yazıcıyı hemen yazmaya yönlendirir (Tk döngüsü için).
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            target = self._submitted
+            while self.written + self.errors < target:
+                # Yazıcı, süreyi beklemeden elindekileri yazar
+                self._force = True
+                self._cond.notify_all()
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._thread.is_alive():
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout=10.0):
+        self.flush(timeout)
+        with self._cond:
+            self._stop = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def _run(self):
+        connection = sqlite3.connect(self.db_path)
+        configure_connection(connection)
+        try:
+            while True:
+                with self._cond:
+                    deadline = time.monotonic() + self.flush_interval
+                    while not (self._stop or self._force or len(self._pending) >= self.flush_size):
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._cond.wait(remaining)
+                    self._force = False
+                    batch = list(self._pending)
+                    self._pending.clear()
+                    stop = self._stop
+
+                if batch:
+                    self._write(connection, batch)
+                if stop and not self._pending:
+                    break
+        finally:
+            connection.close()
+
+    def _write(self, connection, batch):
+        try:
+            with connection:
+                connection.executemany(INSERT_SQL, batch)
+            written, failed = len(batch), 0
+        except sqlite3.Error as e:
+            logging.error(f"Veritabanı yazma hatası ({len(batch)} kayıt): {e}")
+            written, failed = 0, len(batch)
+        with self._cond:
+            self.written += written
+            self.errors += failed
+            self.batches += 1
+            self._cond.notify_all()
@@ -0,0 +1,149 @@
+import os
+
+import numpy as np
+
+
+class EmbeddingIndex:
+    """Tüm embedding'leri tek bir bitişik float32 matriste tutan yüz tanıma dizini.
+
+    Satırlar paralel bir etiket dizisiyle eşlenir; sorgu başına (veya sorgu grubu başına)
+    tek bir vektörel mesafe hesabı ve argmin yapılır. Yeni kayıtlar matrise artımlı
+    eklenir (kapasite gerektikçe ikiye katlanır). İsteğe bağlı olarak diskten
+    bellek eşlemeli (np.memmap) açılabilir.
+
+    metric="cosine": 1 - kosinüs benzerliği (satırlar normalize edilmiş saklanır).
+    metric="euclidean": Öklid mesafesi.
+    """
+
+    def __init__(self, dim=None, metric="cosine", capacity=1024):
+        if metric not in ("cosine", "euclidean"):
+            raise ValueError(f"Bilinmeyen mesafe ölçütü: {metric}")
+        self.metric = metric
+        self.dim = dim
+        self._capacity = capacity
+        self._matrix = None
+        self._sq_norms = None
+        self._label_ids = np.zeros(0, dtype=np.int32)
+        self._count = 0
+        self.names = []
+        self._name_ids = {}
+
+    def __len__(self):
+        return self._count
+
+    @classmethod
+    def from_dict(cls, known_faces, metric="cosine"):
+        """{'İsim': [embedding, ...]} sözlüğünden dizin oluşturur."""
+        index = cls(metric=metric)
+        labels = [name for name, embeddings in known_faces.items() for _ in embeddings]
+        vectors = [emb for embeddings in known_faces.values() for emb in embeddings]
+        if vectors:
+            index.add_many(labels, vectors)
+        return index
+
+    def _prepare(self, vectors):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim == 1:
+            vectors = vectors[np.newaxis, :]
+        if self.metric == "cosine":
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors = vectors / np.maximum(norms, 1e-12)
+        return vectors
+
+    def _reserve(self, extra):
+        needed = self._count + extra
+        if self._matrix is not None and needed <= self._matrix.shape[0] and self._matrix.flags.writeable:
+            return
+        capacity = max(self._capacity, needed, 2 * (self._matrix.shape[0] if self._matrix is not None else 0))
+        matrix = np.empty((capacity, self.dim), dtype=np.float32)
+        sq_norms = np.empty(capacity, dtype=np.float32)
+        label_ids = np.empty(capacity, dtype=np.int32)
+        if self._count:
+            # Bellek eşlemeli (salt okunur) matris ilk eklemede RAM'e kopyalanır
+            matrix[:self._count] = self._matrix[:self._count]
+            sq_norms[:self._count] = self._sq_norms[:self._count]
+            label_ids[:self._count] = self._label_ids[:self._count]
+        self._matrix, self._sq_norms, self._label_ids = matrix, sq_norms, label_ids
+
+    def _label_id(self, name):
+        if name not in self._name_ids:
+            self._name_ids[name] = len(self.names)
+            self.names.append(name)
+        return self._name_ids[name]
+
+    def add(self, name, embedding):
+        """Tek bir embedding ekler (enroll_face sonrasında)."""
+        self.add_many([name], [embedding])
+
+    def add_many(self, names, embeddings):
+        vectors = self._prepare(embeddings)
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+        elif vectors.shape[1] != self.dim:
+            raise ValueError(f"Embedding boyutu uyuşmuyor: {vectors.shape[1]} != {self.dim}")
+
+        self._reserve(len(vectors))
+        start, end = self._count, self._count + len(vectors)
+        self._matrix[start:end] = vectors
+        self._sq_norms[start:end] = (vectors * vectors).sum(axis=1)
+        self._label_ids[start:end] = [self._label_id(name) for name in names]
+        self._count = end
+
+    def distances(self, queries):
+        """(sorgu, kayıt) mesafe matrisini döndürür."""
+        queries = self._prepare(queries)
+        matrix = self._matrix[:self._count]
+        dots = queries @ matrix.T
+        if self.metric == "cosine":
+            return 1.0 - dots
+        q_sq = (queries * queries).sum(axis=1, keepdims=True)
+        return np.sqrt(np.maximum(q_sq + self._sq_norms[:self._count] - 2.0 * dots, 0.0))
+
+    def search(self, embedding):
+        """En yakın kaydın (isim, mesafe) çiftini döndürür; dizin boşsa (None, inf)."""
+        return self.search_batch([embedding])[0]
+
+    def search_batch(self, embeddings, exclude=None):
+        """Her sorgu için en yakın (isim, mesafe) çiftini tek matris çarpımıyla bulur.
+
+        exclude: aramaya katılmayacak isimler (ör. sorgunun kendisi).
+        """
+        if not self._count or len(embeddings) == 0:
+            return [(None, float("inf"))] * len(embeddings)
+        dist = self.distances(embeddings)
+        if exclude:
+            excluded = [self._name_ids[name] for name in exclude if name in self._name_ids]
+            if excluded:
+                dist[:, np.isin(self._label_ids[:self._count], excluded)] = np.inf
+        best = dist.argmin(axis=1)
+        best_dist = dist[np.arange(len(best)), best]
+        return [
+            (self.names[self._label_ids[i]], float(d)) if np.isfinite(d) else (None, float("inf"))
+            for i, d in zip(best, best_dist)
+        ]
+
+    def save(self, path):
+        """Matrisi ve etiketleri `path`.npy / `path`.labels.npy dosyalarına yazar."""
+        np.save(path + ".npy", self._matrix[:self._count] if self._count else np.zeros((0, self.dim or 0), np.float32))
+        np.save(path + ".labels.npy", np.array([self.names[i] for i in self._label_ids[:self._count]], dtype=object),
+                allow_pickle=True)
+
+    @classmethod
+    def load(cls, path, metric="cosine", mmap=True):
+        """save() ile yazılmış dizini açar; mmap=True ise matris bellek eşlemeli okunur."""
+        index = cls(metric=metric)
+        if not os.path.exists(path + ".npy"):
+            return index
+        matrix = np.load(path + ".npy", mmap_mode="r" if mmap else None)
+        labels = np.load(path + ".labels.npy", allow_pickle=True)
+        if len(matrix):
+            index.dim = matrix.shape[1]
+            index._matrix = matrix
+            if metric == "cosine":
+                # Satırlar normalize saklandığı için tüm matrisi okumaya gerek yok
+                index._sq_norms = np.ones(len(matrix), dtype=np.float32)
+            else:
+                index._sq_norms = (np.asarray(matrix, dtype=np.float32) ** 2).sum(axis=1)
+            index._label_ids = np.array([index._label_id(name) for name in labels], dtype=np.int32)
+            index._count = len(matrix)
+        return index
@@ -0,0 +1,251 @@
+import abc
+import csv
+import datetime
+import json
+import logging
+import os
+import threading
+
+import numpy as np
+
+from result_store import CATEGORICAL_FIELDS, clothing_text
+
+# Kategorik kolonların dışa aktarılan adları
+CATEGORY_NAMES = dict(CATEGORICAL_FIELDS)
+
+# (kolon adı ön eki, rgb dizisindeki sıra)
+RGB_PARTS = [("Saç", 0), ("Göz", 1), ("Kıyafet", 2)]
+
+CSV_COLUMNS = [
+    "Cinsiyet", "Yaş", "Saç Rengi", "Göz Rengi", "Duygu",
+    "Kıyafet Rengi", "Saç RGB", "Göz RGB", "Kıyafet RGB"
+]
+
+
+def decode(codes, labels):
+    return np.array(labels, dtype=object)[codes] if len(codes) else np.array([], dtype=object)
+
+
+def iso_times(times):
+    # Arrow/Parquet kolonlarıyla aynı saat dilimi: yerel saate göre değişmeyen, ofsetli UTC
+    utc = datetime.timezone.utc
+    return [datetime.datetime.fromtimestamp(t, utc).isoformat(timespec="milliseconds") for t in times]
+
+
+class ChunkedExporter(abc.ABC):
+    """ResultStore'daki yeni satırları parça parça dosyaya yazan temel sınıf.
+
+    `sync(store)` yalnızca henüz yazılmamış satırları `chunk_rows`luk parçalarla
+    yazar; tek seferlik dışa aktarma için bir kez, canlı akış için düzenli
+    aralıklarla çağrılır. Depo temizlenirse yeni kayıtlar baştan sayılarak eklenir.
+    """
+
+    extension = None
+
+    def __init__(self, path, chunk_rows=65536):
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self.written = 0
+        self._position = 0
+        self._generation = None
+        self._lock = threading.Lock()
+
+    def sync(self, store):
+        """Yeni satırları yazar ve yazılan satır sayısını döndürür."""
+        with self._lock:
+            if self._generation != store.generation:
+                self._generation = store.generation
+                self._position = 0
+            total = len(store)
+            count = 0
+            while self._position < total:
+                stop = min(self._position + self.chunk_rows, total)
+                columns, labels = store.chunk(self._position, stop)
+                self.write_chunk(columns, labels)
+                count += stop - self._position
+                self._position = stop
+            self.written += count
+            return count
+
+    @abc.abstractmethod
+    def write_chunk(self, columns, labels):
+        """Bir parçayı (store.chunk çıktısı) dosyaya yazar."""
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CsvExporter(ChunkedExporter):
+    """Eski save_dataset CSV'siyle aynı kolonlar; satırlar parça parça eklenir."""
+
+    extension = ".csv"
+
+    def __init__(self, path, chunk_rows=65536):
+        super().__init__(path, chunk_rows)
+        self._file = open(path, "w", newline="", encoding="utf-8-sig")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(CSV_COLUMNS)
+
+    def write_chunk(self, columns, labels):
+        gender, hair, eye, emotion = (decode(columns[name], labels[name]) for name in ("gender", "hair", "eye", "emotion"))
+        rgb = columns["rgb"]
+        rgb_text = [[f"{r},{g},{b}" for r, g, b in rgb[:, part]] for _, part in RGB_PARTS]
+        self._writer.writerows(
+            (gender[i], int(columns["age"][i]), hair[i], eye[i], emotion[i], clothing_text(rgb[i, 2]),
+             rgb_text[0][i], rgb_text[1][i], rgb_text[2][i])
+            for i in range(len(rgb))
+        )
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class JsonlExporter(ChunkedExporter):
+    """Satır başına bir JSON nesnesi; RGB değerleri sayı dizisi olarak yazılır."""
+
+    extension = ".jsonl"
+
+    def __init__(self, path, chunk_rows=65536):
+        super().__init__(path, chunk_rows)
+        self._file = open(path, "w", encoding="utf-8")
+
+    def write_chunk(self, columns, labels):
+        decoded = {name: decode(columns[name], labels[name]) for name in CATEGORY_NAMES}
+        times = iso_times(columns["time"])
+        rgb = columns["rgb"].tolist()
+        ages = columns["age"].tolist()
+        lines = []
+        for i in range(len(ages)):
+            record = {"Zaman": times[i], "Yaş": ages[i]}
+            for name, key in CATEGORY_NAMES.items():
+                record[key] = decoded[name][i]
+            for prefix, part in RGB_PARTS:
+                record[f"{prefix} RGB"] = rgb[i][part]
+            lines.append(json.dumps(record, ensure_ascii=False))
+        self._file.write("\n".join(lines) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        return pyarrow
+    except ImportError:
+        raise ImportError("Parquet/Arrow dışa aktarımı için pyarrow gerekli: pip install pyarrow")
+
+
+class ArrowTableBuilder:
+    """Depo parçalarından tipli Arrow tabloları oluşturur.
+
+    Duygu/cinsiyet/renk kolonları sözlük (kategorik) tipinde, RGB bileşenleri ayrı
+    uint8 kolonlar, yaş int16 ve zaman milisaniye çözünürlüklü UTC zaman damgasıdır.
+    """
+
+    def __init__(self):
+        pa = self.pa = _import_pyarrow()
+        fields = [pa.field("Zaman", pa.timestamp("ms", tz="UTC"))]
+        fields += [pa.field(key, pa.dictionary(pa.int16(), pa.string())) for key in CATEGORY_NAMES.values()]
+        fields.append(pa.field("Yaş", pa.int16()))
+        fields += [pa.field(f"{prefix} {c}", pa.uint8()) for prefix, _ in RGB_PARTS for c in "RGB"]
+        self.schema = pa.schema(fields)
+
+    def table(self, columns, labels):
+        pa = self.pa
+        arrays = [pa.array((columns["time"] * 1000).astype(np.int64), type=pa.timestamp("ms", tz="UTC"))]
+        for name in CATEGORY_NAMES:
+            arrays.append(pa.DictionaryArray.from_arrays(
+                pa.array(columns[name].astype(np.int16)), pa.array(labels[name], type=pa.string())
+            ))
+        arrays.append(pa.array(columns["age"]))
+        rgb = columns["rgb"]
+        arrays += [pa.array(np.ascontiguousarray(rgb[:, part, c])) for _, part in RGB_PARTS for c in range(3)]
+        return pa.Table.from_arrays(arrays, schema=self.schema)
+
+
+class ParquetExporter(ChunkedExporter):
+    """Her parça ayrı bir satır grubu olarak yazılır (kolon bazlı, sıkıştırılmış)."""
+
+    extension = ".parquet"
+
+    def __init__(self, path, chunk_rows=65536, compression="zstd"):
+        super().__init__(path, chunk_rows)
+        self._builder = ArrowTableBuilder()
+        import pyarrow.parquet as pq
+        self._writer = pq.ParquetWriter(path, self._builder.schema, compression=compression)
+
+    def write_chunk(self, columns, labels):
+        self._writer.write_table(self._builder.table(columns, labels))
+
+    def close(self):
+        self._writer.close()
+
+
+class ArrowExporter(ChunkedExporter):
+    """Arrow IPC akış biçimi; sözlükler büyüdükçe yalnızca farkları (delta) yazılır."""
+
+    extension = ".arrow"
+
+    def __init__(self, path, chunk_rows=65536):
+        super().__init__(path, chunk_rows)
+        self._builder = ArrowTableBuilder()
+        pa = self._builder.pa
+        self._sink = pa.OSFile(path, "wb")
+        options = pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+        self._writer = pa.ipc.new_stream(self._sink, self._builder.schema, options=options)
+
+    def write_chunk(self, columns, labels):
+        self._writer.write_table(self._builder.table(columns, labels))
+
+    def close(self):
+        self._writer.close()
+        self._sink.close()
+
+
+EXPORTERS = {cls.extension: cls for cls in (CsvExporter, JsonlExporter, ParquetExporter, ArrowExporter)}
+
+
+def exporter_for_path(path, **kwargs):
+    """Dosya uzantısına göre dışa aktarıcı oluşturur."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in EXPORTERS:
+        raise ValueError(f"Desteklenmeyen dosya türü: {extension}")
+    return EXPORTERS[extension](path, **kwargs)
+
+
+class LiveExportSink:
+    """Kamera oturumu boyunca depodaki yeni satırları belirli aralıklarla dışa aktarır."""
+
+    def __init__(self, store, exporter, interval=2.0):
+        self.store = store
+        self.exporter = exporter
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="live-export")
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.exporter.sync(self.store)
+            except Exception as e:
+                logging.error(f"Canlı dışa aktarma hatası: {e}")
+
+    def stop(self):
+        """Son satırları yazar ve dosyayı kapatır; toplam yazılan satır sayısını döndürür."""
+        self._stop.set()
+        self._thread.join()
+        try:
+            self.exporter.sync(self.store)
+        finally:
+            self.exporter.close()
+        return self.exporter.written
@@ -0,0 +1,183 @@
+import cv2
+import logging
+from color_engine import DominantColorEngine
+from face_detection import FaceDetector
+from inference_client import default_backend
+from instrumentation import DISABLED_TIMER
+
+ATTRIBUTE_ACTIONS = ("emotion", "gender", "age")
+
+
+class FaceAnalyzer:
+    """Tkinter'dan bağımsız yüz analiz motoru (GUI ve toplu mod ortak kullanır)."""
+
+    def __init__(self, color_engine=None, detector=None, backend=None, timer=None):
+        # Tespit kare başına bir kez yapılır; kutular ve kesitler tüm modellere aktarılır
+        self.detector = detector or FaceDetector()
+        self.color_engine = color_engine or DominantColorEngine()
+        # Karedeki tüm yüzler model başına tek tensörde çalıştırılır (FACE_INFERENCE_SERVER ayarlıysa sunucuda)
+        self.backend = backend or default_backend()
+        # Aşama süreleri (varsayılan: kapalı, maliyetsiz)
+        self.timer = timer or DISABLED_TIMER
+
+    def warmup(self):
+        """DeepFace modellerini önceden yükler (ilk analizdeki gecikmeyi önler)."""
+        try:
+            self.backend.warmup()
+        except Exception as e:
+            logging.error(f"Modeller yüklenemedi: {str(e)}")
+
+    def detect_dominant_color(self, image, k=3):
+        if image.size == 0:
+            return (0, 0, 0)
+        return self.color_engine.dominant_color(image)
+
+    def get_eye_color_name(self, rgb):
+        r, g, b = rgb
+
+        color_ranges = [
+            ((80, 40, 0), (255, 255, 50), "Kahverengi"),
+            ((100, 60, 0), (255, 255, 40), "Ela"),
+            ((180, 140, 0), (255, 255, 70), "Kehribar"),
+            ((0, 0, 130), (100, 150, 255), "Mavi"),
+            ((0, 130, 0), (120, 255, 100), "Yeşil"),
+            ((120, 120, 120), (255, 255, 255), "Gri"),
+            ((150, 0, 0), (255, 80, 80), "Kırmızı")
+        ]
+
+        for (lower, upper, color_name) in color_ranges:
+            if all(lower[i] <= rgb[i] <= upper[i] for i in range(3)):
+                return color_name
+        return "Bilinmiyor"
+
+    def get_hair_color_name(self, rgb):
+        r, g, b = rgb
+        brightness = (r + g + b) / 3
+
+        if r > 100 and g > 50 and b < 50:
+            color = "Kızıl"
+        elif r > 190 and g > 170 and b > 120:
+            color = "Sarışın"
+        elif r > 60 and g > 40 and b > 20:
+            color = "Kahverengi"
+        elif r < 50 and g < 50 and b < 50:
+            color = "Siyah"
+        else:
+            color = "Bilinmiyor"
+
+        dyed = "(Boyalı olabilir)" if brightness > 170 or brightness < 40 else ""
+        return f"{color} {dyed}".strip()
+
+    def hair_region(self, face):
+        x, y, w, h = face
+        return (x, max(0, y - int(h * 0.6)), x + w, y)
+
+    def eye_region(self, face):
+        x, y, w, h = face
+        return (x + int(w * 0.2), y + int(h * 0.2), x + int(w * 0.8), y + int(h * 0.4))
+
+    def clothing_region(self, face):
+        x, y, w, h = face
+        return (x, y + h, x + w, y + h + int(h * 0.5))
+
+    def extract_hair_color(self, image, face):
+        return self.color_engine.dominant_colors(image, [self.hair_region(face)])[0]
+
+    def extract_eye_color(self, image, face):
+        return self.color_engine.dominant_colors(image, [self.eye_region(face)])[0]
+
+    def extract_clothing_color(self, image, face):
+        return self.color_engine.dominant_colors(image, [self.clothing_region(face)])[0]
+
+    def extract_face_colors(self, image, faces):
+        """Karedeki tüm yüzlerin saç/göz/kıyafet renklerini tek çağrıda çıkarır."""
+        boxes = []
+        for face in faces:
+            boxes.extend((self.hair_region(face), self.eye_region(face), self.clothing_region(face)))
+        colors = self.color_engine.dominant_colors(image, boxes)
+        return [tuple(colors[i:i + 3]) for i in range(0, len(colors), 3)]
+
+    def analyze_attributes(self, crops, actions=ATTRIBUTE_ACTIONS):
+        """Hizalanmış yüz kesitleri için (duygu, cinsiyet, yaş) listesi döndürür (ikinci tespit yok).
+
+        `actions` dışındaki özellikler hesaplanmaz ve None olarak döner.
+        """
+        if not actions:
+            return [(None, None, None)] * len(crops)
+        attributes = []
+        for analysis in self.backend.analyze(crops, actions=tuple(actions)):
+            if analysis is None:
+                attributes.append(("Tespit Edilemedi", "Bilinmiyor", 0))
+            else:
+                attributes.append((
+                    analysis.get("dominant_emotion"),
+                    analysis.get("dominant_gender"),
+                    int(analysis["age"]) if "age" in analysis else None
+                ))
+        return attributes
+
+    def analyze_faces(self, image, draw=True):
+        with self.timer.span("detect"):
+            detections = self.detector.detect(image)
+        return image, self.analyze_detections(image, detections, draw)
+
+    def analyze_detections(self, image, detections, draw=True, actions=ATTRIBUTE_ACTIONS):
+        return self.analyze_many([(image, detections)], draw, actions)[0]
+
+    def analyze_many(self, frames, draw=True, actions=ATTRIBUTE_ACTIONS):
+        """Birden fazla karenin (kare, tespitler) çiftlerini tek toplu çıkarımla analiz eder."""
+        crops = [detection.crop for _, detections in frames for detection in detections]
+        with self.timer.span("models"):
+            attributes = iter(self.analyze_attributes(crops, actions)) if crops else iter(())
+
+        all_results = []
+        for image, detections in frames:
+            results = []
+            faces = [detection.box for detection in detections]
+            with self.timer.span("colors"):
+                face_colors = self.extract_face_colors(image, faces)
+
+            for hair_rgb, eye_rgb, clothing_rgb in face_colors:
+                emotion, gender, age = next(attributes)
+
+                hair_color = self.get_hair_color_name(hair_rgb)
+                eye_color = self.get_eye_color_name(eye_rgb)
+                clothing_color = f"RGB({clothing_rgb[0]}, {clothing_rgb[1]}, {clothing_rgb[2]})"
+
+                results.append({
+                    "Cinsiyet": gender,
+                    "Yaş": age,
+                    "Saç Rengi": hair_color,
+                    "Göz Rengi": eye_color,
+                    "Duygu": emotion,
+                    "Kıyafet Rengi": clothing_color,
+                    "RGB": (hair_rgb, eye_rgb, clothing_rgb)
+                })
+
+            # Görsel işaretleme (kesitler kareye bakan görünümler olabileceği için analizden sonra)
+            if draw:
+                with self.timer.span("draw"):
+                    for detection, result in zip(detections, results):
+                        self.draw_analysis_results(image, detection.box, result)
+            all_results.append(results)
+
+        return all_results
+
+    def draw_analysis_results(self, image, face, result):
+        x, y, w, h = face
+        cv2.rectangle(image, (x, y), (x + w, y + h), (0, 255, 0), 2)
+
+        # Bilgileri görsele ekle
+        info_texts = [
+            f"Cinsiyet: {result['Cinsiyet']}",
+            f"Yaş: {result['Yaş']}",
+            f"Duygu: {result['Duygu']}",
+            f"Saç: {result['Saç Rengi']}",
+            f"Göz: {result['Göz Rengi']}"
+        ]
+
+        for i, text in enumerate(info_texts):
+            cv2.putText(
+                image, text, (x, y - 10 - (i * 20)),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 1
+            )
@@ -1,29 +1,34 @@
 import cv2
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
-from deepface import DeepFace
+from tkinter import ttk, filedialog, messagebox, simpledialog
 import numpy as np
-from sklearn.cluster import KMeans
-import pandas as pd
 import threading
 import time
 import logging
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
 import sqlite3
 import os
-from PIL import Image, ImageTk
+import queue
 from tkinter import font as tkfont
+from face_analyzer import ATTRIBUTE_ACTIONS, FaceAnalyzer
+from face_tracker import FaceTracker
+from camera_pipeline import CameraPipeline
+from multi_camera import MultiCameraPool, format_stats
+from preview_renderer import PreviewRenderer
+from results_view import VirtualResultList
+from result_store import ResultStore
+from db_writer import AnalysisDbWriter, configure_connection
+from analysis_query import AnalysisQuery, LazyQueryResults, ensure_indexes
+from exporters import LiveExportSink, exporter_for_path
+from model_warmup import ModelWarmup, attach_status_label
+from instrumentation import MetricsFileSink, StageTimer, draw_hud, setup_queue_logging
+from quality_governor import QualityGovernor, apply_quality
+from video_analyze import VIDEO_EXTENSIONS, analyze_video_range, probe_video, recording_start, sample_step
 
-# Loglama ayarları
-logging.basicConfig(
-    filename='face_analysis.log',
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+# Loglama ayarları (dosyaya yazma kuyruk üzerinden ayrı iş parçacığında yapılır)
+setup_queue_logging('face_analysis.log')
 
 class ModernFaceAnalysisApp:
-    def __init__(self, root):
+    def __init__(self, root, inference_workers=2, results_capacity=50000, target_fps=15.0, video_fps=5.0):
         self.root = root
         self.root.title("AI Face Analyzer Pro")
         self.root.geometry("1200x800")
@@ -33,20 +38,53 @@ class ModernFaceAnalysisApp:
         self.setup_styles()
         
         # Uygulama verileri
-        self.data_list = []
-        self.stop_event = threading.Event()
-        self.camera_thread = None
-        self.cap = None
+        # Sonuçlar kolon tabanlı depoda; kapasite aşılınca eski kayıtlar diske taşar
+        self.result_store = ResultStore(capacity=results_capacity)
         self.is_camera_active = False
-        self.current_frame = None
-        
-        # Veritabanı bağlantısı
-        self.db_connection = sqlite3.connect('face_analysis.db', check_same_thread=False)
+        # Aşama süreleri: HUD açılana kadar kapalıdır (ölçüm maliyeti yok)
+        self.timer = StageTimer(enabled=False)
+        self.metrics_sink = None
+        self.metrics_path = 'face_metrics.jsonl'
+        self._hud_cache = (0.0, {}, [])
+        self.analyzer = FaceAnalyzer(timer=self.timer)
+        # Modeller pencere açıldıktan sonra arka planda yüklenir
+        self.model_warmup = ModelWarmup(self.analyzer.backend.warmup_steps())
+        self.tracker = FaceTracker(reanalyze_every=30)
+        # Kare süresi hedefi aşılınca tespit ölçeği, yeniden analiz aralığı, özellikler ve renk örneklemesi düşürülür
+        self.governor = QualityGovernor(target_fps=target_fps, workers=inference_workers,
+                                        on_change=self.apply_quality)
+        
+        # Canlı kamera hattı: yakalama / çıkarım / çizim ayrı iş parçacıklarında
+        self.pipeline = None
+        self.inference_workers = inference_workers
+        self.tracker_lock = threading.Lock()
+        self.last_tracked_seq = -1
+        # İş parçacıkları Tk'ye dokunmaz: istekler burada birikir, Tk döngüsü yoklayarak uygular
+        self.ui_calls = queue.Queue()
+        self.display_dirty = False
+        # Çoklu kaynak modu: her kaynağın kendi yakalama iş parçacığı, ortak çıkarım havuzu
+        self.multi_pool = None
+        self.multi_sources = "0, 1"
+        
+        # Video dosyası analizi (arka plan iş parçacığı, saniyede `video_fps` kare örneklenir)
+        self.video_fps = video_fps
+        self.video_thread = None
+        self.video_stop = threading.Event()
+        
+        # Veritabanı bağlantısı (arayüz okumaları için) ve arka plan yazıcısı
+        self.db_path = 'face_analysis.db'
+        self.db_connection = sqlite3.connect(self.db_path)
         self.create_db_tables()
+        self.db_writer = AnalysisDbWriter(self.db_path, flush_interval=1.0, flush_size=500)
+        self.session_start = time.time()
+        self.live_export = None
         
         # UI oluştur
         self.setup_ui()
         self.update_display()
+        self.model_warmup.start()
+        attach_status_label(self.model_status_label, self.model_warmup,
+                            colors=("#f39c12", "#2ecc71", "#e74c3c"))
         
     def center_window(self, width, height, window=None):
         window = window if window else self.root
@@ -89,6 +127,13 @@ class ModernFaceAnalysisApp:
                  background=[('active', self.button_hover), ('pressed', self.highlight_color)],
                  foreground=[('active', self.text_color), ('pressed', self.text_color)])
         
+        # Sonuç listesi (Treeview) stilleri
+        style.configure('Treeview', background=self.card_color, fieldbackground=self.card_color,
+                      foreground=self.text_color, rowheight=24, font=('Helvetica', 10))
+        style.configure('Treeview.Heading', background=self.sidebar_color, foreground=self.text_color,
+                      font=('Helvetica', 10, 'bold'))
+        style.map('Treeview', background=[('selected', self.accent_color)])
+        
         # Entry ve Combobox stilleri
         style.configure('TEntry', fieldbackground="#ecf0f1")
         style.configure('TCombobox', fieldbackground="#ecf0f1")
@@ -102,20 +147,9 @@ class ModernFaceAnalysisApp:
                  foreground=[('selected', self.text_color), ('active', self.text_color)])
 
     def create_db_tables(self):
-        cursor = self.db_connection.cursor()
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS analysis_data (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                gender TEXT,
-                hair_color TEXT,
-                eye_color TEXT,
-                emotion TEXT,
-                age INTEGER,
-                clothing_color TEXT
-            )
-        ''')
-        self.db_connection.commit()
+        # Tablo oluşturma + WAL ve yazma pragmaları
+        configure_connection(self.db_connection)
+        ensure_indexes(self.db_connection)
 
     def setup_ui(self):
         # Ana konteyner
@@ -166,6 +200,7 @@ class ModernFaceAnalysisApp:
         
         # Güncelleme olayı bağlantısı
         self.root.bind("<<UpdateDisplay>>", self.update_display)
+        self.root.after(100, self.poll_ui_updates)
 
     def setup_logo(self):
         logo_frame = ttk.Frame(self.sidebar, style='Card.TFrame')
@@ -195,10 +230,14 @@ class ModernFaceAnalysisApp:
         buttons = [
             ("📷 Resim Yükle", self.open_image, "#3498db"),
             ("🎥 Kamera Aç/Kapat", self.toggle_camera, "#e74c3c"),
+            ("🎞️ Video Analizi", self.toggle_video, "#2980b9"),
+            ("📡 Çoklu Kamera", self.toggle_multi_camera, "#c0392b"),
             ("📊 İstatistikler", self.show_statistics, "#9b59b6"),
             ("🔍 Veri Filtrele", self.open_filter_dialog, "#f39c12"),
             ("📈 Grafikler", self.show_pie_chart, "#2ecc71"),
             ("💾 Veriyi Dışa Aktar", self.save_dataset, "#1abc9c"),
+            ("📤 Canlı Dışa Aktarım", self.toggle_live_export, "#16a085"),
+            ("⏱️ Performans HUD", self.toggle_metrics, "#7f8c8d"),
             ("🗃️ Veritabanına Kaydet", self.save_to_db, "#34495e"),
             ("🧹 Verileri Temizle", self.clear_data, "#e74c3c")
         ]
@@ -238,6 +277,10 @@ class ModernFaceAnalysisApp:
         self.preview_label = ttk.Label(preview_frame, background=self.card_color)
         self.preview_label.pack(pady=5, padx=5, fill=tk.X)
         
+        # Kareler iş parçacıklarından bırakılır, Tk döngüsünde çizilir
+        self.preview = PreviewRenderer(self.root, self.preview_label, (300, 300), upscale=False, timer=self.timer)
+        self.preview.start()
+        
         # Kamera kontrol butonları
         cam_btn_frame = ttk.Frame(preview_frame)
         cam_btn_frame.pack(pady=5)
@@ -260,27 +303,13 @@ class ModernFaceAnalysisApp:
         self.snap_btn.state(['disabled'])
 
     def setup_results_display(self):
-        # Sonuçlar için kart görünümü
-        self.results_canvas = tk.Canvas(self.results_tab, bg=self.bg_color, highlightthickness=0)
-        self.scrollbar = ttk.Scrollbar(self.results_tab, orient="vertical", command=self.results_canvas.yview)
-        self.scrollable_frame = ttk.Frame(self.results_canvas)
-        
-        self.scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.results_canvas.configure(
-                scrollregion=self.results_canvas.bbox("all")
-            )
+        # Yalnızca görünen satırları çizen sanal liste (tüm geçmiş tek listede)
+        self.results_list = VirtualResultList(
+            self.results_tab,
+            source=self.result_store,
+            empty_text="Henüz analiz verisi yok...\nLütfen bir resim yükleyin veya kamerayı başlatın."
         )
-        
-        self.results_canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
-        self.results_canvas.configure(yscrollcommand=self.scrollbar.set)
-        
-        self.results_canvas.pack(side="left", fill="both", expand=True)
-        self.scrollbar.pack(side="right", fill="y")
-        
-        # Fare tekerleği ile kaydırma
-        self.results_canvas.bind_all("<MouseWheel>", 
-            lambda event: self.results_canvas.yview_scroll(int(-1*(event.delta/120)), "units"))
+        self.results_list.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
 
     def setup_status_bar(self):
         self.status_var = tk.StringVar()
@@ -298,6 +327,15 @@ class ModernFaceAnalysisApp:
         )
         status_label.pack(side=tk.LEFT, padx=10)
         
+        # Model yükleme göstergesi
+        self.model_status_label = tk.Label(
+            status_bar,
+            bg=self.sidebar_color,
+            fg=self.text_color,
+            font=('Helvetica', 9)
+        )
+        self.model_status_label.pack(side=tk.LEFT, padx=10)
+        
         # Saat göstergesi
         self.time_var = tk.StringVar()
         self.update_clock()
@@ -315,138 +353,8 @@ class ModernFaceAnalysisApp:
         self.time_var.set(current_time)
         self.root.after(1000, self.update_clock)
 
-    def detect_dominant_color(self, image, k=3):
-        if image.size == 0:
-            return (0, 0, 0)
-            
-        img = cv2.cvtColor(image, cv2.COLOR_BGR2RGB).reshape((-1, 3))
-        kmeans = KMeans(n_clusters=k, n_init=10)
-        kmeans.fit(img)
-        counts = np.bincount(kmeans.labels_)
-        dominant_color = kmeans.cluster_centers_[np.argmax(counts)].astype(int)
-        return tuple(dominant_color)
-
-    def get_eye_color_name(self, rgb):
-        r, g, b = rgb
-
-        color_ranges = [
-            ((80, 40, 0), (255, 255, 50), "Kahverengi"),
-            ((100, 60, 0), (255, 255, 40), "Ela"),
-            ((180, 140, 0), (255, 255, 70), "Kehribar"),
-            ((0, 0, 130), (100, 150, 255), "Mavi"),
-            ((0, 130, 0), (120, 255, 100), "Yeşil"),
-            ((120, 120, 120), (255, 255, 255), "Gri"),
-            ((150, 0, 0), (255, 80, 80), "Kırmızı")
-        ]
-
-        for (lower, upper, color_name) in color_ranges:
-            if all(lower[i] <= rgb[i] <= upper[i] for i in range(3)):
-                return color_name
-        return "Bilinmiyor"
-
-    def get_hair_color_name(self, rgb):
-        r, g, b = rgb
-        brightness = (r + g + b) / 3
-
-        if r > 100 and g > 50 and b < 50:
-            color = "Kızıl"
-        elif r > 190 and g > 170 and b > 120:
-            color = "Sarışın"
-        elif r > 60 and g > 40 and b > 20:
-            color = "Kahverengi"
-        elif r < 50 and g < 50 and b < 50:
-            color = "Siyah"
-        else:
-            color = "Bilinmiyor"
-
-        dyed = "(Boyalı olabilir)" if brightness > 170 or brightness < 40 else ""
-        return f"{color} {dyed}".strip()
-
-    def extract_hair_color(self, image, face):
-        x, y, w, h = face
-        region = image[max(0, y - int(h * 0.6)):y, x:x + w]
-        return self.detect_dominant_color(region)
-
-    def extract_eye_color(self, image, face):
-        x, y, w, h = face
-        region = image[y + int(h * 0.2):y + int(h * 0.4), x + int(w * 0.2):x + int(w * 0.8)]
-        return self.detect_dominant_color(region)
-
-    def extract_clothing_color(self, image, face):
-        x, y, w, h = face
-        region = image[y + h:y + h + int(h * 0.5), x:x + w]
-        return self.detect_dominant_color(region)
-
     def analyze_faces(self, image):
-        results = []
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        
-        # Daha gelişmiş yüz tespiti
-        face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + "haarcascade_frontalface_default.xml")
-        faces = face_cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(30, 30))
-
-        for face in faces:
-            x, y, w, h = face
-            roi = image[y:y + h, x:x + w]
-
-            try:
-                analysis = DeepFace.analyze(
-                    roi,
-                    actions=["emotion", "gender", "age"],
-                    enforce_detection=False,
-                    silent=True
-                )
-                emotion = analysis[0]["dominant_emotion"]
-                gender = analysis[0]["dominant_gender"]
-                age = int(analysis[0]["age"])
-            except Exception as e:
-                logging.error(f"DeepFace analiz hatası: {str(e)}")
-                emotion = "Tespit Edilemedi"
-                gender = "Bilinmiyor"
-                age = 0
-
-            hair_rgb = self.extract_hair_color(image, face)
-            hair_color = self.get_hair_color_name(hair_rgb)
-
-            eye_rgb = self.extract_eye_color(image, face)
-            eye_color = self.get_eye_color_name(eye_rgb)
-
-            clothing_rgb = self.extract_clothing_color(image, face)
-            clothing_color = f"RGB({clothing_rgb[0]}, {clothing_rgb[1]}, {clothing_rgb[2]})"
-
-            results.append({
-                "Cinsiyet": gender,
-                "Yaş": age,
-                "Saç Rengi": hair_color,
-                "Göz Rengi": eye_color,
-                "Duygu": emotion,
-                "Kıyafet Rengi": clothing_color,
-                "RGB": (hair_rgb, eye_rgb, clothing_rgb)
-            })
-
-            # Görsel işaretleme
-            self.draw_analysis_results(image, face, results[-1])
-
-        return image, results
-
-    def draw_analysis_results(self, image, face, result):
-        x, y, w, h = face
-        cv2.rectangle(image, (x, y), (x + w, y + h), (0, 255, 0), 2)
-        
-        # Bilgileri görsele ekle
-        info_texts = [
-            f"Cinsiyet: {result['Cinsiyet']}",
-            f"Yaş: {result['Yaş']}",
-            f"Duygu: {result['Duygu']}",
-            f"Saç: {result['Saç Rengi']}",
-            f"Göz: {result['Göz Rengi']}"
-        ]
-        
-        for i, text in enumerate(info_texts):
-            cv2.putText(
-                image, text, (x, y - 10 - (i * 20)),
-                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 1
-            )
+        return self.analyzer.analyze_faces(image)
 
     def open_image(self):
         file_path = filedialog.askopenfilename(
@@ -459,7 +367,7 @@ class ModernFaceAnalysisApp:
                     raise ValueError("Geçersiz resim dosyası")
                     
                 analyzed, results = self.analyze_faces(image)
-                self.data_list.extend(results)
+                self.record_results(results)
                 
                 # Önizleme göster
                 self.show_image_preview(analyzed)
@@ -473,13 +381,71 @@ class ModernFaceAnalysisApp:
                 logging.error(f"Resim işleme hatası: {str(e)}")
 
     def show_image_preview(self, image):
-        image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        img = Image.fromarray(image)
-        img.thumbnail((300, 300))
-        
-        imgtk = ImageTk.PhotoImage(image=img)
-        self.preview_label.config(image=imgtk)
-        self.preview_label.image = imgtk
+        self.preview.show(image)
+
+    def toggle_video(self):
+        if self.video_thread is not None:
+            self.video_stop.set()
+            self.status_var.set("Video analizi durduruluyor...")
+            return
+        if self.is_camera_active or self.multi_pool is not None:
+            messagebox.showwarning("Uyarı", "Video analizi için önce kamerayı durdurun!")
+            return
+
+        patterns = " ".join(f"*{ext}" for ext in VIDEO_EXTENSIONS)
+        file_path = filedialog.askopenfilename(filetypes=[("Videolar", patterns)])
+        if not file_path:
+            return
+        info = probe_video(file_path)
+        if info is None:
+            messagebox.showerror("Hata", "Video dosyası açılamadı!")
+            return
+
+        # Video kaydı tam kalitede analiz edilir
+        self.governor.reset()
+        self.video_stop.clear()
+        self.video_thread = threading.Thread(target=self.analyze_video, args=(info,), daemon=True, name="video")
+        self.video_thread.start()
+        self.status_var.set(f"Video analizi başladı: {os.path.basename(file_path)}")
+        logging.info(f"Video analizi başladı: {file_path}")
+
+    def analyze_video(self, info):
+        step = sample_step(info.fps, per_second=self.video_fps)
+        base_time = recording_start(info)
+        name = os.path.basename(info.path)
+        frames = faces = 0
+        start = last_update = time.perf_counter()
+        error = None
+        try:
+            for index, seconds, results in analyze_video_range(
+                    self.analyzer, info.path, step=step, fps=info.fps, stop_event=self.video_stop):
+                frames += 1
+                faces += len(results)
+                # Kayıtlar videodaki zamanlarıyla saklanır
+                self.record_results(results, base_time + seconds)
+
+                now = time.perf_counter()
+                if now - last_update >= 0.5:
+                    last_update = now
+                    progress = f"{seconds:.0f}/{info.duration:.0f} s" if info.duration else f"{seconds:.0f} s"
+                    text = f"Video analizi: {name} - {progress}, {faces} yüz"
+                    self.call_in_ui(self.status_var.set, text)
+                    self.request_display_update()
+        except Exception as e:
+            error = str(e)
+            logging.error(f"Video analizi hatası: {error}")
+        elapsed = time.perf_counter() - start
+        logging.info(f"Video analizi bitti: {name}, {frames} kare, {faces} yüz, {elapsed:.1f} s")
+        self.call_in_ui(self.on_video_done, frames, faces, elapsed, error)
+
+    def on_video_done(self, frames, faces, elapsed, error):
+        self.video_thread = None
+        self.root.event_generate("<<UpdateDisplay>>")
+        if error:
+            messagebox.showerror("Hata", f"Video işlenirken hata oluştu: {error}")
+            self.status_var.set("Video analizi hata ile sonlandı")
+        else:
+            self.status_var.set(f"Video analizi tamamlandı - {frames} kare, {faces} yüz ({elapsed:.1f} s)")
 
     def toggle_camera(self):
         if self.is_camera_active:
@@ -492,130 +458,280 @@ class ModernFaceAnalysisApp:
             self.snap_btn.state(['!disabled'])
 
     def start_camera(self):
+        if self.video_thread is not None or self.multi_pool is not None:
+            self.status_var.set("Video analizi veya çoklu kamera sürerken kamera açılamaz")
+            return
         if not self.is_camera_active:
-            self.cap = cv2.VideoCapture(0)
-            if not self.cap.isOpened():
+            self.tracker.reset()
+            self.governor.reset()
+            self.last_tracked_seq = -1
+            self.pipeline = CameraPipeline(
+                0,
+                self.process_camera_frame,
+                self.render_camera_frame,
+                on_result=self.record_camera_results,
+                on_stop=lambda: self.call_in_ui(self.on_camera_lost),
+                workers=self.inference_workers,
+                timer=self.timer
+            )
+            if not self.pipeline.start():
+                self.pipeline = None
                 self.status_var.set("Kamera açılamadı!")
                 logging.error("Kamera açılamadı")
                 return
                 
-            self.stop_event.clear()
             self.is_camera_active = True
-            self.camera_thread = threading.Thread(target=self.camera_loop, daemon=True)
-            self.camera_thread.start()
             self.status_var.set("Kamera aktif - Analiz yapılıyor...")
             logging.info("Kamera başlatıldı")
 
     def stop_camera(self):
         if self.is_camera_active:
-            self.stop_event.set()
             self.is_camera_active = False
-            if self.cap:
-                self.cap.release()
+            if self.pipeline:
+                self.pipeline.stop()
+                self.log_camera_stats()
+                self.pipeline = None
+            self.root.event_generate("<<UpdateDisplay>>")
             self.status_var.set("Kamera durduruldu")
             logging.info("Kamera durduruldu")
 
+    def on_camera_lost(self):
+        # Kamera okunamadığında hat kendini durdurur; arayüz buna göre güncellenir
+        if self.is_camera_active:
+            self.stop_camera()
+            self.cam_btn.config(text="Kamerayı Başlat")
+            self.snap_btn.state(['disabled'])
+
+    def toggle_multi_camera(self):
+        if self.multi_pool is not None:
+            self.stop_multi_camera()
+            return
+        if self.is_camera_active or self.video_thread is not None:
+            messagebox.showwarning("Uyarı", "Çoklu kamera için önce kamerayı veya video analizini durdurun!")
+            return
+
+        text = simpledialog.askstring(
+            "Çoklu Kamera",
+            "Kaynakları virgülle ayırarak girin (kamera numarası, RTSP adresi veya video dosyası):",
+            initialvalue=self.multi_sources,
+            parent=self.root
+        )
+        sources = [item.strip() for item in (text or "").split(",") if item.strip()]
+        if not sources:
+            return
+        self.multi_sources = text
+
+        self.governor.reset()
+        self.multi_pool = MultiCameraPool(
+            sources,
+            self.analyzer,
+            workers=self.inference_workers,
+            on_result=lambda stream, results: self.record_camera_results(results),
+            render_fn=self.render_multi_camera,
+            timer=self.timer
+        )
+        self.multi_pool.start()
+        self.status_var.set(f"Çoklu kamera aktif - {len(sources)} kaynak")
+        logging.info(f"Çoklu kamera başlatıldı: {', '.join(sources)}")
+
+    def stop_multi_camera(self):
+        if self.multi_pool is None:
+            return
+        self.multi_pool.stop()
+        logging.info("Çoklu kamera istatistiği:\n" + format_stats(self.multi_pool.stats()))
+        self.multi_pool = None
+        self.root.event_generate("<<UpdateDisplay>>")
+        self.status_var.set("Çoklu kamera durduruldu")
+
+    def render_multi_camera(self, mosaic):
+        if self.timer.enabled:
+            self.draw_metrics_hud(mosaic)
+        self.show_camera_preview(mosaic)
+
+    def log_camera_stats(self):
+        stats = self.pipeline.stats()
+        logging.info(
+            f"Hat istatistiği: yakalama {stats['capture_fps']:.1f} fps, çıkarım {stats['inference_fps']:.1f} fps, "
+            f"ekran {stats['display_fps']:.1f} fps, atlanan kare {stats['dropped_frames']}, "
+            f"bayat sonuç {stats['stale_results']}, gecikme p50 {stats['latency_p50_ms']:.0f} ms / "
+            f"p95 {stats['latency_p95_ms']:.0f} ms"
+        )
+        stats = self.tracker.stats()
+        logging.info(
+            f"Takip istatistiği: {stats['frames']} kare, {stats['detections']} yüz tespiti, "
+            f"{stats['analyses']} model çağrısı ({stats['reduction']:.1f}x azalma)"
+        )
+        logging.info(f"{self.governor.status()}, {self.governor.changes} seviye değişikliği")
+
+    def apply_quality(self, settings):
+        apply_quality(settings, self.analyzer.detector, self.tracker, self.analyzer.color_engine)
+
     def take_snapshot(self):
-        if self.current_frame is not None and self.is_camera_active:
-            analyzed, results = self.analyze_faces(self.current_frame.copy())
-            self.data_list.extend(results)
+        frame = self.pipeline.latest_frame if self.pipeline else None
+        if frame is not None and self.is_camera_active:
+            analyzed, results = self.analyze_faces(frame.copy())
+            self.record_results(results)
             self.show_image_preview(analyzed)
             self.root.event_generate("<<UpdateDisplay>>")
             self.status_var.set(f"Fotoğraf çekildi - {len(results)} yüz tespit edildi")
 
-    def camera_loop(self):
-        while not self.stop_event.is_set() and self.is_camera_active:
-            ret, frame = self.cap.read()
-            if not ret:
-                break
-                
-            self.current_frame = frame.copy()
-            analyzed, results = self.analyze_faces(frame)
-            self.data_list.extend(results)
-            
-            # Önizleme göster
-            self.show_camera_preview(analyzed)
-            
-            # Her 10 frame'de bir veriyi güncelle
-            if len(self.data_list) % 10 == 0:
-                self.root.event_generate("<<UpdateDisplay>>")
-                
-            time.sleep(0.1)  # CPU kullanımını azalt
+    def process_camera_frame(self, seq, frame):
+        """Çıkarım iş parçacığında çalışır: (çizim listesi, yeni sonuçlar) döndürür."""
+        started = time.perf_counter()
+        # Tespit kilitsiz yapılır; takipçi durumu ise sırayla güncellenmelidir
+        with self.timer.span("detect"):
+            detections = self.analyzer.detector.detect(frame)
+        with self.tracker_lock:
+            if seq <= self.last_tracked_seq:
+                # Başka bir işçi daha yeni bir kareyi zaten işledi
+                return None
+            self.last_tracked_seq = seq
+            with self.timer.span("track"):
+                tracks = self.tracker.update(detections, frame)
+                stale = [track for track in tracks if self.tracker.needs_analysis(track)]
+            for track in stale:
+                self.tracker.claim(track)
+            # Kilit bırakılınca başka bir işçi daha yeni kareyle izin tespitini değiştirebilir;
+            # bu karenin tespiti ve önceki sonucu burada sabitlenir
+            claimed = [(track, track.detection, track.result) for track in stale]
+        
+        # Yeni yüzler her zaman tam analiz edilir; yeniden analizde özellikler kalite seviyesine bağlıdır
+        actions = self.governor.settings["actions"]
+        if tuple(actions) == ATTRIBUTE_ACTIONS:
+            groups = [(claimed, ATTRIBUTE_ACTIONS)]
+        else:
+            groups = [([c for c in claimed if c[2] is None], ATTRIBUTE_ACTIONS),
+                      ([c for c in claimed if c[2] is not None], actions)]
+        
+        analyzed = []
+        try:
+            for group, group_actions in groups:
+                if not group:
+                    continue
+                try:
+                    group_results = self.analyzer.analyze_detections(
+                        frame, [detection for _, detection, _ in group], draw=False, actions=group_actions
+                    )
+                except Exception as e:
+                    # Başarısız grup diğer grubun sonuçlarını düşürmez; izleri sonraki karede yeniden denenir
+                    logging.error(f"Yüz analizi hatası: {str(e)}")
+                    continue
+                for (track, _, previous), result in zip(group, group_results):
+                    # Hesaplanmayan özellikler izin önceki sonucundan alınır
+                    for key, value in (previous or {}).items():
+                        if result.get(key) is None:
+                            result[key] = value
+                    analyzed.append((track, result))
+        finally:
+            with self.tracker_lock:
+                for track, result in analyzed:
+                    self.tracker.store(track, result)
+                # Sonuç alınamayan izler serbest bırakılır; aksi halde bir daha hiç analiz edilmezler
+                for track in stale:
+                    if track.pending:
+                        self.tracker.release(track)
+                overlay = [(track.box, track.result) for track in tracks if track.result is not None]
+        
+        self.governor.observe(time.perf_counter() - started)
+        # Yalnızca yeni analizler kaydedilir; önbellekten gelenler tekrar eklenmez
+        return overlay, [result for _, result in analyzed]
 
-        self.is_camera_active = False
-        if self.cap:
-            self.cap.release()
-        self.root.event_generate("<<UpdateDisplay>>")
+    def render_camera_frame(self, frame, overlay):
+        with self.timer.span("draw"):
+            for box, result in overlay or []:
+                self.analyzer.draw_analysis_results(frame, box, result)
+        if self.timer.enabled:
+            self.draw_metrics_hud(frame)
+        self.show_camera_preview(frame)
+
+    def draw_metrics_hud(self, frame):
+        # Yüzdelikler yarım saniyede bir hesaplanır; aradaki karelerde önbellek kullanılır
+        updated, stages, lines = self._hud_cache
+        now = time.perf_counter()
+        if now - updated > 0.5:
+            stages = self.timer.snapshot()
+            lines = []
+            if self.pipeline:
+                stats = self.pipeline.stats()
+                lines.append(f"FPS kamera {stats['capture_fps']:.0f} / analiz {stats['inference_fps']:.0f} / "
+                             f"ekran {stats['display_fps']:.0f}")
+            if self.multi_pool:
+                for s in self.multi_pool.stats()["streams"]:
+                    lines.append(f"[{s['stream']}] {s['inference_fps']:.0f} fps, p95 {s['latency_p95_ms']:.0f} ms, "
+                                 f"atlanan {s['dropped_frames']}")
+            lines.append(self.governor.status())
+            self._hud_cache = (now, stages, lines)
+        draw_hud(frame, stages, lines)
+
+    def toggle_metrics(self):
+        if self.metrics_sink:
+            self.timer.enabled = False
+            self.metrics_sink.stop()
+            self.metrics_sink = None
+            self.status_var.set(f"Performans ölçümü kapatıldı - {self.metrics_path}")
+            return
+        
+        self.timer.reset()
+        self.timer.enabled = True
+        # Aşama süreleri ve hat istatistikleri 5 sn'de bir metrik dosyasına eklenir
+        self.metrics_sink = MetricsFileSink(
+            self.timer, self.metrics_path, interval=5.0,
+            extra=self.metrics_extra
+        )
+        self.status_var.set(f"Performans ölçümü açık - {self.metrics_path}")
+
+    def metrics_extra(self):
+        extra = {}
+        if self.pipeline:
+            extra["pipeline"] = self.pipeline.stats()
+        if self.multi_pool:
+            extra["multi_camera"] = self.multi_pool.stats()
+        return extra
+
+    def record_results(self, results, timestamp=None):
+        # Her kayıt bir kez depoya ve bir kez veritabanı kuyruğuna gider
+        timestamp = timestamp if timestamp is not None else time.time()
+        self.result_store.extend(results, timestamp)
+        self.db_writer.submit(results, timestamp)
+
+    def record_camera_results(self, results):
+        # Çıkarım iş parçacıklarından çağrılır; liste Tk döngüsünde en fazla 100 ms'de bir yenilenir
+        self.record_results(results)
+        self.request_display_update()
+
+    def request_display_update(self):
+        """Herhangi bir iş parçacığından: sonuç listesinin yenilenmesini ister."""
+        self.display_dirty = True
+
+    def call_in_ui(self, func, *args):
+        """Herhangi bir iş parçacığından: `func(*args)` Tk döngüsünde çalıştırılır."""
+        self.ui_calls.put((func, args))
+
+    def poll_ui_updates(self):
+        while True:
+            try:
+                func, args = self.ui_calls.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                func(*args)
+            except Exception as e:
+                logging.error(f"Arayüz güncelleme hatası: {str(e)}")
+        if self.display_dirty:
+            self.display_dirty = False
+            self.update_display()
+        self.root.after(100, self.poll_ui_updates)
 
     def show_camera_preview(self, image):
-        try:
-            image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-            img = Image.fromarray(image)
-            img.thumbnail((300, 300))
-            
-            imgtk = ImageTk.PhotoImage(image=img)
-            self.preview_label.config(image=imgtk)
-            self.preview_label.image = imgtk
-        except Exception as e:
-            logging.error(f"Kamera önizleme hatası: {str(e)}")
+        # İş parçacığı güvenli: yalnızca en son kare saklanır
+        self.preview.submit(image)
 
     def update_display(self, event=None):
-        # Önceki sonuçları temizle
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
-        
-        if not self.data_list:
-            empty_label = ttk.Label(
-                self.scrollable_frame,
-                text="Henüz analiz verisi yok...\nLütfen bir resim yükleyin veya kamerayı başlatın.",
-                style='TLabel',
-                font=('Helvetica', 10, 'italic')
-            )
-            empty_label.pack(pady=50)
-            return
-            
-        for i, d in enumerate(self.data_list[-20:], 1):  # Son 20 kaydı göster
-            card_frame = ttk.Frame(
-                self.scrollable_frame,
-                style='Card.TFrame',
-                padding=10
-            )
-            card_frame.pack(fill=tk.X, pady=5, padx=5)
-            
-            # Kart başlığı
-            title_label = ttk.Label(
-                card_frame,
-                text=f"Analiz Kaydı #{i}",
-                style='Card.TLabel',
-                font=('Helvetica', 12, 'bold')
-            )
-            title_label.pack(anchor=tk.W)
-            
-            # Veri alanları
-            fields = [
-                f"👤 Cinsiyet: {d['Cinsiyet']}",
-                f"🎂 Yaş: {d['Yaş']}",
-                f"💇 Saç Rengi: {d['Saç Rengi']}",
-                f"👁️ Göz Rengi: {d['Göz Rengi']}",
-                f"😊 Duygu: {d['Duygu']}",
-                f"👕 Kıyafet Rengi: {d['Kıyafet Rengi']}"
-            ]
-            
-            for field in fields:
-                field_label = ttk.Label(
-                    card_frame,
-                    text=field,
-                    style='Card.TLabel',
-                    font=('Helvetica', 10)
-                )
-                field_label.pack(anchor=tk.W, padx=10, pady=2)
-            
-            # Ayırıcı çizgi
-            separator = ttk.Separator(card_frame, orient='horizontal')
-            separator.pack(fill=tk.X, pady=5)
+        # Yalnızca görünen satırlar güncellenir; maliyet kayıt sayısından bağımsızdır
+        self.results_list.refresh()
 
     def show_statistics(self):
-        if not self.data_list:
+        if not self.result_store:
             messagebox.showinfo("Bilgi", "Analiz verisi yok!")
             return
             
@@ -628,23 +744,20 @@ class ModernFaceAnalysisApp:
         notebook = ttk.Notebook(stats_window)
         notebook.pack(fill=tk.BOTH, expand=True)
         
-        df = pd.DataFrame(self.data_list)
-        
         # Genel istatistikler
         general_frame = ttk.Frame(notebook)
         notebook.add(general_frame, text="Genel")
         
-        # Kart stilinde istatistikler
+        # Kart stilinde istatistikler (değerler canlı güncellenir)
         cards = [
-            ("Toplam Analiz", len(df), "#3498db"),
-            ("Ortalama Yaş", f"{df['Yaş'].mean():.1f}", "#2ecc71"),
-            ("Erkek/Kadın Oranı", 
-             f"{len(df[df['Cinsiyet'] == 'Man'])}/{len(df[df['Cinsiyet'] == 'Woman'])}", 
-             "#9b59b6"),
-            ("En Yaygın Duygu", df['Duygu'].mode()[0], "#e74c3c")
+            ("Toplam Analiz", "#3498db"),
+            ("Ortalama Yaş", "#2ecc71"),
+            ("Erkek/Kadın Oranı", "#9b59b6"),
+            ("En Yaygın Duygu", "#e74c3c")
         ]
+        card_vars = []
         
-        for i, (title, value, color) in enumerate(cards):
+        for i, (title, color) in enumerate(cards):
             card = tk.Frame(
                 general_frame,
                 bg=color,
@@ -663,9 +776,11 @@ class ModernFaceAnalysisApp:
             )
             title_label.pack(pady=(10, 0))
             
+            value_var = tk.StringVar()
+            card_vars.append(value_var)
             value_label = tk.Label(
                 card,
-                text=str(value),
+                textvariable=value_var,
                 bg=color,
                 fg="white",
                 font=('Helvetica', 24, 'bold')
@@ -681,53 +796,60 @@ class ModernFaceAnalysisApp:
         detailed_frame = ttk.Frame(notebook)
         notebook.add(detailed_frame, text="Detaylar")
         
-        # Cinsiyet dağılımı
+        # Cinsiyet ve duygu dağılımı; yeni kategoriler geldikçe satır eklenir
         gender_frame = ttk.LabelFrame(detailed_frame, text="Cinsiyet Dağılımı")
         gender_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        gender_stats = df['Cinsiyet'].value_counts()
-        for gender, count in gender_stats.items():
-            percent = count / len(df) * 100
-            ttk.Label(
-                gender_frame,
-                text=f"{gender}: {count} kişi (%{percent:.1f})",
-                style='TLabel'
-            ).pack(anchor=tk.W, padx=10, pady=5)
-            
-            # Progress bar
-            progress = ttk.Progressbar(
-                gender_frame,
-                orient=tk.HORIZONTAL,
-                length=200,
-                mode='determinate',
-                value=percent
-            )
-            progress.pack(fill=tk.X, padx=10, pady=(0, 10))
-        
-        # Duygu dağılımı
         emotion_frame = ttk.LabelFrame(detailed_frame, text="Duygu Dağılımı")
         emotion_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        distribution_rows = {"gender": {}, "emotion": {}}
         
-        emotion_stats = df['Duygu'].value_counts()
-        for emotion, count in emotion_stats.items():
-            percent = count / len(df) * 100
-            ttk.Label(
-                emotion_frame,
-                text=f"{emotion}: {count} kişi (%{percent:.1f})",
-                style='TLabel'
-            ).pack(anchor=tk.W, padx=10, pady=5)
-            
-            progress = ttk.Progressbar(
-                emotion_frame,
-                orient=tk.HORIZONTAL,
-                length=200,
-                mode='determinate',
-                value=percent
-            )
-            progress.pack(fill=tk.X, padx=10, pady=(0, 10))
+        def update_distribution(frame, rows, counts, total):
+            for label, count in counts.items():
+                if label not in rows:
+                    text_var = tk.StringVar()
+                    ttk.Label(frame, textvariable=text_var, style='TLabel').pack(anchor=tk.W, padx=10, pady=5)
+                    
+                    # Progress bar
+                    progress = ttk.Progressbar(
+                        frame,
+                        orient=tk.HORIZONTAL,
+                        length=200,
+                        mode='determinate'
+                    )
+                    progress.pack(fill=tk.X, padx=10, pady=(0, 10))
+                    rows[label] = (text_var, progress)
+                
+                percent = count / total * 100
+                text_var, progress = rows[label]
+                text_var.set(f"{label}: {count} kişi (%{percent:.1f})")
+                progress.config(value=percent)
+        
+        last_version = [None]
+        
+        def refresh():
+            if not stats_window.winfo_exists():
+                return
+            # Ham kayıtlara dokunmadan, artımlı tutulan özetten okunur
+            stats = self.result_store.stats.snapshot()
+            if stats["version"] != last_version[0] and stats["count"]:
+                last_version[0] = stats["version"]
+                gender_stats = stats["gender"]
+                card_vars[0].set(str(stats["count"]))
+                card_vars[1].set(f"{stats['mean_age']:.1f}")
+                card_vars[2].set(f"{gender_stats.get('Man', 0)}/{gender_stats.get('Woman', 0)}")
+                card_vars[3].set(next(iter(stats["emotion"])))
+                update_distribution(gender_frame, distribution_rows["gender"], gender_stats, stats["count"])
+                update_distribution(emotion_frame, distribution_rows["emotion"], stats["emotion"], stats["count"])
+            stats_window.after(1000, refresh)
+        
+        refresh()
 
     def open_filter_dialog(self):
-        if not self.data_list:
+        # Filtre hem bu oturumu hem de veritabanındaki geçmişi kapsar. Arayüz yazıcıyı beklemez:
+        # bekleyen kayıtlar hemen yazdırılır, sorgu o ana kadar işlenmiş satırları okur
+        self.db_writer.flush(timeout=0)
+        has_rows = self.db_connection.execute("SELECT 1 FROM analysis_data LIMIT 1").fetchone() is not None
+        if not has_rows and not self.result_store:
             messagebox.showinfo("Bilgi", "Filtrelemek için veri yok!")
             return
             
@@ -769,6 +891,23 @@ class ModernFaceAnalysisApp:
         ttk.Label(age_frame, text=" - ").pack(side=tk.LEFT)
         ttk.Entry(age_frame, textvariable=max_age_var, width=5).pack(side=tk.LEFT)
         
+        ttk.Label(filter_win, text="Zaman:").grid(row=3, column=0, padx=5, pady=5)
+        period_var = tk.StringVar()
+        periods = {
+            "Tümü": None,
+            "Bu oturum": lambda: self.session_start,
+            "Son 24 saat": lambda: time.time() - 24 * 3600,
+            "Son 7 gün": lambda: time.time() - 7 * 24 * 3600
+        }
+        period_combo = ttk.Combobox(
+            filter_win,
+            textvariable=period_var,
+            values=list(periods),
+            state="readonly"
+        )
+        period_combo.grid(row=3, column=1, padx=5, pady=5)
+        period_combo.current(0)
+        
         def apply_filter():
             gender = gender_var.get() if gender_var.get() != "Tümü" else None
             emotion = emotion_var.get() if emotion_var.get() != "Tümü" else None
@@ -779,22 +918,27 @@ class ModernFaceAnalysisApp:
                 messagebox.showerror("Hata", "Minimum yaş maksimum yaştan büyük olamaz!")
                 return
                 
-            filtered = [
-                d for d in self.data_list
-                if (not gender or d['Cinsiyet'] == gender) and
-                   (not emotion or d['Duygu'] == emotion) and
-                   (min_age <= d['Yaş'] <= max_age)
-            ]
+            since = periods[period_var.get()]
+            # Varsayılan aralık filtre sayılmaz (yaş koşulu sorgu planını gereksiz yere değiştirir)
+            query = AnalysisQuery(
+                self.db_connection, gender, emotion,
+                min_age if min_age > 0 else None,
+                max_age if max_age < 100 else None,
+                since=since() if since else None
+            )
             
-            if not filtered:
+            # Sonuçlar sayfa sayfa, görünüm kaydırıldıkça okunur
+            results = LazyQueryResults(query)
+            results.prefetch(1)
+            if not len(results):
                 messagebox.showinfo("Sonuç", "Filtreye uygun veri bulunamadı!")
                 return
                 
             # Filtrelenmiş veriyi göster
-            self.show_filtered_results(filtered)
+            self.show_filtered_results(results)
             filter_win.destroy()
             
-        ttk.Button(filter_win, text="Uygula", command=apply_filter).grid(row=3, columnspan=2, pady=10)
+        ttk.Button(filter_win, text="Uygula", command=apply_filter).grid(row=4, columnspan=2, pady=10)
 
     def show_filtered_results(self, filtered_data):
         result_win = tk.Toplevel(self.root)
@@ -802,122 +946,83 @@ class ModernFaceAnalysisApp:
         result_win.geometry("600x400")
         self.center_window(600, 400, result_win)
         
-        canvas = tk.Canvas(result_win)
-        scrollbar = ttk.Scrollbar(result_win, orient="vertical", command=canvas.yview)
-        scrollable_frame = ttk.Frame(canvas)
-        
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(
-                scrollregion=canvas.bbox("all")
-            )
-        )
-        
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-        
-        for i, d in enumerate(filtered_data, 1):
-            card_frame = ttk.Frame(
-                scrollable_frame,
-                style='Card.TFrame',
-                padding=10
-            )
-            card_frame.pack(fill=tk.X, pady=5, padx=5)
-            
-            title_label = ttk.Label(
-                card_frame,
-                text=f"Filtrelenmiş Kayıt #{i}",
-                style='Card.TLabel',
-                font=('Helvetica', 12, 'bold')
-            )
-            title_label.pack(anchor=tk.W)
-            
-            fields = [
-                f"👤 Cinsiyet: {d['Cinsiyet']}",
-                f"🎂 Yaş: {d['Yaş']}",
-                f"💇 Saç Rengi: {d['Saç Rengi']}",
-                f"👁️ Göz Rengi: {d['Göz Rengi']}",
-                f"😊 Duygu: {d['Duygu']}",
-                f"👕 Kıyafet Rengi: {d['Kıyafet Rengi']}"
+        results_list = VirtualResultList(result_win, source=filtered_data, follow=False)
+        results_list.pack(fill=tk.BOTH, expand=True)
+        results_list.refresh()
+
+    def ask_export_path(self):
+        return filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[
+                ("CSV Dosyaları", "*.csv"),
+                ("Parquet Dosyaları", "*.parquet"),
+                ("Arrow Dosyaları", "*.arrow"),
+                ("JSON Lines Dosyaları", "*.jsonl")
             ]
-            
-            for field in fields:
-                field_label = ttk.Label(
-                    card_frame,
-                    text=field,
-                    style='Card.TLabel',
-                    font=('Helvetica', 10)
-                )
-                field_label.pack(anchor=tk.W, padx=10, pady=2)
-            
-            separator = ttk.Separator(card_frame, orient='horizontal')
-            separator.pack(fill=tk.X, pady=5)
+        )
 
     def save_dataset(self):
-        if not self.data_list:
+        if not self.result_store:
             messagebox.showwarning("Uyarı", "Kaydedilecek veri yok!")
             return
             
-        file_path = filedialog.asksaveasfilename(
-            defaultextension=".csv",
-            filetypes=[("CSV Dosyaları", "*.csv")]
-        )
+        file_path = self.ask_export_path()
         
         if file_path:
             try:
-                df = pd.DataFrame(self.data_list)
-                # RGB bilgilerini kaydetme
-                df['Saç RGB'] = df['RGB'].apply(lambda x: f"{x[0][0]},{x[0][1]},{x[0][2]}")
-                df['Göz RGB'] = df['RGB'].apply(lambda x: f"{x[1][0]},{x[1][1]},{x[1][2]}")
-                df['Kıyafet RGB'] = df['RGB'].apply(lambda x: f"{x[2][0]},{x[2][1]},{x[2][2]}")
-                df.drop('RGB', axis=1, inplace=True)
-                
-                df.to_csv(file_path, index=False, encoding='utf-8-sig')
+                # Kolonlar parça parça yazılır; tüm veri tek seferde belleğe alınmaz
+                with exporter_for_path(file_path) as exporter:
+                    count = exporter.sync(self.result_store)
                 self.status_var.set(f"Veri başarıyla kaydedildi: {os.path.basename(file_path)}")
-                logging.info(f"CSV dosyası kaydedildi: {file_path}")
-                messagebox.showinfo("Başarılı", "Veri başarıyla CSV dosyasına kaydedildi!")
+                logging.info(f"Dışa aktarma tamamlandı ({count} kayıt): {file_path}")
+                messagebox.showinfo("Başarılı", "Veri başarıyla dosyaya kaydedildi!")
             except Exception as e:
                 messagebox.showerror("Hata", f"Dosya kaydedilirken hata oluştu: {str(e)}")
-                logging.error(f"CSV kaydetme hatası: {str(e)}")
+                logging.error(f"Dışa aktarma hatası: {str(e)}")
+
+    def toggle_live_export(self):
+        if self.live_export:
+            count = self.live_export.stop()
+            self.live_export = None
+            self.status_var.set(f"Canlı dışa aktarım durduruldu - {count} kayıt yazıldı")
+            logging.info(f"Canlı dışa aktarım durduruldu ({count} kayıt)")
+            return
+        
+        file_path = self.ask_export_path()
+        if file_path:
+            try:
+                # Mevcut kayıtlar ilk senkronizasyonda, yenileri geldikçe eklenir
+                self.live_export = LiveExportSink(self.result_store, exporter_for_path(file_path))
+                self.status_var.set(f"Canlı dışa aktarım: {os.path.basename(file_path)}")
+                logging.info(f"Canlı dışa aktarım başlatıldı: {file_path}")
+            except Exception as e:
+                messagebox.showerror("Hata", f"Dışa aktarım başlatılamadı: {str(e)}")
+                logging.error(f"Canlı dışa aktarım hatası: {str(e)}")
 
     def save_to_db(self):
-        if not self.data_list:
+        if not self.result_store:
             messagebox.showwarning("Uyarı", "Kaydedilecek veri yok!")
             return
             
-        try:
-            cursor = self.db_connection.cursor()
-            
-            for data in self.data_list:
-                cursor.execute('''
-                    INSERT INTO analysis_data 
-                    (gender, hair_color, eye_color, emotion, age, clothing_color)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (
-                    data['Cinsiyet'],
-                    data['Saç Rengi'],
-                    data['Göz Rengi'],
-                    data['Duygu'],
-                    data['Yaş'],
-                    data['Kıyafet Rengi']
-                ))
-            
-            self.db_connection.commit()
-            self.status_var.set(f"{len(self.data_list)} kayıt veritabanına kaydedildi")
-            logging.info(f"{len(self.data_list)} kayıt veritabanına kaydedildi")
+        # Kayıtlar zaten arka planda yazılıyor; burada yalnızca kuyruğun boşalması beklenir
+        if self.db_writer.flush():
+            self.status_var.set(f"{self.db_writer.written} kayıt veritabanına kaydedildi")
+            logging.info(f"{self.db_writer.written} kayıt veritabanına kaydedildi")
             messagebox.showinfo("Başarılı", "Veriler başarıyla veritabanına kaydedildi!")
-        except Exception as e:
-            messagebox.showerror("Hata", f"Veritabanına kaydedilirken hata oluştu: {str(e)}")
-            logging.error(f"Veritabanı kayıt hatası: {str(e)}")
+        else:
+            messagebox.showerror("Hata", "Veritabanı yazımı zaman aşımına uğradı!")
+            logging.error("Veritabanı yazıcısı zamanında boşalmadı")
 
     def show_pie_chart(self):
-        if not self.data_list:
+        if not self.result_store:
             messagebox.showwarning("Uyarı", "Grafik oluşturmak için veri yok!")
             return
             
+        # Grafik kütüphaneleri yalnızca grafik penceresi ilk açıldığında yüklenir
+        import pandas as pd
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+        
         chart_window = tk.Toplevel(self.root)
         chart_window.title("Veri Dağılımları")
         chart_window.geometry("800x600")
@@ -926,13 +1031,13 @@ class ModernFaceAnalysisApp:
         notebook = ttk.Notebook(chart_window)
         notebook.pack(fill=tk.BOTH, expand=True)
         
-        df = pd.DataFrame(self.data_list)
+        stats = self.result_store.stats.snapshot()
         
         # Cinsiyet dağılımı
         gender_frame = ttk.Frame(notebook)
         gender_fig = Figure(figsize=(6, 4), dpi=100)
         gender_ax = gender_fig.add_subplot(111)
-        df['Cinsiyet'].value_counts().plot(kind='pie', autopct='%1.1f%%', ax=gender_ax)
+        pd.Series(stats["gender"]).plot(kind='pie', autopct='%1.1f%%', ax=gender_ax)
         gender_ax.set_title('Cinsiyet Dağılımı')
         gender_canvas = FigureCanvasTkAgg(gender_fig, master=gender_frame)
         gender_canvas.draw()
@@ -943,7 +1048,7 @@ class ModernFaceAnalysisApp:
         emotion_frame = ttk.Frame(notebook)
         emotion_fig = Figure(figsize=(6, 4), dpi=100)
         emotion_ax = emotion_fig.add_subplot(111)
-        df['Duygu'].value_counts().plot(kind='pie', autopct='%1.1f%%', ax=emotion_ax)
+        pd.Series(stats["emotion"]).plot(kind='pie', autopct='%1.1f%%', ax=emotion_ax)
         emotion_ax.set_title('Duygu Dağılımı')
         emotion_canvas = FigureCanvasTkAgg(emotion_fig, master=emotion_frame)
         emotion_canvas.draw()
@@ -954,7 +1059,9 @@ class ModernFaceAnalysisApp:
         age_frame = ttk.Frame(notebook)
         age_fig = Figure(figsize=(6, 4), dpi=100)
         age_ax = age_fig.add_subplot(111)
-        df['Yaş'].plot(kind='hist', bins=20, ax=age_ax)
+        # Yaş histogramı 1 yaşlık sayaçlardan 20 aralığa toplanır
+        ages = np.flatnonzero(stats["age_hist"])
+        age_ax.hist(ages, bins=20, weights=stats["age_hist"][ages])
         age_ax.set_title('Yaş Dağılımı')
         age_ax.set_xlabel('Yaş')
         age_ax.set_ylabel('Kişi Sayısı')
@@ -965,13 +1072,24 @@ class ModernFaceAnalysisApp:
 
     def clear_data(self):
         if messagebox.askyesno("Onay", "Tüm analiz verilerini silmek istediğinize emin misiniz?"):
-            self.data_list = []
+            self.result_store.clear()
+            self.results_list.set_source(self.result_store)
             self.status_var.set("Veriler temizlendi")
             logging.info("Analiz verileri temizlendi")
-            self.update_display()
 
     def on_closing(self):
         self.stop_camera()
+        self.stop_multi_camera()
+        if self.video_thread is not None:
+            self.video_stop.set()
+            self.video_thread.join(timeout=5.0)
+        self.preview.stop()
+        if self.live_export:
+            self.live_export.stop()
+        if self.metrics_sink:
+            self.metrics_sink.stop()
+        self.result_store.close()
+        self.db_writer.close()
         if self.db_connection:
             self.db_connection.close()
         self.root.destroy()
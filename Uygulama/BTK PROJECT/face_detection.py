@@ -0,0 +1,114 @@
+import math
+
+import cv2
+
+
+class DetectedFace:
+    """Tek bir tespit: çerçeve, hizalanmış yüz kesiti ve göz kutuları (kare koordinatlarında)."""
+
+    __slots__ = ("box", "crop", "eyes")
+
+    def __init__(self, box, crop, eyes):
+        self.box = box
+        self.crop = crop
+        self.eyes = eyes
+
+
+class FaceDetector:
+    """Kare başına bir kez çalışan tespit/hizalama aşaması.
+
+    Üretilen kutular ve hizalanmış kesitler duygu, yaş/cinsiyet, Facenet embedding'i
+    ve renk çıkarımına aynen aktarılır; alt modeller kendi dedektörlerini çalıştırmaz
+    (DeepFace çağrıları detector_backend="skip" ile yapılır).
+
+    backend="haar": OpenCV Haar cascade (varsayılan, en hızlısı).
+    Diğer değerler ("opencv", "ssd", "mtcnn", "retinaface" ...) DeepFace.extract_faces'e aktarılır.
+    `scale` < 1 ise Haar tespiti küçültülmüş gri görüntüde yapılır (kutular ve göz
+    araması yine tam çözünürlükte kalır).
+    """
+
+    def __init__(self, backend="haar", align=True, min_size=(30, 30), scale=1.0):
+        self.backend = backend
+        self.align = align
+        self.min_size = min_size
+        self.scale = scale
+        self.face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + "haarcascade_frontalface_default.xml")
+        self.eye_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + "haarcascade_eye.xml")
+
+    def detect(self, image):
+        """Karedeki yüzleri bulur ve her biri için DetectedFace döndürür."""
+        if image is None or image.size == 0:
+            return []
+        if self.backend == "haar":
+            return self._detect_haar(image)
+        return self._detect_deepface(image)
+
+    def _detect_haar(self, image):
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        scale = self.scale
+        if scale < 1.0:
+            small = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+            min_size = tuple(max(12, int(v * scale)) for v in self.min_size)
+            faces = self.face_cascade.detectMultiScale(small, scaleFactor=1.1, minNeighbors=5, minSize=min_size)
+        else:
+            scale = 1.0
+            faces = self.face_cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=self.min_size)
+
+        detections = []
+        for (x, y, w, h) in faces:
+            x, y, w, h = (int(v / scale) for v in (x, y, w, h))
+            # Gözler yalnızca yüzün üst yarısında ve yalnızca burada bir kez aranır
+            upper = gray[y:y + h // 2, x:x + w]
+            eyes = self.eye_cascade.detectMultiScale(upper, scaleFactor=1.1, minNeighbors=5, minSize=(20, 20))
+            eyes = sorted(eyes, key=lambda e: e[2] * e[3], reverse=True)[:2]
+            eyes = sorted(((x + int(ex), y + int(ey), int(ew), int(eh)) for ex, ey, ew, eh in eyes), key=lambda e: e[0])
+            detections.append(self._build(image, (x, y, w, h), eyes))
+        return detections
+
+    def _detect_deepface(self, image):
+        from deepface import DeepFace
+
+        try:
+            faces = DeepFace.extract_faces(
+                image, detector_backend=self.backend, enforce_detection=False, align=False
+            )
+        except Exception:
+            return []
+
+        img_h, img_w = image.shape[:2]
+        detections = []
+        for face in faces:
+            area = face.get("facial_area", {})
+            x, y, w, h = (int(area.get(k, 0)) for k in ("x", "y", "w", "h"))
+            # Tespit yoksa DeepFace tüm kareyi döndürür; bunu yüz olarak sayma
+            if w <= 0 or h <= 0 or (w >= img_w and h >= img_h):
+                continue
+            eyes = []
+            for key in ("left_eye", "right_eye"):
+                point = area.get(key)
+                if point:
+                    size = max(4, int(w * 0.15))
+                    eyes.append((int(point[0]) - size // 2, int(point[1]) - size // 2, size, size))
+            detections.append(self._build(image, (x, y, w, h), sorted(eyes, key=lambda e: e[0])))
+        return detections
+
+    def _build(self, image, box, eyes):
+        x, y, w, h = box
+        crop = image[max(0, y):y + h, max(0, x):x + w]
+        if self.align and len(eyes) == 2 and crop.size > 0:
+            crop = self._align(crop, box, eyes)
+        return DetectedFace(box, crop, eyes)
+
+    def _align(self, crop, box, eyes):
+        """Gözleri yatay hizaya getirecek şekilde kesiti döndürür."""
+        (lx, ly, lw, lh), (rx, ry, rw, rh) = eyes
+        dx = (rx + rw / 2) - (lx + lw / 2)
+        dy = (ry + rh / 2) - (ly + lh / 2)
+        if dx <= 0:
+            return crop
+        angle = math.degrees(math.atan2(dy, dx))
+        if abs(angle) < 1.0:
+            return crop
+        h, w = crop.shape[:2]
+        matrix = cv2.getRotationMatrix2D((w / 2, h / 2), angle, 1.0)
+        return cv2.warpAffine(crop, matrix, (w, h), borderMode=cv2.BORDER_REPLICATE)
@@ -0,0 +1,191 @@
+import itertools
+
+import cv2
+import numpy as np
+
+
+def box_iou(a, b):
+    """(x, y, w, h) kutuları arasındaki kesişim/birleşim oranı."""
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    ix = max(0, min(ax + aw, bx + bw) - max(ax, bx))
+    iy = max(0, min(ay + ah, by + bh) - max(ay, by))
+    inter = ix * iy
+    union = aw * ah + bw * bh - inter
+    return inter / union if union > 0 else 0.0
+
+
+class Track:
+    """Kareler boyunca aynı kişiye ait yüz: kalıcı kimlik ve önbelleğe alınmış analiz sonucu."""
+
+    __slots__ = ("track_id", "box", "detection", "missed", "frames_since_analysis", "analysis_box", "result",
+                 "pending")
+
+    def __init__(self, track_id, detection):
+        self.track_id = track_id
+        self.box = detection.box
+        self.detection = detection
+        self.missed = 0
+        self.frames_since_analysis = 0
+        self.analysis_box = None
+        self.result = None
+        self.pending = False
+
+
+class FaceTracker:
+    """IoU/merkez eşleştirmeli hafif çoklu yüz takipçisi.
+
+    Pahalı modeller yalnızca iz yeniyse, yüz son analizden bu yana belirgin şekilde
+    kaydıysa veya her `reanalyze_every` karede bir çalıştırılır; arada önbellekteki
+    duygu/kimlik/renk sonuçları kullanılır.
+    """
+
+    def __init__(self, iou_threshold=0.3, max_missed=10, reanalyze_every=30, drift_iou=0.5,
+                 use_optical_flow=False):
+        self.iou_threshold = iou_threshold
+        self.max_missed = max_missed
+        self.reanalyze_every = reanalyze_every
+        self.drift_iou = drift_iou
+        self.use_optical_flow = use_optical_flow
+        self.tracks = []
+        self._ids = itertools.count(1)
+        self._prev_gray = None
+
+        # Model çağrısı istatistikleri
+        self.frames = 0
+        self.analyses = 0
+        self.detections_seen = 0
+
+    def reset(self):
+        self.tracks = []
+        self._prev_gray = None
+
+    def update(self, detections, frame=None):
+        """Yeni tespitleri izlerle eşleştirir; bu karede görünen izleri döndürür."""
+        self.frames += 1
+        self.detections_seen += len(detections)
+
+        if self.use_optical_flow and frame is not None:
+            self._refine_with_flow(frame)
+
+        matches, unmatched_dets = self._associate(detections)
+
+        visible = []
+        matched_tracks = set()
+        for track_index, det_index in matches:
+            track = self.tracks[track_index]
+            track.box = detections[det_index].box
+            track.detection = detections[det_index]
+            track.missed = 0
+            track.frames_since_analysis += 1
+            matched_tracks.add(track_index)
+            visible.append(track)
+
+        for i, track in enumerate(self.tracks):
+            if i not in matched_tracks:
+                track.missed += 1
+        self.tracks = [t for t in self.tracks if t.missed <= self.max_missed]
+
+        for det_index in unmatched_dets:
+            track = Track(next(self._ids), detections[det_index])
+            self.tracks.append(track)
+            visible.append(track)
+
+        return visible
+
+    def needs_analysis(self, track):
+        """İz için modellerin yeniden çalıştırılması gerekip gerekmediğini söyler."""
+        if track.pending:
+            return False
+        if track.result is None:
+            return True
+        if track.frames_since_analysis >= self.reanalyze_every:
+            return True
+        return box_iou(track.box, track.analysis_box) < self.drift_iou
+
+    def claim(self, track):
+        """İzi analiz ediliyor olarak işaretler (paralel işçiler aynı izi iki kez analiz etmesin)."""
+        track.pending = True
+
+    def release(self, track):
+        """Sonuç alınamayan izin işaretini kaldırır; iz sonraki karelerde yeniden analiz edilebilir."""
+        track.pending = False
+
+    def store(self, track, result):
+        """Yeni analiz sonucunu izin önbelleğine yazar."""
+        track.pending = False
+        track.result = result
+        track.analysis_box = track.box
+        track.frames_since_analysis = 0
+        self.analyses += 1
+
+    def stats(self):
+        """Kare başına model çağrısı ve takip olmasaydı yapılacak çağrı oranı."""
+        saved = self.detections_seen / self.analyses if self.analyses else 0.0
+        return {
+            "frames": self.frames,
+            "detections": self.detections_seen,
+            "analyses": self.analyses,
+            "reduction": saved,
+        }
+
+    def _associate(self, detections):
+        if not self.tracks or not detections:
+            return [], list(range(len(detections)))
+
+        iou = np.array([[box_iou(t.box, d.box) for d in detections] for t in self.tracks])
+
+        # Açgözlü eşleştirme: en yüksek IoU'dan başlayarak
+        matches = []
+        used_tracks, used_dets = set(), set()
+        for flat in np.argsort(-iou, axis=None):
+            ti, di = np.unravel_index(flat, iou.shape)
+            if iou[ti, di] < self.iou_threshold:
+                break
+            if ti in used_tracks or di in used_dets:
+                continue
+            matches.append((int(ti), int(di)))
+            used_tracks.add(ti)
+            used_dets.add(di)
+
+        # IoU ile eşleşmeyenler için merkez mesafesi (hızlı hareketlerde kutular örtüşmeyebilir)
+        for di, det in enumerate(detections):
+            if di in used_dets:
+                continue
+            dx, dy, dw, dh = det.box
+            best, best_dist = None, None
+            for ti, track in enumerate(self.tracks):
+                if ti in used_tracks:
+                    continue
+                tx, ty, tw, th = track.box
+                dist = np.hypot((dx + dw / 2) - (tx + tw / 2), (dy + dh / 2) - (ty + th / 2))
+                if dist < 0.5 * max(tw, dw) and (best_dist is None or dist < best_dist):
+                    best, best_dist = ti, dist
+            if best is not None:
+                matches.append((best, di))
+                used_tracks.add(best)
+                used_dets.add(di)
+
+        unmatched = [di for di in range(len(detections)) if di not in used_dets]
+        return matches, unmatched
+
+    def _refine_with_flow(self, frame):
+        """Önceki kareden optik akışla izlerin kutularını kaydırır (eşleştirmeyi güçlendirir)."""
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        prev_gray, self._prev_gray = self._prev_gray, gray
+        if prev_gray is None or prev_gray.shape != gray.shape:
+            return
+
+        for track in self.tracks:
+            x, y, w, h = track.box
+            mask = np.zeros_like(prev_gray)
+            mask[max(0, y):y + h, max(0, x):x + w] = 255
+            points = cv2.goodFeaturesToTrack(prev_gray, maxCorners=20, qualityLevel=0.01, minDistance=5, mask=mask)
+            if points is None:
+                continue
+            moved, status, _ = cv2.calcOpticalFlowPyrLK(prev_gray, gray, points, None)
+            ok = status.reshape(-1) == 1
+            if not ok.any():
+                continue
+            shift = np.median((moved - points).reshape(-1, 2)[ok], axis=0)
+            track.box = (int(x + shift[0]), int(y + shift[1]), w, h)
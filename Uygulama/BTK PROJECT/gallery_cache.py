@@ -0,0 +1,183 @@
+import hashlib
+import logging
+import os
+import pickle
+import threading
+
+from batch_inference import deepface
+from embedding_index import EmbeddingIndex
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+
+# find_threshold bulunamazsa kullanılan kosinüs eşikleri
+DEFAULT_THRESHOLDS = {"VGG-Face": 0.68, "Facenet": 0.40, "Facenet512": 0.30, "ArcFace": 0.68}
+
+
+def cosine_threshold(model_name):
+    """DeepFace.verify'ın bu model için kullandığı kosinüs eşiği."""
+    try:
+        from deepface.modules.verification import find_threshold
+        return find_threshold(model_name, "cosine")
+    except Exception:
+        return DEFAULT_THRESHOLDS.get(model_name, 0.40)
+
+
+def file_digest(path, chunk_size=1 << 20):
+    sha1 = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            sha1.update(chunk)
+    return sha1.hexdigest()
+
+
+class GalleryEmbeddingCache:
+    """Galeri klasöründeki resimlerin embedding'lerini diskte saklayan önbellek.
+
+    Kayıtlar yol + mtime + boyut + içerik özeti (SHA-1) ile anahtarlanır. Yenileme
+    yalnızca değişen dosyaları yeniden embed eder; içeriği aynı kalan (dokunulmuş,
+    kopyalanmış veya yeniden adlandırılmış) dosyalar için eski embedding kullanılır.
+    Böylece bir arama, sorgu resmini bir kez embed edip hazır vektörlerle karşılaştırır.
+    """
+
+    def __init__(self, folder, model_name="VGG-Face", cache_path=None, backend=None):
+        self.folder = folder
+        self.model_name = model_name
+        # Verilirse embedding'ler bu katmanla (ör. çıkarım sunucusu istemcisi) hesaplanır
+        self.backend = backend
+        self.cache_path = cache_path or os.path.join(folder, f".gallery_cache_{model_name}.pkl")
+        self._threshold = None
+        self.entries = {}
+        self.index = EmbeddingIndex(metric="cosine")
+        self.ready = threading.Event()
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._load()
+
+    @property
+    def threshold(self):
+        # DeepFace'i içe aktardığı için ilk eşleştirmede çözülür
+        if self._threshold is None:
+            self._threshold = cosine_threshold(self.model_name)
+        return self._threshold
+
+    def _load(self):
+        if not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, "rb") as f:
+                entries = pickle.load(f)
+            # Embedding'i olmayan kayıtlar (eski sürümlerdeki başarısız denemeler) yeniden denenir
+            self.entries = {p: e for p, e in entries.items() if e["embedding"] is not None}
+            self._rebuild_index()
+            # Diskteki önbellek hemen kullanılabilir; değişiklikler arka planda taranır
+            self.ready.set()
+        except Exception as e:
+            logging.error(f"Galeri önbelleği okunamadı: {e}")
+            self.entries = {}
+
+    def _save(self):
+        tmp_path = self.cache_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(self.entries, f)
+        os.replace(tmp_path, self.cache_path)
+
+    def _rebuild_index(self):
+        index = EmbeddingIndex(metric="cosine")
+        paths = [p for p, e in self.entries.items() if e["embedding"] is not None]
+        if paths:
+            index.add_many(paths, [self.entries[p]["embedding"] for p in paths])
+        with self._lock:
+            self.index = index
+
+    def embed(self, img_path):
+        if self.backend is not None:
+            return self.backend.represent_images([img_path], model_name=self.model_name)[0]
+        result = deepface().represent(img_path=img_path, model_name=self.model_name, enforce_detection=False)
+        return result[0]["embedding"]
+
+    def refresh(self):
+        """Klasörü tarar ve yalnızca yeni/değişmiş dosyaları embed eder. Değişiklik sayısını döndürür."""
+        with self._refresh_lock:
+            changed = 0
+            seen = set()
+            by_digest = {e["sha1"]: e for e in self.entries.values() if e["embedding"] is not None}
+
+            for filename in sorted(os.listdir(self.folder)):
+                if not filename.lower().endswith(IMAGE_EXTENSIONS):
+                    continue
+                path = os.path.abspath(os.path.join(self.folder, filename))
+                seen.add(path)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+
+                entry = self.entries.get(path)
+                if entry and entry["mtime"] == stat.st_mtime and entry["size"] == stat.st_size:
+                    continue
+
+                digest = file_digest(path)
+                known = entry if entry and entry["sha1"] == digest else by_digest.get(digest)
+                if known is not None:
+                    embedding = known["embedding"]
+                else:
+                    try:
+                        embedding = self.embed(path)
+                    except Exception as e:
+                        # Kayıt tutulmaz: geçici hatalarda (sunucu açılmamış vb.) sonraki taramada yeniden denenir
+                        logging.error(f"Galeri resmi embed edilemedi ({filename}): {e}")
+                        if self.entries.pop(path, None) is not None:
+                            changed += 1
+                        continue
+
+                self.entries[path] = {
+                    "mtime": stat.st_mtime, "size": stat.st_size, "sha1": digest, "embedding": embedding
+                }
+                if embedding is not None:
+                    by_digest[digest] = self.entries[path]
+                changed += 1
+
+            for path in [p for p in self.entries if p not in seen]:
+                del self.entries[path]
+                changed += 1
+
+            if changed:
+                self._rebuild_index()
+                self._save()
+            self.ready.set()
+            return changed
+
+    def start(self, poll_interval=30.0):
+        """Önbelleği arka planda oluşturur ve belirli aralıklarla değişiklikleri tarar."""
+        if self._thread and self._thread.is_alive():
+            return
+
+        def loop():
+            while not self._stop.is_set():
+                try:
+                    self.refresh()
+                except Exception as e:
+                    logging.error(f"Galeri önbelleği yenilenemedi: {e}")
+                    self.ready.set()
+                if not poll_interval or self._stop.wait(poll_interval):
+                    break
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=loop, daemon=True)
+        self._thread.start()
+
+    def refresh_async(self):
+        threading.Thread(target=self.refresh, daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+
+    def match(self, query_embedding, exclude_path=None):
+        """Sorguya en yakın galeri resmini (yol, mesafe, doğrulandı_mı) olarak döndürür."""
+        with self._lock:
+            index = self.index
+        exclude = [os.path.abspath(exclude_path)] if exclude_path else None
+        path, distance = index.search_batch([query_embedding], exclude=exclude)[0]
+        return path, distance, path is not None and distance <= self.threshold
@@ -0,0 +1,119 @@
+import collections
+import threading
+
+from face_tracker import box_iou
+
+
+class IdentityEntry:
+    __slots__ = ("name", "embedding", "distance", "box", "verified_at", "last_seen", "misses")
+
+    def __init__(self, name, embedding, distance, box, now, misses=0):
+        self.name = name
+        self.embedding = embedding
+        self.distance = distance
+        self.box = box
+        self.verified_at = now
+        self.last_seen = now
+        # Art arda tanınamayan doğrulama sayısı (geri çekilme aralığını belirler)
+        self.misses = misses
+
+
+class IdentityCache:
+    """İz kimliğine göre son embedding ve tanınan ismi tutan önbellek.
+
+    Yüz aynı izde kaldıkça isim yeniden kullanılır; embedding yalnızca iz yeniyse,
+    `verify_every` saniye dolduysa (eşleşme toleransa yakınsa `verify_uncertain`
+    saniye), veya yüz son doğrulamadan beri belirgin şekilde kaydıysa yeniden
+    hesaplanır. Tanınamayan yüzlerin aralığı her başarısız doğrulamada iki katına
+    çıkar (1 s, 2 s, 4 s ... en fazla `ttl`). `ttl` saniyedir görülmeyen izler silinir;
+    en fazla `max_entries` kayıt tutulur (en uzun süredir kullanılmayan atılır).
+    """
+
+    def __init__(self, tolerance, verify_every=5.0, verify_uncertain=1.0, margin=0.1, drift_iou=0.3,
+                 ttl=5.0, max_entries=64):
+        self.tolerance = tolerance
+        self.verify_every = verify_every
+        self.verify_uncertain = verify_uncertain
+        self.margin = margin
+        self.drift_iou = drift_iou
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.verifications = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, track):
+        with self._lock:
+            return self._entries.get(track.track_id)
+
+    def uncertain(self, entry):
+        """Eşleşme mesafesi toleransa `margin` kadar yakınsa (veya tanınmadıysa) güven düşüktür."""
+        return entry.distance is None or entry.distance > self.tolerance - self.margin
+
+    def unknown(self, entry):
+        """Galeri boşsa veya en yakın kayıt toleransın dışındaysa yüz tanınmamıştır."""
+        return entry.distance is None or entry.distance > self.tolerance
+
+    def interval(self, entry):
+        if entry.misses:
+            return min(self.verify_uncertain * 2 ** (entry.misses - 1), self.ttl)
+        return self.verify_uncertain if self.uncertain(entry) else self.verify_every
+
+    def needs_verification(self, track, now):
+        with self._lock:
+            entry = self._entries.get(track.track_id)
+            if entry is None:
+                return True
+            entry.last_seen = now
+            self._entries.move_to_end(track.track_id)
+            if now - entry.verified_at >= self.interval(entry) or box_iou(track.box, entry.box) < self.drift_iou:
+                return True
+            self.hits += 1
+            return False
+
+    def store(self, track, name, embedding, distance, now):
+        with self._lock:
+            entry = IdentityEntry(name, embedding, distance, track.box, now)
+            if self.unknown(entry):
+                previous = self._entries.get(track.track_id)
+                entry.misses = previous.misses + 1 if previous is not None else 1
+            self._entries[track.track_id] = entry
+            self._entries.move_to_end(track.track_id)
+            self.verifications += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def expire(self, now):
+        """`ttl` saniyedir görülmeyen izlerin kayıtlarını siler."""
+        with self._lock:
+            while self._entries:
+                track_id, entry = next(iter(self._entries.items()))
+                if now - entry.last_seen < self.ttl:
+                    break
+                del self._entries[track_id]
+
+    def invalidate(self, name=None):
+        """Kayıtları (veya yalnızca verilen isimdekileri) sonraki karede yeniden doğrulatır."""
+        with self._lock:
+            for entry in self._entries.values():
+                if name is None or entry.name == name:
+                    entry.verified_at = float("-inf")
+                    entry.misses = 0
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        total = self.hits + self.verifications
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "verifications": self.verifications,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
@@ -0,0 +1,144 @@
+import base64
+import http.client
+import json
+import os
+import threading
+import time
+import urllib.parse
+
+import numpy as np
+
+from batch_inference import MODEL_LABELS
+
+# Ayarlanırsa üç arayüz de modelleri kendisi yüklemek yerine bu adresteki sunucuyu kullanır
+SERVER_ENV = "FACE_INFERENCE_SERVER"
+DEFAULT_URL = "http://127.0.0.1:8765"
+
+
+def encode_image(image):
+    """BGR diziyi (ham bayt) veya resim dosyası yolunu (dosya baytları) JSON'a uygun sözlüğe çevirir."""
+    if isinstance(image, str):
+        with open(image, "rb") as f:
+            return {"file": base64.b64encode(f.read()).decode("ascii")}
+    if image is None or image.size == 0:
+        return None
+    image = np.ascontiguousarray(image, dtype=np.uint8)
+    return {"shape": list(image.shape), "data": base64.b64encode(image.tobytes()).decode("ascii")}
+
+
+def decode_image(item):
+    if item is None:
+        return None
+    if "file" in item:
+        import cv2
+        buffer = np.frombuffer(base64.b64decode(item["file"]), dtype=np.uint8)
+        return cv2.imdecode(buffer, cv2.IMREAD_COLOR)
+    return np.frombuffer(base64.b64decode(item["data"]), dtype=np.uint8).reshape(item["shape"])
+
+
+class InferenceClient:
+    """Yerel çıkarım sunucusunu DeepFaceBatchBackend arayüzüyle kullanan istemci.
+
+    analyze/represent/warmup_steps ve tam resim sürümleri yerel katmanla aynı
+    sonuçları döndürür; bu yüzden FaceAnalyzer, toplu.py ve app.py değişmeden
+    sunucuya bağlanabilir. Her iş parçacığı kendi kalıcı HTTP bağlantısını kullanır.
+    """
+
+    def __init__(self, url=DEFAULT_URL, timeout=60.0):
+        parsed = urllib.parse.urlparse(url)
+        self.url = url
+        self.host = parsed.hostname or "127.0.0.1"
+        self.port = parsed.port or 8765
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            self._local.connection = connection
+        return connection
+
+    def _request(self, method, path, payload=None):
+        body = json.dumps(payload).encode("utf-8") if payload is not None else None
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        # Sunucu bağlantıyı kapattıysa bir kez yeniden bağlanılır
+        for attempt in range(2):
+            connection = self._connection()
+            try:
+                connection.request(method, path, body=body, headers=headers)
+                response = connection.getresponse()
+                data = json.loads(response.read().decode("utf-8"))
+                break
+            except (ConnectionError, http.client.HTTPException):
+                connection.close()
+                self._local.connection = None
+                if attempt:
+                    raise
+        if response.status != 200:
+            raise RuntimeError(f"Çıkarım sunucusu hatası ({response.status}): {data.get('error')}")
+        return data
+
+    def health(self):
+        return self._request("GET", "/health")
+
+    def wait_ready(self, timeout=120.0, interval=0.5):
+        """Sunucu yanıt verene kadar bekler."""
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                return self.health()
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(interval)
+
+    def warmup(self, actions=("emotion", "gender", "age"), embedding_model=None):
+        for _, step in self.warmup_steps(actions, embedding_model):
+            step()
+
+    def warmup_steps(self, actions=("emotion", "gender", "age"), embedding_model=None):
+        """Sunucudaki modellerin yüklenmesini adım adım ister (modeller sunucuda bir kez yüklenir)."""
+        names = [action.capitalize() for action in actions]
+        if embedding_model:
+            names.append(embedding_model)
+        steps = [("Sunucu", self.wait_ready)]
+        steps += [
+            (MODEL_LABELS.get(name, name), lambda name=name: self._request("POST", "/warmup", {"model": name}))
+            for name in names
+        ]
+        return steps
+
+    def analyze(self, crops, actions=("emotion", "gender", "age")):
+        payload = {"crops": [encode_image(crop) for crop in crops], "actions": list(actions)}
+        return self._request("POST", "/analyze", payload)["results"]
+
+    def represent(self, crops, model_name="Facenet"):
+        payload = {"crops": [encode_image(crop) for crop in crops], "model_name": model_name}
+        return self._request("POST", "/embed", payload)["embeddings"]
+
+    def analyze_images(self, images, actions=("emotion", "gender", "age")):
+        payload = {"images": [encode_image(image) for image in images], "actions": list(actions)}
+        return self._request("POST", "/analyze", payload)["results"]
+
+    def represent_images(self, images, model_name="Facenet"):
+        payload = {"images": [encode_image(image) for image in images], "model_name": model_name}
+        return self._request("POST", "/embed", payload)["embeddings"]
+
+    def verify(self, first, second, model_name="Facenet", detect=False):
+        """İki yüzün aynı kişi olup olmadığını sunucuda karşılaştırır: {verified, distance, threshold}.
+
+        `detect` True ise girişler tam resimdir ve yüz DeepFace içinde bulunur.
+        """
+        key = "images" if detect else "crops"
+        payload = {key: [encode_image(first), encode_image(second)], "model_name": model_name}
+        return self._request("POST", "/verify", payload)
+
+
+def default_backend():
+    """FACE_INFERENCE_SERVER ayarlıysa sunucu istemcisini, değilse süreç içi DeepFace katmanını döndürür."""
+    url = os.environ.get(SERVER_ENV)
+    if url:
+        return InferenceClient(url)
+    from batch_inference import DeepFaceBatchBackend
+    return DeepFaceBatchBackend()
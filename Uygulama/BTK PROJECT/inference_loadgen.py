@@ -0,0 +1,133 @@
+"""Çıkarım sunucusu için yük üreteci: eşzamanlılığa göre verim-gecikme eğrisini ölçer.
+
+Her eşzamanlılık seviyesinde o kadar iş parçacığı, belirtilen süre boyunca ardışık
+/analyze (veya /embed) istekleri gönderir. Seviye başına verim (istek/s, yüz/s),
+gecikme yüzdelikleri ve sunucudaki ortalama mikro parti boyutu raporlanır.
+
+Örnek:
+    python inference_server.py --stub &
+    python inference_loadgen.py --levels 1,2,4,8,16,32 --duration 10 --json egri.json
+"""
+import argparse
+import json
+import threading
+import time
+
+import numpy as np
+
+from inference_client import DEFAULT_URL, InferenceClient
+
+
+def synthetic_crops(count, size=(160, 160), seed=0):
+    rng = np.random.default_rng(seed)
+    return [rng.integers(0, 256, size=(size[1], size[0], 3), dtype=np.uint8) for _ in range(count)]
+
+
+def run_level(client, concurrency, duration, crops, faces_per_request, operation):
+    """Bir eşzamanlılık seviyesini çalıştırır; gecikmeleri (saniye) ve hata sayısını döndürür."""
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+
+    def worker(index):
+        # Her iş parçacığı kendi bağlantısını kullanır (InferenceClient iş parçacığı başına bağlantı tutar)
+        offset = index * faces_per_request
+        own = []
+        while time.perf_counter() < stop_at:
+            batch = [crops[(offset + i) % len(crops)] for i in range(faces_per_request)]
+            offset += faces_per_request
+            started = time.perf_counter()
+            try:
+                if operation == "embed":
+                    client.represent(batch)
+                else:
+                    client.analyze(batch)
+            except Exception:
+                with lock:
+                    errors[0] += 1
+                continue
+            own.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(own)
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors[0]
+
+
+def measure_curve(client, levels, duration=10.0, faces_per_request=1, operation="analyze", crop_count=64):
+    crops = synthetic_crops(crop_count)
+    # Sunucu ilk isteklerde modelleri kurmasın diye bir ısınma isteği
+    if operation == "embed":
+        client.represent(crops[:1])
+    else:
+        client.analyze(crops[:1])
+
+    rows = []
+    for concurrency in levels:
+        before = client.health()["batcher"]
+        started = time.perf_counter()
+        latencies, errors = run_level(client, concurrency, duration, crops, faces_per_request, operation)
+        elapsed = time.perf_counter() - started
+        after = client.health()["batcher"]
+
+        batches = after["batches"] - before["batches"]
+        items = after["items"] - before["items"]
+        samples = 1000 * np.asarray(latencies) if latencies else np.zeros(1)
+        p50, p95, p99 = np.percentile(samples, (50, 95, 99))
+        rows.append({
+            "concurrency": concurrency,
+            "requests": len(latencies),
+            "errors": errors,
+            "requests_per_s": len(latencies) / elapsed,
+            "faces_per_s": len(latencies) * faces_per_request / elapsed,
+            "p50_ms": float(p50),
+            "p95_ms": float(p95),
+            "p99_ms": float(p99),
+            "mean_batch": items / batches if batches else 0.0,
+        })
+    return rows
+
+
+def print_curve(rows):
+    print(f"{'eşzam.':>7s} {'istek/s':>9s} {'yüz/s':>9s} {'p50 ms':>8s} {'p95 ms':>8s} {'p99 ms':>8s} "
+          f"{'parti':>6s} {'hata':>5s}")
+    for row in rows:
+        print(f"{row['concurrency']:7d} {row['requests_per_s']:9.1f} {row['faces_per_s']:9.1f} "
+              f"{row['p50_ms']:8.1f} {row['p95_ms']:8.1f} {row['p99_ms']:8.1f} "
+              f"{row['mean_batch']:6.1f} {row['errors']:5d}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Çıkarım sunucusunun verim-gecikme eğrisini ölçer.")
+    parser.add_argument("--url", default=DEFAULT_URL, help="Sunucu adresi")
+    parser.add_argument("--levels", default="1,2,4,8,16,32", help="Denenecek eşzamanlılık seviyeleri")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seviye başına süre (saniye)")
+    parser.add_argument("--faces-per-request", type=int, default=1, help="İstek başına yüz kesiti")
+    parser.add_argument("--operation", choices=("analyze", "embed"), default="analyze", help="Ölçülecek uç nokta")
+    parser.add_argument("--json", dest="json_path", help="Eğrinin yazılacağı JSON dosyası")
+    args = parser.parse_args(argv)
+
+    client = InferenceClient(args.url)
+    client.wait_ready(timeout=30.0)
+    levels = [int(level) for level in args.levels.split(",") if level.strip()]
+    rows = measure_curve(client, levels, args.duration, args.faces_per_request, args.operation)
+    print_curve(rows)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "url": args.url,
+                "operation": args.operation,
+                "faces_per_request": args.faces_per_request,
+                "duration": args.duration,
+                "curve": rows,
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+"""Modelleri tek süreçte yükleyip üç arayüze HTTP üzerinden sunan yerel çıkarım sunucusu.
+
+Eşzamanlı istekler mikro partilerde birleştirilir: ilk istek geldikten sonra en fazla
+`--max-wait-ms` beklenir veya parti `--max-batch` yüze ulaşınca modeller tek seferde çalışır.
+
+Örnek:
+    python inference_server.py --port 8765 --warmup emotion,gender,age --embedding-model Facenet
+    FACE_INFERENCE_SERVER=http://127.0.0.1:8765 python face_app.py
+"""
+import argparse
+import collections
+import json
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from inference_client import decode_image
+
+
+class MicroBatcher:
+    """Aynı anahtarlı işleri son tarihli mikro partilerde birleştiren tek iş parçacıklı yürütücü.
+
+    `submit(key, items)` bir Future döndürür. İşçi sıradaki ilk işi alır ve aynı
+    anahtarlı sonraki işleri, toplam öğe sayısı `max_batch`i aşmadığı sürece ilk işin
+    gelişinden itibaren `max_wait` saniye dolana kadar ekler. `run(key, items)` tüm
+    öğeler için tek çağrıyla sonuç listesi döndürür; sonuçlar işlere geri dağıtılır.
+    Farklı anahtarlı işler sıralarını koruyarak sonraki partilere kalır. Modeller
+    tek iş parçacığından çağrıldığı için TensorFlow oturumu paylaşılmaz. `stop()`
+    sonrasında kuyrukta kalan işler hatayla sonuçlanır.
+    """
+
+    def __init__(self, run, max_batch=32, max_wait=0.005):
+        self.run = run
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._jobs = collections.deque()
+        self._cond = threading.Condition()
+        self._stop = False
+
+        self.batches = 0
+        self.items = 0
+        self.requests = 0
+        self.queue_wait = 0.0
+        self._thread = threading.Thread(target=self._loop, daemon=True, name="micro-batcher")
+        self._thread.start()
+
+    def submit(self, key, items):
+        future = Future()
+        with self._cond:
+            if self._stop:
+                future.set_exception(RuntimeError("sunucu kapanıyor"))
+                return future
+            self._jobs.append((key, list(items), future, time.perf_counter()))
+            self._cond.notify()
+        return future
+
+    def stop(self):
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        self._thread.join()
+
+    def _take(self):
+        with self._cond:
+            while not self._jobs and not self._stop:
+                self._cond.wait()
+            if self._stop:
+                # Bekleyen istekler yanıtsız kalmasın; işleyici iş parçacıkları hata döndürür
+                while self._jobs:
+                    self._jobs.popleft()[2].set_exception(RuntimeError("sunucu kapanıyor"))
+                return None, []
+            key, items, future, arrived = self._jobs.popleft()
+            batch = [(items, future, arrived)]
+            count = len(items)
+            deadline = arrived + self.max_wait
+            while count < self.max_batch:
+                match = next((job for job in self._jobs if job[0] == key), None)
+                if match is not None:
+                    # Parti sınırını aşacak iş bölünmez, sonraki partiye kalır
+                    if count + len(match[1]) > self.max_batch:
+                        break
+                    self._jobs.remove(match)
+                    batch.append(match[1:])
+                    count += len(match[1])
+                    continue
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0 or self._stop:
+                    break
+                self._cond.wait(remaining)
+            return key, batch
+
+    def _loop(self):
+        while True:
+            key, batch = self._take()
+            if key is None:
+                return
+            started = time.perf_counter()
+            items = [item for job_items, _, _ in batch for item in job_items]
+            try:
+                results = self.run(key, items)
+            except Exception as e:
+                logging.error(f"Mikro parti başarısız ({key[0]}): {str(e)}")
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.items += len(items)
+            self.requests += len(batch)
+            position = 0
+            for job_items, future, arrived in batch:
+                self.queue_wait += started - arrived
+                future.set_result(results[position:position + len(job_items)])
+                position += len(job_items)
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "items": self.items,
+            "mean_batch": self.items / self.batches if self.batches else 0.0,
+            "mean_queue_ms": 1000 * self.queue_wait / self.requests if self.requests else 0.0,
+            "pending": len(self._jobs),
+        }
+
+
+def to_json(value):
+    """numpy sayılarını ve dizilerini JSON'a yazılabilir Python türlerine çevirir."""
+    if isinstance(value, dict):
+        return {k: to_json(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json(v) for v in value]
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def cosine_distance(a, b):
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    return float(1.0 - a @ b / max(np.linalg.norm(a) * np.linalg.norm(b), 1e-12))
+
+
+class InferenceService:
+    """HTTP katmanından bağımsız servis: istekleri mikro partilere ve çıkarım katmanına yönlendirir."""
+
+    def __init__(self, backend, max_batch=32, max_wait=0.005):
+        self.backend = backend
+        self.batcher = MicroBatcher(self._run, max_batch=max_batch, max_wait=max_wait)
+        self.loaded = set()
+        self.started = time.time()
+
+    def _run(self, key, items):
+        method, argument = key
+        if method == "load":
+            for name in items:
+                if name not in self.loaded:
+                    if hasattr(self.backend, "load"):
+                        self.backend.load(name)
+                    self.loaded.add(name)
+            return [None] * len(items)
+        if method in ("analyze", "analyze_images"):
+            return getattr(self.backend, method)(items, actions=argument)
+        return getattr(self.backend, method)(items, model_name=argument)
+
+    def call(self, method, argument, items):
+        return self.batcher.submit((method, argument), items).result()
+
+    def warmup(self, names):
+        """Modelleri istekler gelmeden önce yükler (istekler sırayla bekler)."""
+        for name in names:
+            self.batcher.submit(("load", None), [name])
+
+    def handle(self, path, request):
+        if path == "/analyze":
+            actions = tuple(request.get("actions", ("emotion", "gender", "age")))
+            if "images" in request:
+                images = [decode_image(item) for item in request["images"]]
+                return {"results": to_json(self.call("analyze_images", actions, images))}
+            crops = [decode_image(item) for item in request["crops"]]
+            return {"results": to_json(self.call("analyze", actions, crops))}
+
+        if path == "/embed":
+            model_name = request.get("model_name", "Facenet")
+            if "images" in request:
+                images = [decode_image(item) for item in request["images"]]
+                return {"embeddings": to_json(self.call("represent_images", model_name, images))}
+            crops = [decode_image(item) for item in request["crops"]]
+            return {"embeddings": to_json(self.call("represent", model_name, crops))}
+
+        if path == "/verify":
+            from gallery_cache import cosine_threshold
+
+            model_name = request.get("model_name", "Facenet")
+            if "images" in request:
+                method, items = "represent_images", request["images"]
+            else:
+                method, items = "represent", request["crops"]
+            if len(items) != 2:
+                raise ValueError(f"/verify tam olarak iki yüz bekler, {len(items)} verildi")
+            first, second = self.call(method, model_name, [decode_image(item) for item in items])
+            if first is None or second is None:
+                return {"verified": False, "distance": None, "threshold": cosine_threshold(model_name)}
+            distance = cosine_distance(first, second)
+            threshold = cosine_threshold(model_name)
+            return {"verified": distance <= threshold, "distance": distance, "threshold": threshold}
+
+        if path == "/warmup":
+            self.call("load", None, [request["model"]])
+            return {"loaded": sorted(self.loaded)}
+
+        raise KeyError(path)
+
+    def health(self):
+        return {
+            "status": "ok",
+            "uptime": time.time() - self.started,
+            "models": sorted(self.loaded),
+            "batcher": self.batcher.stats(),
+        }
+
+
+class InferenceRequestHandler(BaseHTTPRequestHandler):
+    # Kalıcı bağlantı: istemci her istekte yeniden bağlanmaz
+    protocol_version = "HTTP/1.1"
+    # Başlık ve gövde ayrı yazıldığında Nagle + gecikmeli ACK her yanıta ~40 ms ekler
+    disable_nagle_algorithm = True
+    service = None
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send(200, self.service.health())
+        else:
+            self._send(404, {"error": "Bilinmeyen adres"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            request = json.loads(self.rfile.read(length).decode("utf-8"))
+            self._send(200, self.service.handle(self.path, request))
+        except KeyError as e:
+            self._send(404 if str(e).strip("'") == self.path else 400, {"error": f"Eksik veya bilinmeyen alan: {e}"})
+        except ValueError as e:
+            self._send(400, {"error": str(e)})
+        except Exception as e:
+            logging.error(f"İstek işlenemedi ({self.path}): {str(e)}")
+            self._send(500, {"error": str(e)})
+
+    def log_message(self, format, *args):
+        # Her isteği stderr'e yazmak yük altında belirgin maliyet getirir
+        pass
+
+
+def make_server(service, host="127.0.0.1", port=8765):
+    handler = type("BoundInferenceRequestHandler", (InferenceRequestHandler,), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Yerel yüz analizi çıkarım sunucusu (mikro partili).")
+    parser.add_argument("--host", default="127.0.0.1", help="Dinlenecek adres (varsayılan yalnızca yerel)")
+    parser.add_argument("--port", type=int, default=8765, help="Dinlenecek port")
+    parser.add_argument("--max-batch", type=int, default=32, help="Bir mikro partideki en fazla yüz")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0, help="Parti dolması için en fazla bekleme (ms)")
+    parser.add_argument("--warmup", default="emotion,gender,age", help="Açılışta yüklenecek özellik modelleri")
+    parser.add_argument("--embedding-model", default="Facenet", help="Açılışta yüklenecek embedding modeli")
+    parser.add_argument("--stub", action="store_true",
+                        help="Model yerine sahte katman kullan (yük testi ve deneme için)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if args.stub:
+        from batch_inference import StubBatchBackend
+        backend = StubBatchBackend(batch_ms=5.0, item_ms=1.0)
+    else:
+        from batch_inference import DeepFaceBatchBackend
+        backend = DeepFaceBatchBackend(max_batch=args.max_batch)
+
+    service = InferenceService(backend, max_batch=args.max_batch, max_wait=args.max_wait_ms / 1000.0)
+    names = [action.strip().capitalize() for action in args.warmup.split(",") if action.strip()]
+    if args.embedding_model:
+        names.append(args.embedding_model)
+    service.warmup(names)
+
+    server = make_server(service, args.host, args.port)
+    logging.info(f"Çıkarım sunucusu dinliyor: http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.batcher.stop()
+
+
+if __name__ == "__main__":
+    main()
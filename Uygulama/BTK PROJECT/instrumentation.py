@@ -0,0 +1,180 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import threading
+import time
+
+import cv2
+import numpy as np
+
+
+class _NullSpan:
+    """Ölçüm kapalıyken kullanılan paylaşılan, hiçbir şey yapmayan bağlam."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("_timer", "_name", "_start")
+
+    def __init__(self, timer, name):
+        self._timer = timer
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._timer.record(self._name, time.perf_counter() - self._start)
+        return False
+
+
+class StageTimer:
+    """Sıcak yol aşamaları için adlandırılmış zaman aralıkları.
+
+    `with timer.span("detect"): ...` aşamanın süresini aşama başına sabit boyutlu
+    bir halka tampona yazar; `snapshot()` son `window` ölçümün p50/p95/p99 değerlerini
+    verir. `enabled` False iken `span()` paylaşılan boş bir bağlam döndürür; maliyet
+    tek bir öznitelik okumasıdır. Birden fazla iş parçacığından kullanılabilir.
+    """
+
+    def __init__(self, enabled=False, window=512):
+        self.enabled = enabled
+        self.window = window
+        self._buffers = {}
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def span(self, name):
+        if not self.enabled:
+            return NULL_SPAN
+        return _Span(self, name)
+
+    def record(self, name, seconds):
+        with self._lock:
+            buffer = self._buffers.get(name)
+            if buffer is None:
+                buffer = self._buffers[name] = np.zeros(self.window, dtype=np.float64)
+                self._counts[name] = 0
+            count = self._counts[name]
+            buffer[count % self.window] = seconds
+            self._counts[name] = count + 1
+
+    def reset(self):
+        with self._lock:
+            self._buffers.clear()
+            self._counts.clear()
+
+    def snapshot(self):
+        """Aşama adı -> {count, last_ms, mean_ms, p50_ms, p95_ms, p99_ms} (ölçüm sırasıyla)."""
+        with self._lock:
+            items = [(name, buffer.copy(), self._counts[name]) for name, buffer in self._buffers.items()]
+        stages = {}
+        for name, buffer, count in items:
+            samples = 1000 * buffer[:min(count, self.window)]
+            p50, p95, p99 = np.percentile(samples, (50, 95, 99))
+            stages[name] = {
+                "count": count,
+                "last_ms": float(1000 * buffer[(count - 1) % self.window]),
+                "mean_ms": float(samples.mean()),
+                "p50_ms": float(p50),
+                "p95_ms": float(p95),
+                "p99_ms": float(p99),
+            }
+        return stages
+
+
+# Ölçüm verilmeyen bileşenler için kapalı, ortak zamanlayıcı
+DISABLED_TIMER = StageTimer(enabled=False)
+
+
+def draw_hud(frame, stages, lines=(), origin=(10, 10), scale=0.45):
+    """Aşama sürelerini ve ek satırları karenin köşesine yarı saydam bir panelle çizer."""
+    rows = list(lines) + [
+        f"{name:<10s} p50 {s['p50_ms']:6.1f}  p95 {s['p95_ms']:6.1f}  p99 {s['p99_ms']:6.1f} ms"
+        for name, s in stages.items()
+    ]
+    if not rows:
+        return frame
+    line_height = int(22 * scale / 0.45)
+    width = int(430 * scale / 0.45)
+    x, y = origin
+    height = line_height * len(rows) + 8
+    x2, y2 = min(frame.shape[1], x + width), min(frame.shape[0], y + height)
+    if x2 > x and y2 > y:
+        panel = frame[y:y2, x:x2]
+        # Arka planı karartarak (kopya olmadan) okunabilirlik sağlanır
+        np.right_shift(panel, 2, out=panel)
+    for i, text in enumerate(rows):
+        cv2.putText(frame, text, (x + 6, y + (i + 1) * line_height), cv2.FONT_HERSHEY_SIMPLEX, scale,
+                    (255, 255, 255), 1, cv2.LINE_AA)
+    return frame
+
+
+class MetricsFileSink:
+    """Aşama sürelerini belirli aralıklarla bir metrik dosyasına JSON satırı olarak ekler.
+
+    `extra` verilirse dönen sözlük (ör. CameraPipeline.stats()) satıra eklenir.
+    """
+
+    def __init__(self, timer, path, interval=5.0, extra=None):
+        self.timer = timer
+        self.path = path
+        self.interval = interval
+        self.extra = extra
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="metrics-sink")
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.write()
+
+    def write(self):
+        record = {"time": time.time(), "stages": self.timer.snapshot()}
+        if self.extra is not None:
+            try:
+                record.update(self.extra())
+            except Exception as e:
+                logging.error(f"Metrik bilgisi alınamadı: {e}")
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+        except OSError as e:
+            logging.error(f"Metrik dosyası yazılamadı: {e}")
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.write()
+
+
+def setup_queue_logging(filename, level=logging.INFO, fmt='%(asctime)s - %(levelname)s - %(message)s'):
+    """Kök logger'ı engellemeyen bir kuyruğa bağlar; dosyaya yazma ayrı iş parçacığında yapılır.
+
+    logging.basicConfig(filename=...) yerine kullanılır. Dinleyici program sonunda
+    durdurulur ve kuyruktaki kayıtlar dosyaya boşaltılır.
+    """
+    log_queue = queue.SimpleQueue()
+    file_handler = logging.FileHandler(filename, encoding="utf-8")
+    file_handler.setFormatter(logging.Formatter(fmt))
+    listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
@@ -0,0 +1,213 @@
+import json
+import logging
+import os
+import pickle
+import zlib
+
+import numpy as np
+
+from embedding_index import EmbeddingIndex
+
+
+class KnownFacesStore:
+    """Bilinen yüzler için yalnızca eklenen (append-only) kalıcı depo.
+
+    Dosyalar (`base` = ör. "known_faces"):
+      - base.meta.json       : geçerli anlık görüntünün nesli ve embedding boyutu
+      - base.snap-N.npy      : sıkıştırılmış anlık görüntü (EmbeddingIndex.save biçimi, mmap ile açılır)
+      - base.vec             : son sıkıştırmadan beri eklenen float32 embedding'ler (satır satır)
+      - base.log             : her kayıt için bir JSON satırı (isim, satır no, CRC32)
+
+    Kayıt O(1)'dir: embedding .vec dosyasındaki yerine, ardından günlük satırı yazılır
+    ve ikisi de fsync edilir. Yarım kalan satırlar (çökme) CRC/JSON denetimiyle açılışta
+    atlanır. Günlük `compact_every` kayda ulaşınca yeni bir anlık görüntüye katlanır;
+    meta dosyası atomik olarak değiştirildiği için sıkıştırma da çökmeye dayanıklıdır.
+    """
+
+    def __init__(self, base_path, compact_every=1000):
+        self.base_path = base_path
+        self.compact_every = compact_every
+        self.meta_path = base_path + ".meta.json"
+        self.log_path = base_path + ".log"
+        self.vec_path = base_path + ".vec"
+        self.generation = 0
+        self.dim = None
+        self.index = EmbeddingIndex(metric="cosine")
+        self._log_rows = 0
+        self._log = None
+        self._vec = None
+
+    def __len__(self):
+        return len(self.index)
+
+    @property
+    def identities(self):
+        return self.index.names
+
+    def _snapshot_path(self, generation):
+        return f"{self.base_path}.snap-{generation}"
+
+    # --- Açılış ---
+
+    def open(self, legacy_pickle=None):
+        """Anlık görüntüyü bellek eşlemeli açar ve günlüğü yeniden oynatır.
+
+        Depo henüz yoksa ve `legacy_pickle` (eski known_faces.pkl) varsa bir kez taşınır.
+        """
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            self.generation = meta["generation"]
+            self.dim = meta.get("dim")
+            if self.generation > 0:
+                self.index = EmbeddingIndex.load(self._snapshot_path(self.generation), metric="cosine", mmap=True)
+            self._replay()
+        elif legacy_pickle and os.path.exists(legacy_pickle):
+            self._migrate(legacy_pickle)
+        else:
+            self._write_meta()
+            self._reset_log()
+        if self._log is None:
+            self._open_files()
+        return self.index
+
+    def _read_log(self):
+        """Geçerli nesle ait (kayıtlar, temiz_mi) döndürür; günlük yoksa/eskiyse None.
+
+        Yeni satırın sonuna eklenmemesi için yarım kalmış son satır "temiz değil" sayılır.
+        """
+        if not os.path.exists(self.log_path):
+            return None
+        with open(self.log_path, encoding="utf-8") as f:
+            header = _parse(f.readline())
+            if header is None or header.get("generation") != self.generation:
+                return None
+            lines = f.readlines()
+        entries = [entry for entry in map(_parse, lines) if entry is not None]
+        clean = len(entries) == len(lines) and (not lines or lines[-1].endswith("\n"))
+        return entries, clean
+
+    def _replay(self):
+        log = self._read_log()
+        if log is None:
+            # Sıkıştırma günlük sıfırlanmadan kesilmiş olabilir; eski günlük zaten anlık görüntüde
+            self._reset_log()
+            return
+        entries, clean = log
+
+        valid = []
+        if entries and self.dim and os.path.exists(self.vec_path):
+            row_bytes = 4 * self.dim
+            with open(self.vec_path, "rb") as vec:
+                for entry in entries:
+                    if entry.get("row") != len(valid):
+                        break
+                    vec.seek(entry["row"] * row_bytes)
+                    data = vec.read(row_bytes)
+                    if len(data) != row_bytes or zlib.crc32(data) != entry.get("crc"):
+                        break
+                    valid.append((entry["name"], np.frombuffer(data, dtype=np.float32)))
+
+        if valid:
+            self.index.add_many([name for name, _ in valid], [vector for _, vector in valid])
+        self._log_rows = len(valid)
+        if not clean or len(valid) != len(entries):
+            # Yarım kalan kayıtlar (çökme) atılır ve günlük geçerli kayıtlarla yeniden yazılır
+            logging.warning("Bilinen yüz günlüğündeki yarım kalmış kayıtlar atlandı")
+            self._rewrite_log(valid)
+
+    def _migrate(self, legacy_pickle):
+        with open(legacy_pickle, "rb") as f:
+            known_faces = pickle.load(f)
+        self.index = EmbeddingIndex.from_dict(known_faces, metric="cosine")
+        self.dim = self.index.dim
+        self.compact()
+        logging.info(f"'{legacy_pickle}' yeni yüz deposuna taşındı ({len(self.index)} embedding)")
+
+    def _open_files(self):
+        self._log = open(self.log_path, "a", encoding="utf-8")
+        self._vec = open(self.vec_path, "r+b" if os.path.exists(self.vec_path) else "w+b")
+
+    # --- Yazma ---
+
+    def add(self, name, embedding):
+        """Tek bir kaydı kalıcı hale getirir ve dizine ekler (O(1))."""
+        vector = np.asarray(embedding, dtype=np.float32).reshape(-1)
+        if self.dim is None:
+            self.dim = len(vector)
+            self._write_meta()
+        elif len(vector) != self.dim:
+            raise ValueError(f"Embedding boyutu uyuşmuyor: {len(vector)} != {self.dim}")
+
+        data = vector.tobytes()
+        row = self._log_rows
+        # Önce veri, sonra günlük: günlükte görünen her satırın verisi diskte olur
+        self._vec.seek(row * len(data))
+        self._vec.write(data)
+        self._vec.truncate()
+        _sync(self._vec)
+        self._log.write(json.dumps({"name": name, "row": row, "crc": zlib.crc32(data)}, ensure_ascii=False) + "\n")
+        _sync(self._log)
+        self._log_rows += 1
+
+        self.index.add(name, vector)
+        if self._log_rows >= self.compact_every:
+            self.compact()
+
+    def compact(self):
+        """Dizini yeni bir anlık görüntüye yazar ve günlüğü sıfırlar."""
+        generation = self.generation + 1
+        self.index.save(self._snapshot_path(generation))
+        old_generation, self.generation = self.generation, generation
+        self._write_meta()
+
+        self.close()
+        self._reset_log()
+        self._open_files()
+        for suffix in (".npy", ".labels.npy"):
+            try:
+                os.remove(self._snapshot_path(old_generation) + suffix)
+            except OSError:
+                pass
+
+    def _write_meta(self):
+        tmp_path = self.meta_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"generation": self.generation, "dim": self.dim}, f)
+            _sync(f)
+        os.replace(tmp_path, self.meta_path)
+
+    def _reset_log(self):
+        self._rewrite_log([])
+        with open(self.vec_path, "wb"):
+            pass
+
+    def _rewrite_log(self, entries):
+        tmp_path = self.log_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"generation": self.generation}) + "\n")
+            for row, (name, vector) in enumerate(entries):
+                f.write(json.dumps({"name": name, "row": row, "crc": zlib.crc32(vector.tobytes())},
+                                   ensure_ascii=False) + "\n")
+            _sync(f)
+        os.replace(tmp_path, self.log_path)
+        self._log_rows = len(entries)
+
+    def close(self):
+        for f in (self._log, self._vec):
+            if f is not None:
+                f.close()
+        self._log = self._vec = None
+
+
+def _parse(line):
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None
+
+
+def _sync(f):
+    f.flush()
+    os.fsync(f.fileno())
+
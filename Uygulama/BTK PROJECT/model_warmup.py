@@ -0,0 +1,80 @@
+import logging
+import threading
+import time
+
+
+class ModelWarmup:
+    """Modelleri arka plan iş parçacığında sırayla yükler; arayüz bu sırada kullanılabilir.
+
+    `steps` (etiket, fonksiyon) çiftleridir (ör. DeepFaceBatchBackend.warmup_steps()).
+    Durum iş parçacığı güvenli biçimde `status()` ile okunur; Tk tarafında
+    `attach_status_label()` bunu belirli aralıklarla bir etikete yansıtır.
+    """
+
+    def __init__(self, steps):
+        self.steps = list(steps)
+        self.ready = threading.Event()
+        self.error = None
+        self.elapsed = None
+        self._current = None
+        self._done = 0
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True, name="model-warmup")
+            self._thread.start()
+        return self
+
+    def _run(self):
+        started = time.perf_counter()
+        for label, step in self.steps:
+            with self._lock:
+                self._current = label
+            try:
+                step()
+            except Exception as e:
+                # Isınma başarısız olsa da modeller ilk kullanımda yeniden denenir
+                logging.error(f"Model ısınması başarısız ({label}): {str(e)}")
+                with self._lock:
+                    self.error = f"{label}: {e}"
+            with self._lock:
+                self._done += 1
+        with self._lock:
+            self._current = None
+            self.elapsed = time.perf_counter() - started
+        logging.info(f"Modeller {self.elapsed:.1f} sn'de hazırlandı")
+        self.ready.set()
+
+    def wait(self, timeout=None):
+        return self.ready.wait(timeout)
+
+    def status(self):
+        """(metin, hazır_mı, hata_var_mı) döndürür."""
+        with self._lock:
+            if self.ready.is_set():
+                if self.error:
+                    return f"⚠️ Model yüklenemedi ({self.error})", True, True
+                return f"✅ Modeller hazır ({self.elapsed:.1f} sn)", True, False
+            if self._thread is None:
+                return "Modeller henüz yüklenmedi", False, False
+            current = f": {self._current}" if self._current else ""
+            return f"⏳ Modeller yükleniyor{current} ({self._done}/{len(self.steps)})", False, False
+
+
+def attach_status_label(widget, warmup, poll_ms=250, colors=("orange", "green", "red")):
+    """Isınma durumunu Tk döngüsünde yoklayarak etikete yazar (iş parçacığından Tk çağrısı yapılmaz)."""
+    loading, ready, failed = colors
+
+    def poll():
+        try:
+            text, done, error = warmup.status()
+            widget.config(text=text, foreground=failed if error else ready if done else loading)
+        except Exception:
+            # Pencere kapanmışsa yoklama sessizce biter
+            return
+        if not done:
+            widget.after(poll_ms, poll)
+
+    poll()
@@ -0,0 +1,390 @@
+"""Birden fazla kamerayı (USB, RTSP veya video dosyası) tek süreçte analiz eden çoklu kaynak modu.
+
+Örnek (arayüzsüz, akış istatistiklerini yazdırır):
+    python multi_camera.py 0 1 rtsp://10.0.0.5/stream kayit.mp4 --workers 4 --duration 60
+"""
+import argparse
+import collections
+import logging
+import os
+import queue
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from camera_pipeline import LatestQueue, RateCounter
+from face_tracker import FaceTracker
+from instrumentation import DISABLED_TIMER
+
+
+def parse_source(text):
+    """'0' gibi sayısal kaynakları cihaz numarasına çevirir; diğerleri adres/dosya olarak kalır."""
+    text = str(text).strip()
+    return int(text) if text.isdigit() else text
+
+
+class StreamSource:
+    """Tek bir kaynağın yakalama iş parçacığı, kare kuyruğu, takipçisi ve istatistikleri.
+
+    Kuyruk akışa özeldir ve doluysa en eski kare atılır; yavaş işlenen veya hızlı
+    üreten bir akış yalnızca kendi karelerini kaybeder. Video dosyaları kendi kare
+    hızında oynatılır (kamera yerine geçebilsin diye) ve sonunda başa sarılır; canlı
+    kaynak koparsa `reconnect_delay` saniye sonra yeniden açılır.
+    """
+
+    def __init__(self, stream_id, source, queue_size=1, loop_files=True, reconnect_delay=2.0,
+                 latency_window=200, reanalyze_every=30):
+        self.stream_id = stream_id
+        self.source = parse_source(source)
+        self.name = str(source)
+        self.is_file = isinstance(self.source, str) and os.path.isfile(self.source)
+        self.loop_files = loop_files
+        self.reconnect_delay = reconnect_delay
+
+        self.frame_queue = LatestQueue(queue_size)
+        # Her akışın en fazla bir karesi işlenir; takipçi bu yüzden kilitsiz kullanılır
+        self.tracker = FaceTracker(reanalyze_every=reanalyze_every)
+        self.busy = False
+
+        # (seq, yakalama zamanı, kare) ve (seq, yakalama zamanı, overlay)
+        self.latest_frame = None
+        self.latest_overlay = None
+        self.connected = False
+        self.finished = False
+
+        self.capture_rate = RateCounter()
+        self.inference_rate = RateCounter()
+        self.latencies = collections.deque(maxlen=latency_window)
+        self.analyzed = 0
+        # Görülen yüzler (önbellekten çizilenler dahil) ve modelle yeniden analiz edilenler
+        self.faces = 0
+        self.analyzed_faces = 0
+        self.errors = 0
+
+    def capture_loop(self, stop_event, on_frame):
+        seq = 0
+        while not stop_event.is_set():
+            cap = cv2.VideoCapture(self.source)
+            if not cap.isOpened():
+                cap.release()
+                logging.error(f"Kaynak açılamadı: {self.name}")
+                if self.is_file:
+                    break
+                stop_event.wait(self.reconnect_delay)
+                continue
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+            self.connected = True
+            frame_interval = 0.0
+            if self.is_file:
+                fps = cap.get(cv2.CAP_PROP_FPS)
+                frame_interval = 1.0 / fps if fps and fps > 0 else 1.0 / 25
+            next_time = time.perf_counter()
+
+            while not stop_event.is_set():
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                now = time.perf_counter()
+                self.latest_frame = (seq, now, frame)
+                self.frame_queue.put((seq, now, frame))
+                self.capture_rate.tick(now)
+                seq += 1
+                on_frame()
+                if frame_interval:
+                    next_time += frame_interval
+                    delay = next_time - time.perf_counter()
+                    if delay > 0:
+                        stop_event.wait(delay)
+                    else:
+                        next_time = time.perf_counter()
+
+            cap.release()
+            self.connected = False
+            if stop_event.is_set():
+                break
+            if self.is_file:
+                if not self.loop_files:
+                    break
+                continue
+            logging.error(f"Kaynaktan kare alınamadı, yeniden bağlanılıyor: {self.name}")
+            stop_event.wait(self.reconnect_delay)
+        self.finished = True
+
+    def stats(self):
+        latencies = sorted(self.latencies)
+        p50 = latencies[len(latencies) // 2] if latencies else 0.0
+        p95 = latencies[int(len(latencies) * 0.95)] if latencies else 0.0
+        return {
+            "stream": self.stream_id,
+            "source": self.name,
+            "connected": self.connected,
+            "capture_fps": self.capture_rate.rate(),
+            "inference_fps": self.inference_rate.rate(),
+            "dropped_frames": self.frame_queue.dropped,
+            "analyzed_frames": self.analyzed,
+            "faces": self.faces,
+            "analyzed_faces": self.analyzed_faces,
+            "errors": self.errors,
+            "latency_p50_ms": 1000 * p50,
+            "latency_p95_ms": 1000 * p95,
+        }
+
+
+def compose_mosaic(tiles, tile_size=(320, 240), columns=None):
+    """Kareleri sabit boyutlu karolar halinde tek bir ızgara görüntüde birleştirir (boş karolar siyah)."""
+    count = max(1, len(tiles))
+    columns = columns or int(np.ceil(np.sqrt(count)))
+    rows = -(-count // columns)
+    width, height = tile_size
+    mosaic = np.zeros((rows * height, columns * width, 3), dtype=np.uint8)
+    for i, tile in enumerate(tiles):
+        if tile is None:
+            continue
+        y, x = (i // columns) * height, (i % columns) * width
+        cv2.resize(tile, tile_size, dst=mosaic[y:y + height, x:x + width], interpolation=cv2.INTER_AREA)
+    return mosaic
+
+
+class MultiCameraPool:
+    """Birden fazla kaynağı ortak bir çıkarım havuzuyla işleyen çoklu kamera hattı.
+
+    - Her kaynağın kendi yakalama iş parçacığı ve tek gözlü kuyruğu vardır.
+    - `workers` adet çıkarım iş parçacığı, sıradaki akıştan başlayarak her akıştan en
+      fazla bir kare alır (döner sıra) ve en çok `max_batch` kareyi tek toplu model
+      çağrısında işler. İşlenmekte olan akış yeni kare vermez; böylece yoğun bir akış
+      birden fazla işçiyi meşgul edemez ve diğerlerini aç bırakamaz.
+    - `render_fn(mosaic)` verilirse `display_fps` hızında, her akışın son karesi ve
+      son analiz sonucuyla bir mozaik çizilir.
+
+    `on_result(stream, results)` yeni analiz sonuçlarıyla (işçi iş parçacığından) çağrılır.
+    """
+
+    def __init__(self, sources, analyzer, workers=2, max_batch=8, on_result=None, render_fn=None,
+                 display_fps=15.0, tile_size=(320, 240), queue_size=1, loop_files=True, timer=None):
+        self.streams = [
+            StreamSource(i, source, queue_size=queue_size, loop_files=loop_files)
+            for i, source in enumerate(sources)
+        ]
+        self.analyzer = analyzer
+        self.workers = max(1, workers)
+        self.max_batch = max(1, max_batch)
+        self.on_result = on_result
+        self.render_fn = render_fn
+        self.display_interval = 1.0 / display_fps if display_fps else 0.0
+        self.tile_size = tile_size
+        self.timer = timer or DISABLED_TIMER
+
+        self.stop_event = threading.Event()
+        self._cond = threading.Condition()
+        self._cursor = 0
+        self._threads = []
+        self.batch_sizes = collections.deque(maxlen=200)
+
+    def start(self):
+        self.stop_event.clear()
+        self._threads = [
+            threading.Thread(target=stream.capture_loop, args=(self.stop_event, self._notify), daemon=True,
+                             name=f"capture-{stream.stream_id}")
+            for stream in self.streams
+        ]
+        self._threads += [
+            threading.Thread(target=self._inference_loop, daemon=True, name=f"inference-{i}")
+            for i in range(self.workers)
+        ]
+        if self.render_fn is not None:
+            self._threads.append(threading.Thread(target=self._render_loop, daemon=True, name="render"))
+        for thread in self._threads:
+            thread.start()
+        return True
+
+    def stop(self, timeout=2.0):
+        self.stop_event.set()
+        with self._cond:
+            self._cond.notify_all()
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout)
+        self._threads = []
+
+    def _notify(self):
+        with self._cond:
+            self._cond.notify()
+
+    def _next_batch(self):
+        """Döner sırayla, meşgul olmayan akışlardan en fazla birer kare toplar."""
+        with self._cond:
+            while not self.stop_event.is_set():
+                batch = []
+                count = len(self.streams)
+                for offset in range(count):
+                    stream = self.streams[(self._cursor + offset) % count]
+                    if stream.busy:
+                        continue
+                    try:
+                        item = stream.frame_queue.get_nowait()
+                    except queue.Empty:
+                        continue
+                    stream.busy = True
+                    batch.append((stream, item))
+                    if len(batch) == self.max_batch:
+                        break
+                if batch:
+                    # Sonraki toplama bu turda son hizmet alan akıştan sonra başlar
+                    self._cursor = (batch[-1][0].stream_id + 1) % count
+                    return batch
+                self._cond.wait(0.1)
+            return []
+
+    def _inference_loop(self):
+        while not self.stop_event.is_set():
+            batch = self._next_batch()
+            if not batch:
+                continue
+            try:
+                self._process(batch)
+            except Exception as e:
+                logging.error(f"Çoklu kamera işleme hatası: {str(e)}")
+                for stream, _ in batch:
+                    stream.errors += 1
+            finally:
+                with self._cond:
+                    for stream, _ in batch:
+                        stream.busy = False
+                    self._cond.notify_all()
+
+    def _process(self, batch):
+        """Kareleri ayrı ayrı tespit edip izler; bayat izler tüm akışlarda tek çağrıda analiz edilir."""
+        work = []
+        for stream, (seq, captured_at, frame) in batch:
+            with self.timer.span("detect"):
+                detections = self.analyzer.detector.detect(frame)
+            with self.timer.span("track"):
+                tracks = stream.tracker.update(detections, frame)
+                stale = [track for track in tracks if stream.tracker.needs_analysis(track)]
+            work.append((stream, seq, captured_at, frame, tracks, stale))
+
+        self.batch_sizes.append(len(batch))
+        all_results = self.analyzer.analyze_many(
+            [(frame, [track.detection for track in stale]) for _, _, _, frame, _, stale in work], draw=False
+        )
+
+        now = time.perf_counter()
+        for (stream, seq, captured_at, _, tracks, stale), results in zip(work, all_results):
+            for track, result in zip(stale, results):
+                stream.tracker.store(track, result)
+            overlay = [(track.box, track.result) for track in tracks if track.result is not None]
+            stream.latest_overlay = (seq, captured_at, overlay)
+            stream.analyzed += 1
+            stream.faces += len(tracks)
+            stream.analyzed_faces += len(results)
+            stream.inference_rate.tick(now)
+            stream.latencies.append(now - captured_at)
+            if self.on_result is not None and results:
+                self.on_result(stream, results)
+
+    def mosaic(self):
+        """Her akışın son karesini son analiz sonucu ve akış bilgisiyle çizip ızgarada birleştirir."""
+        tiles = []
+        for stream in self.streams:
+            frame_item = stream.latest_frame
+            if frame_item is None:
+                tiles.append(None)
+                continue
+            frame = frame_item[2].copy()
+            overlay_item = stream.latest_overlay
+            for box, result in (overlay_item[2] if overlay_item else ()):
+                self.analyzer.draw_analysis_results(frame, box, result)
+            tiles.append(frame)
+        mosaic = compose_mosaic(tiles, self.tile_size)
+
+        columns = mosaic.shape[1] // self.tile_size[0]
+        for i, stream in enumerate(self.streams):
+            x = (i % columns) * self.tile_size[0]
+            y = (i // columns) * self.tile_size[1]
+            text = f"{stream.stream_id}: {stream.capture_rate.rate():.0f}/{stream.inference_rate.rate():.0f} fps"
+            cv2.putText(mosaic, text, (x + 6, y + 18), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 1,
+                        cv2.LINE_AA)
+        return mosaic
+
+    def _render_loop(self):
+        next_time = time.perf_counter()
+        while not self.stop_event.is_set():
+            try:
+                with self.timer.span("render"):
+                    self.render_fn(self.mosaic())
+            except Exception as e:
+                logging.error(f"Mozaik çizim hatası: {str(e)}")
+            next_time += self.display_interval
+            delay = next_time - time.perf_counter()
+            if delay > 0:
+                self.stop_event.wait(delay)
+            else:
+                next_time = time.perf_counter()
+
+    @property
+    def finished(self):
+        return all(stream.finished for stream in self.streams)
+
+    def stats(self):
+        streams = [stream.stats() for stream in self.streams]
+        sizes = list(self.batch_sizes)
+        return {
+            "streams": streams,
+            "inference_fps": sum(s["inference_fps"] for s in streams),
+            "mean_batch": sum(sizes) / len(sizes) if sizes else 0.0,
+        }
+
+
+def format_stats(stats):
+    lines = [f"Toplam analiz {stats['inference_fps']:.1f} fps, ortalama parti {stats['mean_batch']:.1f} kare"]
+    for s in stats["streams"]:
+        lines.append(
+            f"  [{s['stream']}] {s['source']}: yakalama {s['capture_fps']:.1f} fps, analiz {s['inference_fps']:.1f} fps, "
+            f"atlanan {s['dropped_frames']}, gecikme p50 {s['latency_p50_ms']:.0f} / p95 {s['latency_p95_ms']:.0f} ms"
+            + ("" if s["connected"] else " (bağlı değil)")
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Birden fazla kamera/video kaynağını ortak çıkarım havuzuyla analiz eder.")
+    parser.add_argument("sources", nargs="+", help="Kamera numarası, RTSP adresi veya video dosyası")
+    parser.add_argument("--workers", type=int, default=2, help="Çıkarım iş parçacığı sayısı")
+    parser.add_argument("--max-batch", type=int, default=8, help="Tek model çağrısına giren en fazla kare")
+    parser.add_argument("--duration", type=float, default=0.0, help="Çalışma süresi (saniye, 0: durdurulana kadar)")
+    parser.add_argument("--db", dest="db_path", help="Sonuçların yazılacağı SQLite veritabanı")
+    parser.add_argument("--report-interval", type=float, default=5.0, help="İstatistik raporu aralığı (saniye)")
+    parser.add_argument("--no-loop", action="store_true", help="Video dosyalarını sonunda başa sarma")
+    args = parser.parse_args(argv)
+
+    from face_analyzer import FaceAnalyzer
+    from db_writer import AnalysisDbWriter
+
+    analyzer = FaceAnalyzer()
+    analyzer.warmup()
+    db_writer = AnalysisDbWriter(args.db_path) if args.db_path else None
+    on_result = (lambda stream, results: db_writer.submit(results)) if db_writer else None
+
+    pool = MultiCameraPool(args.sources, analyzer, workers=args.workers, max_batch=args.max_batch,
+                           on_result=on_result, loop_files=not args.no_loop)
+    pool.start()
+    start = time.perf_counter()
+    try:
+        while not pool.finished:
+            time.sleep(args.report_interval)
+            print(format_stats(pool.stats()), flush=True)
+            if args.duration and time.perf_counter() - start >= args.duration:
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        pool.stop()
+        if db_writer:
+            db_writer.close()
+    print(format_stats(pool.stats()), flush=True)
+
+
+if __name__ == "__main__":
+    main()
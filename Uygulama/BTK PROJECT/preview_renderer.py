@@ -0,0 +1,113 @@
+import threading
+
+import cv2
+import numpy as np
+from PIL import Image, ImageTk
+
+from instrumentation import DISABLED_TIMER
+
+
+class PreviewRenderer:
+    """Kamera karelerini Tk etiketine güvenli ve sabit maliyetle çizen bileşen.
+
+    İş parçacıkları `submit()` ile tek gözlü bir yuvaya kare bırakır (yeni kare
+    eskisinin üzerine yazılır); Tk ana döngüsü `root.after` ile yuvayı yoklar.
+    Kare ucuz bir enterpolasyonla doğrudan hedef boyuta, önceden ayrılmış
+    tamponlara küçültülür; tek bir PIL resmi ve tek bir kalıcı PhotoImage yerinde
+    güncellenir.
+    Tamponlar yalnızca kare boyutu değiştiğinde yeniden oluşturulur.
+    """
+
+    def __init__(self, root, label, max_size, upscale=True, interpolation=cv2.INTER_LINEAR, poll_ms=15,
+                 timer=None):
+        self.root = root
+        self.label = label
+        self.max_size = max_size
+        self.upscale = upscale
+        self.interpolation = interpolation
+        self.poll_ms = poll_ms
+        self.timer = timer or DISABLED_TIMER
+
+        self._slot = None
+        self._slot_lock = threading.Lock()
+        self._after_id = None
+
+        self._source_shape = None
+        self._size = None
+        self._resized = None
+        self._rgb = None
+        self._image = None
+        self._photo = None
+
+        self.rendered = 0
+        self.dropped = 0
+
+    def start(self):
+        if self._after_id is None:
+            self._after_id = self.root.after(self.poll_ms, self._poll)
+
+    def stop(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def submit(self, frame):
+        """Herhangi bir iş parçacığından BGR kare bırakır; kare değiştirilmemelidir."""
+        with self._slot_lock:
+            if self._slot is not None:
+                self.dropped += 1
+            self._slot = frame
+
+    def show(self, frame):
+        """Kareyi hemen çizer (yalnızca Tk iş parçacığından çağrılmalıdır)."""
+        with self._slot_lock:
+            self._slot = None
+        self._render(frame)
+
+    def _poll(self):
+        with self._slot_lock:
+            frame, self._slot = self._slot, None
+        if frame is not None:
+            self._render(frame)
+        self._after_id = self.root.after(self.poll_ms, self._poll)
+
+    def _prepare(self, shape):
+        height, width = shape[:2]
+        ratio = min(self.max_size[0] / width, self.max_size[1] / height)
+        if not self.upscale:
+            ratio = min(ratio, 1.0)
+        size = (max(1, int(width * ratio)), max(1, int(height * ratio)))
+
+        self._source_shape = shape
+        if size != self._size:
+            self._size = size
+            self._resized = np.empty((size[1], size[0], 3), dtype=np.uint8)
+            self._rgb = np.empty((size[1], size[0], 3), dtype=np.uint8)
+            self._image = Image.new("RGB", size)
+
+    def convert(self, frame):
+        """Kareyi hedef boyutta RGB tampona dönüştürür ve tamponu döndürür (Tk gerektirmez)."""
+        if frame.shape != self._source_shape:
+            self._prepare(frame.shape)
+
+        if frame.shape[:2] == self._resized.shape[:2]:
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb)
+        else:
+            cv2.resize(frame, self._size, dst=self._resized, interpolation=self.interpolation)
+            cv2.cvtColor(self._resized, cv2.COLOR_BGR2RGB, dst=self._rgb)
+        return self._rgb
+
+    def _render(self, frame):
+        if frame is None or frame.size == 0:
+            return
+        with self.timer.span("preview"):
+            rgb = self.convert(frame)
+
+            if self._photo is None or self._photo.width() != self._size[0] or self._photo.height() != self._size[1]:
+                self._photo = ImageTk.PhotoImage("RGB", self._size)
+                self.label.config(image=self._photo)
+                self.label.image = self._photo
+            # Image.fromarray her karede yeni resim ayırırdı; mevcut resmin pikselleri değiştirilir
+            self._image.frombytes(rgb)
+            self._photo.paste(self._image)
+        self.rendered += 1
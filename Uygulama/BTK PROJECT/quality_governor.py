@@ -0,0 +1,103 @@
+import collections
+import logging
+import time
+
+import numpy as np
+
+# Kalite seviyeleri: 0 tam kalite, sonrakiler giderek daha ucuz
+#   detect_scale    : yüz tespitinin çalıştığı görüntü ölçeği
+#   reanalyze_every : aynı iz için modellerin kaç karede bir yeniden çalışacağı
+#   actions         : yeniden analizde hesaplanan özellikler (yeni yüzler her zaman tam analiz edilir)
+#   color_samples   : renk bölgesi başına örneklenen en fazla piksel
+QUALITY_LEVELS = [
+    {"detect_scale": 1.0, "reanalyze_every": 30, "actions": ("emotion", "gender", "age"), "color_samples": 1024},
+    {"detect_scale": 0.75, "reanalyze_every": 45, "actions": ("emotion", "gender", "age"), "color_samples": 512},
+    {"detect_scale": 0.6, "reanalyze_every": 60, "actions": ("emotion",), "color_samples": 256},
+    {"detect_scale": 0.5, "reanalyze_every": 90, "actions": ("emotion",), "color_samples": 128},
+    {"detect_scale": 0.4, "reanalyze_every": 150, "actions": (), "color_samples": 64},
+]
+
+
+class QualityGovernor:
+    """Ölçülen kare işleme süresine göre kalite seviyesini ayarlayan denetleyici.
+
+    Hedef, `target_fps` (veya doğrudan `latency_budget_ms`) ile verilir; `workers`
+    paralel işçi varsa kare başına bütçe buna göre genişler. Son `window` karenin
+    p90 süresi bütçeyi aşınca seviye düşürülür (kalabalık geldiğinde hızlı tepki),
+    bütçenin `restore_ratio` katının altında kalınca daha uzun bir bekleme süresinden
+    sonra bir seviye geri alınır. `settings` geçerli seviyenin ayarlarını döndürür;
+    `on_change(settings)` seviye değiştiğinde çağrılır.
+    """
+
+    def __init__(self, target_fps=15.0, latency_budget_ms=None, workers=1, levels=QUALITY_LEVELS,
+                 window=20, degrade_after=0.5, restore_after=3.0, restore_ratio=0.6, on_change=None):
+        if latency_budget_ms is not None:
+            self.budget = latency_budget_ms / 1000.0
+        else:
+            self.budget = max(1, workers) / float(target_fps)
+        self.levels = levels
+        self.window = window
+        self.degrade_after = degrade_after
+        self.restore_after = restore_after
+        self.restore_ratio = restore_ratio
+        self.on_change = on_change
+
+        self.level = 0
+        self.changes = 0
+        self._times = collections.deque(maxlen=window)
+        self._last_change = time.perf_counter()
+
+    @property
+    def settings(self):
+        return self.levels[self.level]
+
+    def observe(self, seconds, now=None):
+        """Bir karenin işleme süresini bildirir; seviye değiştiyse True döner."""
+        self._times.append(seconds)
+        if len(self._times) < min(5, self.window):
+            return False
+        now = now if now is not None else time.perf_counter()
+        elapsed = now - self._last_change
+        load = float(np.percentile(self._times, 90))
+
+        if load > self.budget and self.level < len(self.levels) - 1 and elapsed >= self.degrade_after:
+            # Yük bütçenin çok üstündeyse birden fazla seviye atlanır
+            steps = 2 if load > 2 * self.budget else 1
+            return self._set_level(min(len(self.levels) - 1, self.level + steps), now, load)
+        if load < self.restore_ratio * self.budget and self.level > 0 and elapsed >= self.restore_after:
+            return self._set_level(self.level - 1, now, load)
+        return False
+
+    def _set_level(self, level, now, load):
+        logging.info(
+            f"Kalite seviyesi {self.level} -> {level} (p90 {1000 * load:.0f} ms, bütçe {1000 * self.budget:.0f} ms)"
+        )
+        self.level = level
+        self.changes += 1
+        self._last_change = now
+        # Yeni seviyenin etkisi eski ölçümlerle karışmasın
+        self._times.clear()
+        if self.on_change is not None:
+            self.on_change(self.settings)
+        return True
+
+    def reset(self):
+        changed = self.level != 0
+        self.level = 0
+        self._times.clear()
+        self._last_change = time.perf_counter()
+        if changed and self.on_change is not None:
+            self.on_change(self.settings)
+
+    def status(self):
+        return f"Kalite {len(self.levels) - self.level}/{len(self.levels)} (bütçe {1000 * self.budget:.0f} ms)"
+
+
+def apply_quality(settings, detector=None, tracker=None, color_engine=None):
+    """Seviye ayarlarını tespit, takip ve renk bileşenlerine uygular."""
+    if detector is not None:
+        detector.scale = settings["detect_scale"]
+    if tracker is not None:
+        tracker.reanalyze_every = settings["reanalyze_every"]
+    if color_engine is not None:
+        color_engine.max_samples = settings["color_samples"]
@@ -0,0 +1,238 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+from running_stats import RunningStats
+
+# Kategorik alanlar: (kolon, sonuç sözlüğündeki anahtar)
+CATEGORICAL_FIELDS = [
+    ("gender", "Cinsiyet"),
+    ("hair", "Saç Rengi"),
+    ("eye", "Göz Rengi"),
+    ("emotion", "Duygu"),
+]
+
+# Diske yazılan parçaların satır düzeni
+ROW_DTYPE = np.dtype([
+    ("time", "f8"),
+    ("gender", "u1"),
+    ("hair", "u1"),
+    ("eye", "u1"),
+    ("emotion", "u1"),
+    ("age", "i2"),
+    ("rgb", "u1", (3, 3)),
+])
+
+def clothing_text(rgb):
+    return f"RGB({rgb[0]}, {rgb[1]}, {rgb[2]})"
+
+
+class Vocabulary:
+    """Etiket <-> küçük tamsayı kodu eşlemesi (yalnızca eklenir, kodlar değişmez)."""
+
+    def __init__(self):
+        self.labels = []
+        self.codes = {}
+
+    def encode(self, label):
+        code = self.codes.get(label)
+        if code is None:
+            if len(self.labels) >= 255:
+                raise ValueError(f"Kategori sayısı sınırı aşıldı: {label}")
+            code = self.codes[label] = len(self.labels)
+            self.labels.append(label)
+        return code
+
+    def decode(self, codes):
+        return np.array(self.labels, dtype=object)[codes] if len(codes) else np.array([], dtype=object)
+
+
+class ResultStore:
+    """Oturum sonuçlarını sözlük listesi yerine numpy kolonlarında tutan sıkıştırılmış depo.
+
+    Kategorik alanlar (cinsiyet, saç/göz rengi, duygu) uint8 kod, yaş int16, saç/göz/kıyafet
+    RGB değerleri uint8 (n, 3, 3) olarak saklanır; kıyafet rengi metni RGB'den üretilir.
+    Bellekte en fazla `capacity` satır tutulur. Dolunca en eski `spill_size` satır diske
+    (`spill_dir`, verilmezse geçici klasör) bir .npy parçası olarak yazılır ve bellek
+    eşlemeli okunur; toplam kayıt sayısı ve sıralı erişim değişmez.
+
+    Tüketiciler sözlük oluşturmadan okur: `rows()` görünen pencereyi, `counts()`
+    kategori dağılımını, `column()` ham kolonları ve `chunk()` dışa aktarıcılar için
+    kod + etiket sözlüğü parçalarını döndürür. `clear()` her çağrıldığında `generation`
+    artar. Özet istatistikler eklerken `stats` (RunningStats) üzerinde artımlı güncellenir.
+    """
+
+    def __init__(self, capacity=50000, spill_dir=None, spill_size=None):
+        self.capacity = capacity
+        # Bir parça bellekteki satırlardan büyük olamaz
+        self.spill_size = min(spill_size or max(1, capacity // 2), capacity)
+        self.spill_dir = spill_dir
+        self._own_spill_dir = False
+        self.vocab = {name: Vocabulary() for name, _ in CATEGORICAL_FIELDS}
+        self.stats = RunningStats()
+        self.generation = 0
+        self._lock = threading.RLock()
+        self._alloc()
+
+    def _alloc(self):
+        self._time = np.zeros(self.capacity, dtype=np.float64)
+        self._codes = {name: np.zeros(self.capacity, dtype=np.uint8) for name, _ in CATEGORICAL_FIELDS}
+        self._age = np.zeros(self.capacity, dtype=np.int16)
+        self._rgb = np.zeros((self.capacity, 3, 3), dtype=np.uint8)
+        self._count = 0
+        self._chunks = []
+        # Her parçanın ilk satırının genel sıra numarası
+        self._chunk_starts = []
+        self._spilled = 0
+
+    def __len__(self):
+        return self._spilled + self._count
+
+    def __bool__(self):
+        return len(self) > 0
+
+    # --- Yazma ---
+
+    def append(self, result, timestamp=None):
+        self.extend([result], timestamp)
+
+    def extend(self, results, timestamp=None):
+        """Analiz sonuç sözlüklerini kolonlara kodlayarak ekler."""
+        if not results:
+            return
+        timestamp = timestamp if timestamp is not None else time.time()
+        with self._lock:
+            for result in results:
+                if self._count == self.capacity:
+                    self._spill()
+                i = self._count
+                self._time[i] = timestamp
+                for name, key in CATEGORICAL_FIELDS:
+                    self._codes[name][i] = self.vocab[name].encode(result[key])
+                self._age[i] = result["Yaş"]
+                self._rgb[i] = result["RGB"]
+                self._count += 1
+            self.stats.update(results)
+
+    def _spill(self):
+        """En eski satırları diske yazar ve kalanları başa kaydırır."""
+        if self.spill_dir is None:
+            self.spill_dir = tempfile.mkdtemp(prefix="face_results_")
+            self._own_spill_dir = True
+        os.makedirs(self.spill_dir, exist_ok=True)
+
+        n = min(self.spill_size, self._count)
+        chunk = np.empty(n, dtype=ROW_DTYPE)
+        chunk["time"] = self._time[:n]
+        for name, _ in CATEGORICAL_FIELDS:
+            chunk[name] = self._codes[name][:n]
+        chunk["age"] = self._age[:n]
+        chunk["rgb"] = self._rgb[:n]
+
+        path = os.path.join(self.spill_dir, f"chunk_{len(self._chunks):05d}.npy")
+        np.save(path, chunk)
+        self._chunks.append(np.load(path, mmap_mode="r"))
+        self._chunk_starts.append(self._spilled)
+        self._spilled += n
+
+        remaining = self._count - n
+        for column in [self._time, self._age, self._rgb] + list(self._codes.values()):
+            column[:remaining] = column[n:self._count]
+        self._count = remaining
+
+    def clear(self):
+        with self._lock:
+            self._remove_spill()
+            self.vocab = {name: Vocabulary() for name, _ in CATEGORICAL_FIELDS}
+            self.stats.reset()
+            self._alloc()
+            self.generation += 1
+
+    def close(self):
+        """Geçici taşma dosyalarını siler."""
+        with self._lock:
+            self._remove_spill()
+
+    def _remove_spill(self):
+        paths = [chunk.filename for chunk in self._chunks]
+        self._chunks = []
+        self._chunk_starts = []
+        if self._own_spill_dir and self.spill_dir:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+            self.spill_dir = None
+            self._own_spill_dir = False
+        else:
+            for path in paths:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    # --- Okuma ---
+
+    def column(self, name, start=0, stop=None):
+        """Bir kolonun [start, stop) aralığını (taşan parçalar dahil) sıralı döndürür."""
+        with self._lock:
+            stop = len(self) if stop is None else min(stop, len(self))
+            if start >= stop:
+                return self._memory_column(name)[:0].copy()
+            parts = []
+            for base, chunk in zip(self._chunk_starts, self._chunks):
+                lo, hi = max(start, base), min(stop, base + len(chunk))
+                if lo < hi:
+                    parts.append(np.asarray(chunk[name][lo - base:hi - base]))
+            lo, hi = max(start, self._spilled), stop
+            if lo < hi:
+                parts.append(self._memory_column(name)[lo - self._spilled:hi - self._spilled].copy())
+            return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def _memory_column(self, name):
+        if name == "time":
+            return self._time
+        if name == "age":
+            return self._age
+        if name == "rgb":
+            return self._rgb
+        return self._codes[name]
+
+    def labels(self, name, start=0, stop=None):
+        return self.vocab[name].decode(self.column(name, start, stop))
+
+    def counts(self, name):
+        """Kategori dağılımı: {etiket: adet} (çoktan aza)."""
+        with self._lock:
+            codes = self.column(name)
+            vocab = list(self.vocab[name].labels)
+        counts = np.bincount(codes, minlength=len(vocab))
+        order = np.argsort(-counts, kind="stable")
+        return {vocab[i]: int(counts[i]) for i in order if counts[i]}
+
+    def rows(self, start, stop):
+        """Görüntüleme için (Cinsiyet, Yaş, Saç, Göz, Duygu, Kıyafet) demetlerini döndürür."""
+        with self._lock:
+            stop = min(stop, len(self))
+            if start >= stop:
+                return []
+            decoded = [self.labels(name, start, stop) for name, _ in CATEGORICAL_FIELDS]
+            ages = self.column("age", start, stop)
+            rgbs = self.column("rgb", start, stop)
+        gender, hair, eye, emotion = decoded
+        return [
+            (gender[i], int(ages[i]), hair[i], eye[i], emotion[i], clothing_text(rgbs[i][2]))
+            for i in range(len(ages))
+        ]
+
+    def chunk(self, start, stop):
+        """[start, stop) aralığındaki ham kolonları ve o anki etiket sözlüklerini döndürür.
+
+        Dışa aktarıcılar için: kategorik kolonlar kod olarak kalır, etiketler bir kez verilir.
+        """
+        with self._lock:
+            names = ["time", "age", "rgb"] + [name for name, _ in CATEGORICAL_FIELDS]
+            columns = {name: self.column(name, start, stop) for name in names}
+            labels = {name: list(self.vocab[name].labels) for name, _ in CATEGORICAL_FIELDS}
+        return columns, labels
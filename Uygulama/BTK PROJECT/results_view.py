@@ -0,0 +1,135 @@
+import tkinter as tk
+from tkinter import ttk
+
+RESULT_COLUMNS = [
+    ("#", 60),
+    ("Cinsiyet", 90),
+    ("Yaş", 60),
+    ("Saç Rengi", 110),
+    ("Göz Rengi", 110),
+    ("Duygu", 100),
+    ("Kıyafet Rengi", 120),
+]
+
+
+class VirtualResultList(ttk.Frame):
+    """Yalnızca görünen satırları oluşturan, satırları yeniden kullanan sonuç listesi.
+
+    Kaynak `len()` ve `rows(start, stop)` destekleyen bir nesnedir (ResultStore,
+    LazyQueryResults); yalnızca görünen pencere için satır demetleri istenir.
+    Kaynakta `prefetch(n)` varsa liste sona yaklaştıkça sonraki sayfalar istenir.
+    Treeview'da pencere yüksekliği kadar satır bulunur; kaydırınca bu satırların
+    değerleri değiştirilir. Böylece yenileme maliyeti geçmişteki kayıt sayısından
+    bağımsızdır. `follow=True` iken liste sondaysa yeni kayıtlar otomatik gösterilir.
+    """
+
+    def __init__(self, parent, source=None, follow=True, row_height=24, header_height=28,
+                 empty_text="Kayıt yok", style=None, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.source = source if source is not None else ()
+        self.follow = follow
+        self.row_height = row_height
+        self.header_height = header_height
+        self.offset = 0
+        self._iids = []
+        self._attached = 0
+        self._last_total = 0
+
+        columns = [name for name, _ in RESULT_COLUMNS]
+        self.tree = ttk.Treeview(self, columns=columns, show="headings", selectmode="browse",
+                                 height=1, style=style or "Treeview")
+        for name, width in RESULT_COLUMNS:
+            self.tree.heading(name, text=name)
+            self.tree.column(name, width=width, anchor=tk.W, stretch=name != "#")
+
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scroll)
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.empty_label = ttk.Label(self, text=empty_text, font=('Helvetica', 10, 'italic'))
+
+        # Boyut ebeveynden gelir; satır sayısı değişince çerçeve büyümez
+        self.pack_propagate(False)
+        self.bind("<Configure>", self._on_resize)
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.tree.bind(sequence, self._on_wheel)
+
+    @property
+    def visible_rows(self):
+        return len(self._iids)
+
+    def set_source(self, source):
+        self.source = source
+        self.offset = 0
+        self.refresh()
+
+    def refresh(self, at_end=None):
+        """Yeni kayıtlar geldiğinde çağrılır; yalnızca görünen satırlar güncellenir."""
+        total = len(self.source)
+        if at_end is None:
+            at_end = self.offset + self.visible_rows >= self._last_total
+        if self.follow and at_end:
+            self.offset = max(0, total - self.visible_rows)
+        self._draw(total)
+
+    def scroll(self, rows):
+        self.offset += rows
+        self._draw(len(self.source))
+
+    def _on_wheel(self, event):
+        up = event.num == 4 or getattr(event, "delta", 0) > 0
+        self.scroll(-3 if up else 3)
+        # Treeview'ın kendi kaydırması devre dışı (satırlar zaten pencere kadar)
+        return "break"
+
+    def _on_scroll(self, action, *args):
+        total = len(self.source)
+        if action == "moveto":
+            self.offset = int(float(args[0]) * total)
+        elif action == "scroll":
+            step = int(args[0])
+            self.offset += step * (self.visible_rows if args[1] == "pages" else 1)
+        self._draw(total)
+
+    def _on_resize(self, event):
+        rows = max(1, (event.height - self.header_height) // self.row_height)
+        if rows == self.visible_rows:
+            return
+        at_end = self.offset + self.visible_rows >= len(self.source)
+        while len(self._iids) < rows:
+            iid = self.tree.insert("", "end")
+            self.tree.detach(iid)
+            self._iids.append(iid)
+        while len(self._iids) > rows:
+            self.tree.delete(self._iids.pop())
+            self._attached = min(self._attached, len(self._iids))
+        self.tree.configure(height=rows)
+        self.refresh(at_end)
+
+    def _draw(self, total):
+        prefetch = getattr(self.source, "prefetch", None)
+        if prefetch is not None:
+            # Tembel kaynaklarda görünen pencerenin bir sayfa ötesi hazır tutulur
+            prefetch(max(0, self.offset) + 2 * self.visible_rows)
+            total = len(self.source)
+        self._last_total = total
+        self.offset = max(0, min(self.offset, total - self.visible_rows))
+        shown = min(self.visible_rows, total - self.offset)
+
+        # Gereken kadar satır ağaca bağlı tutulur, fazlası gizlenir
+        for i in range(self._attached, shown):
+            self.tree.move(self._iids[i], "", i)
+        if shown < self._attached:
+            self.tree.detach(*self._iids[shown:self._attached])
+        self._attached = shown
+
+        rows = self.source.rows(self.offset, self.offset + shown) if shown > 0 else []
+        for i, row in enumerate(rows):
+            self.tree.item(self._iids[i], values=(self.offset + i + 1,) + tuple(row))
+
+        if total:
+            self.scrollbar.set(self.offset / total, (self.offset + shown) / total)
+            self.empty_label.place_forget()
+        else:
+            self.scrollbar.set(0, 1)
+            self.empty_label.place(relx=0.5, rely=0.3, anchor=tk.CENTER)
@@ -0,0 +1,68 @@
+import collections
+import math
+import threading
+
+import numpy as np
+
+# Sayaç tutulan kategorik alanlar: (ad, sonuç sözlüğündeki anahtar)
+COUNTED_FIELDS = [
+    ("gender", "Cinsiyet"),
+    ("emotion", "Duygu"),
+    ("hair", "Saç Rengi"),
+    ("eye", "Göz Rengi"),
+]
+
+
+class RunningStats:
+    """Sonuçlar kaydedilirken artımlı güncellenen istatistikler.
+
+    Kategori sayaçları, 1 yaşlık aralıklarla yaş histogramı ve Welford yöntemiyle
+    yaş ortalaması/varyansı tutulur. İstatistik pencereleri ham kayıtlara dokunmadan
+    `snapshot()` ile O(1) açılır; `version` değiştiyse yeniden çizilir.
+    """
+
+    def __init__(self, max_age=120):
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.count = 0
+            self.mean_age = 0.0
+            self._m2 = 0.0
+            self.counters = {name: collections.Counter() for name, _ in COUNTED_FIELDS}
+            self.age_hist = np.zeros(self.max_age + 1, dtype=np.int64)
+            self.version = 0
+
+    def update(self, results):
+        with self._lock:
+            for result in results:
+                for name, key in COUNTED_FIELDS:
+                    self.counters[name][result[key]] += 1
+                age = result["Yaş"]
+                self.age_hist[min(max(int(age), 0), self.max_age)] += 1
+
+                # Welford: tek geçişte sayısal olarak kararlı ortalama/varyans
+                self.count += 1
+                delta = age - self.mean_age
+                self.mean_age += delta / self.count
+                self._m2 += delta * (age - self.mean_age)
+            if results:
+                self.version += 1
+
+    @property
+    def variance(self):
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def snapshot(self):
+        """Anlık kopya: sayaçlar çoktan aza sıralı sözlükler olarak döner."""
+        with self._lock:
+            return {
+                "version": self.version,
+                "count": self.count,
+                "mean_age": self.mean_age,
+                "std_age": math.sqrt(self.variance),
+                "age_hist": self.age_hist.copy(),
+                **{name: dict(counter.most_common()) for name, counter in self.counters.items()},
+            }
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Modüller uygulama klasöründen düz adlarıyla içe aktarılır (ör. `import result_store`)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,100 @@
+import itertools
+import sqlite3
+
+import pytest
+
+from analysis_query import AnalysisQuery, LazyQueryResults, ensure_indexes
+from db_writer import INSERT_SQL, configure_connection, sql_timestamp
+
+NOW = 1_700_000_000.0
+GENDERS = ["Man", "Woman"]
+EMOTIONS = ["happy", "sad", "neutral"]
+
+
+@pytest.fixture
+def connection(tmp_path):
+    connection = sqlite3.connect(str(tmp_path / "analysis.db"))
+    configure_connection(connection)
+    rows = []
+    for i in range(600):
+        # Eski kayıtlar önce eklenir; id ve zaman birlikte artar
+        timestamp = NOW - 7200 + 12 * i
+        rows.append((sql_timestamp(timestamp), GENDERS[i % 2], "Siyah", "Kahverengi",
+                     EMOTIONS[i % 3], 18 + i % 50, "Mavi"))
+    connection.executemany(INSERT_SQL, rows)
+    connection.commit()
+    ensure_indexes(connection)
+    yield connection
+    connection.close()
+
+
+def expected_ids(connection, gender=None, emotion=None, min_age=None, max_age=None, since=None, until=None):
+    ids = []
+    for row_id, timestamp, row_gender, row_emotion, age in connection.execute(
+            "SELECT id, timestamp, gender, emotion, age FROM analysis_data ORDER BY id"):
+        if gender is not None and row_gender != gender:
+            continue
+        if emotion is not None and row_emotion != emotion:
+            continue
+        if min_age is not None and age < min_age:
+            continue
+        if max_age is not None and age > max_age:
+            continue
+        if since is not None and timestamp < sql_timestamp(since):
+            continue
+        if until is not None and timestamp >= sql_timestamp(until):
+            continue
+        ids.append(row_id)
+    return ids
+
+
+def all_ids(query, page_size=7):
+    ids, last = [], 0
+    while True:
+        page = query.page(last, page_size)
+        ids += [row[0] for row in page]
+        if len(page) < page_size:
+            return ids
+        last = page[-1][0]
+
+
+def test_gender_age_and_time_filters_combined(connection):
+    # Tek eşitlik filtresi + yaş + zaman: koşullar ve parametreler aynı sırada olmalı
+    kwargs = dict(gender="Man", min_age=30, since=NOW - 3600)
+    expected = expected_ids(connection, **kwargs)
+    query = AnalysisQuery(connection, **kwargs)
+    assert expected
+    assert all_ids(query) == expected
+    assert query.count() == len(expected)
+
+
+FILTER_CASES = list(itertools.product(
+    [None, "Woman"], [None, "sad"], [None, 40], [None, 45], [None, NOW - 3600], [None, NOW - 600]
+))
+
+
+@pytest.mark.parametrize("gender, emotion, min_age, max_age, since, until", FILTER_CASES)
+def test_filters_match_brute_force(connection, gender, emotion, min_age, max_age, since, until):
+    kwargs = dict(gender=gender, emotion=emotion, min_age=min_age, max_age=max_age, since=since, until=until)
+    expected = expected_ids(connection, **kwargs)
+    query = AnalysisQuery(connection, **kwargs)
+    assert all_ids(query) == expected
+    assert query.count() == len(expected)
+
+
+def test_empty_time_range_returns_no_rows(connection):
+    query = AnalysisQuery(connection, since=NOW + 3600)
+    assert query.page() == []
+    assert query.count() == 0
+
+
+def test_lazy_results_page_through_query(connection):
+    query = AnalysisQuery(connection, emotion="happy", max_age=30)
+    expected = expected_ids(connection, emotion="happy", max_age=30)
+    results = LazyQueryResults(query, page_size=5)
+    rows = results.rows(0, 12)
+    assert len(rows) == min(12, len(expected))
+    assert [row[0] for row in rows] == [
+        connection.execute("SELECT gender FROM analysis_data WHERE id = ?", (i,)).fetchone()[0]
+        for i in expected[:12]
+    ]
@@ -0,0 +1,70 @@
+import os
+
+from gallery_cache import GalleryEmbeddingCache
+
+
+class FlakyBackend:
+    """İlk `failures` çağrıda hata veren, sonra dosya boyutundan embedding üreten sahte katman."""
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.calls = []
+
+    def represent_images(self, paths, model_name="Facenet"):
+        self.calls.extend(paths)
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("sunucu hazır değil")
+        return [[float(os.path.getsize(path)), 1.0, 0.0] for path in paths]
+
+
+def write_image(folder, name, data):
+    path = folder / name
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_failed_embed_is_retried_on_next_refresh(tmp_path):
+    write_image(tmp_path, "a.jpg", b"a" * 10)
+    backend = FlakyBackend(failures=1)
+    cache = GalleryEmbeddingCache(str(tmp_path), model_name="Facenet", backend=backend)
+
+    cache.refresh()
+    assert cache.entries == {}
+    assert len(cache.index) == 0
+
+    assert cache.refresh() == 1
+    assert len(backend.calls) == 2
+    assert len(cache.index) == 1
+
+    # Değişmeyen dosya yeniden embed edilmez; önbellek diskten de aynı şekilde açılır
+    assert cache.refresh() == 0
+    reopened = GalleryEmbeddingCache(str(tmp_path), model_name="Facenet", backend=backend)
+    assert len(reopened.index) == 1
+
+
+def test_identical_files_reuse_only_real_embeddings(tmp_path):
+    write_image(tmp_path, "a.jpg", b"same")
+    backend = FlakyBackend(failures=1)
+    cache = GalleryEmbeddingCache(str(tmp_path), model_name="Facenet", backend=backend)
+    cache.refresh()
+
+    write_image(tmp_path, "b.jpg", b"same")
+    cache.refresh()
+    # a.jpg yeniden embed edilir, b.jpg aynı içerik özetiyle onun embedding'ini kullanır
+    assert [os.path.basename(path) for path in backend.calls] == ["a.jpg", "a.jpg"]
+    assert all(entry["embedding"] is not None for entry in cache.entries.values())
+    assert len(cache.entries) == 2
+
+
+def test_failed_reembed_drops_stale_entry(tmp_path):
+    path = write_image(tmp_path, "a.jpg", b"old")
+    backend = FlakyBackend(failures=0)
+    cache = GalleryEmbeddingCache(str(tmp_path), model_name="Facenet", backend=backend)
+    cache.refresh()
+
+    write_image(tmp_path, "a.jpg", b"new content")
+    backend.failures = 1
+    assert cache.refresh() == 1
+    assert path not in cache.entries
+    assert len(cache.index) == 0
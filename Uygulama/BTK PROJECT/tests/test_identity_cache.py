@@ -0,0 +1,95 @@
+import pytest
+
+from identity_cache import IdentityCache
+
+
+class FakeTrack:
+    def __init__(self, track_id, box=(0, 0, 100, 100)):
+        self.track_id = track_id
+        self.box = box
+
+
+def verification_times(cache, track, name, distance, until, step=0.25):
+    """Her doğrulamada aynı sonucu saklayarak doğrulamanın yapıldığı anları döndürür."""
+    times, now = [], 0.0
+    while now < until:
+        if cache.needs_verification(track, now):
+            times.append(now)
+            cache.store(track, name, None, distance, now)
+        now += step
+    return times
+
+
+@pytest.fixture
+def cache():
+    return IdentityCache(tolerance=0.4, verify_every=5.0, verify_uncertain=1.0, margin=0.1, ttl=5.0)
+
+
+def test_confident_match_is_reused_until_verify_every(cache):
+    track = FakeTrack(1)
+    assert verification_times(cache, track, "Ali", 0.1, until=12) == [0.0, 5.0, 10.0]
+    assert cache.hits > 0
+
+
+def test_uncertain_match_is_verified_every_second(cache):
+    track = FakeTrack(1)
+    assert verification_times(cache, track, "Ali", 0.35, until=3.5) == [0.0, 1.0, 2.0, 3.0]
+
+
+@pytest.mark.parametrize("distance", [None, 0.6])
+def test_unknown_face_backs_off_up_to_ttl(cache, distance):
+    track = FakeTrack(1)
+    # 1 s, 2 s, 4 s, sonra ttl (5 s) ile sınırlı
+    assert verification_times(cache, track, "Tanımlanmamış", distance, until=20) == [0.0, 1.0, 3.0, 7.0, 12.0, 17.0]
+
+
+def test_invalidate_resets_backoff(cache):
+    track = FakeTrack(1)
+    verification_times(cache, track, "Tanımlanmamış", None, until=8)
+    cache.invalidate()
+    assert cache.needs_verification(track, 8.0)
+    cache.store(track, "Tanımlanmamış", None, None, 8.0)
+    assert cache.get(track).misses == 1
+    assert not cache.needs_verification(track, 8.5)
+    assert cache.needs_verification(track, 9.0)
+
+
+def test_recognition_clears_misses(cache):
+    track = FakeTrack(1)
+    cache.store(track, "Tanımlanmamış", None, None, 0.0)
+    cache.store(track, "Tanımlanmamış", None, None, 1.0)
+    cache.store(track, "Ali", None, 0.1, 3.0)
+    assert cache.get(track).misses == 0
+    assert not cache.needs_verification(track, 7.0)
+
+
+def test_drift_forces_verification(cache):
+    track = FakeTrack(1)
+    cache.store(track, "Ali", None, 0.1, 0.0)
+    track.box = (80, 80, 100, 100)
+    assert cache.needs_verification(track, 0.5)
+
+
+def test_expire_drops_tracks_not_seen_for_ttl(cache):
+    seen, gone = FakeTrack(1), FakeTrack(2)
+    cache.store(gone, "Ayşe", None, 0.1, 0.0)
+    cache.store(seen, "Ali", None, 0.1, 0.0)
+    cache.needs_verification(seen, 4.0)
+    cache.expire(6.0)
+    assert cache.get(gone) is None
+    assert cache.get(seen) is not None
+
+
+def test_invalidate_by_name_and_max_entries():
+    cache = IdentityCache(tolerance=0.4, max_entries=2)
+    ali, ayse, can = FakeTrack(1), FakeTrack(2), FakeTrack(3)
+    cache.store(ali, "Ali", None, 0.1, 0.0)
+    cache.store(ayse, "Ayşe", None, 0.1, 0.0)
+    cache.invalidate("Ali")
+    assert cache.needs_verification(ali, 0.1)
+    assert not cache.needs_verification(ayse, 0.1)
+
+    cache.store(can, "Can", None, 0.1, 0.2)
+    # En uzun süredir kullanılmayan (Ali) atılır
+    assert len(cache) == 2
+    assert cache.get(ali) is None
@@ -0,0 +1,111 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from known_faces_store import KnownFacesStore
+
+
+def vector(seed, dim=8):
+    return np.random.default_rng(seed).normal(size=dim).astype(np.float32)
+
+
+def labels(store):
+    """Dizindeki her satırın ismi, sorgu ile geri okunarak."""
+    return [store.index.search(vector(seed))[0] for seed in range(len(store))]
+
+
+@pytest.fixture
+def base(tmp_path):
+    return str(tmp_path / "known_faces")
+
+
+def reopen(base, **kwargs):
+    store = KnownFacesStore(base, **kwargs)
+    store.open()
+    return store
+
+
+def test_added_faces_survive_reopen(base):
+    store = reopen(base)
+    for seed, name in enumerate(["Ali", "Ayşe", "Ali"]):
+        store.add(name, vector(seed))
+    store.close()
+
+    store = reopen(base)
+    assert len(store) == 3
+    assert sorted(store.identities) == ["Ali", "Ayşe"]
+    assert labels(store) == ["Ali", "Ayşe", "Ali"]
+    store.close()
+
+
+def test_compaction_folds_log_into_snapshot(base):
+    store = reopen(base, compact_every=3)
+    for seed in range(7):
+        store.add(f"kişi{seed}", vector(seed))
+    # 3 ve 6. kayıtta iki sıkıştırma; günlükte yalnızca son kayıt kalır
+    assert store.generation == 2
+    assert store._log_rows == 1
+    store.close()
+
+    store = reopen(base, compact_every=3)
+    assert len(store) == 7
+    assert labels(store) == [f"kişi{seed}" for seed in range(7)]
+    store.add("kişi7", vector(7))
+    store.close()
+    assert len(reopen(base)) == 8
+
+
+def test_torn_log_line_is_dropped(base):
+    store = reopen(base)
+    store.add("Ali", vector(0))
+    store.add("Ayşe", vector(1))
+    store.close()
+    # Çökme: son satır yarım yazılmış
+    with open(base + ".log", "r+", encoding="utf-8") as f:
+        content = f.read()
+        f.seek(0)
+        f.write(content[:-10])
+        f.truncate()
+
+    store = reopen(base)
+    assert len(store) == 1
+    assert labels(store) == ["Ali"]
+    store.add("Can", vector(1))
+    store.close()
+    assert labels(reopen(base)) == ["Ali", "Can"]
+
+
+def test_corrupt_vector_stops_replay(base):
+    store = reopen(base)
+    store.add("Ali", vector(0))
+    store.add("Ayşe", vector(1))
+    store.close()
+    # İkinci satırın verisi bozulmuş: CRC tutmaz
+    with open(base + ".vec", "r+b") as f:
+        f.seek(4 * 8)
+        f.write(b"\0" * 4)
+
+    assert labels(reopen(base)) == ["Ali"]
+
+
+def test_rejects_mismatched_dimension(base):
+    store = reopen(base)
+    store.add("Ali", vector(0))
+    with pytest.raises(ValueError):
+        store.add("Ayşe", vector(1, dim=4))
+    store.close()
+
+
+def test_legacy_pickle_is_migrated_once(base, tmp_path):
+    legacy = tmp_path / "known_faces.pkl"
+    with open(legacy, "wb") as f:
+        pickle.dump({"Ali": [vector(0), vector(1)], "Ayşe": [vector(2)]}, f)
+
+    store = KnownFacesStore(base)
+    store.open(legacy_pickle=str(legacy))
+    assert labels(store) == ["Ali", "Ali", "Ayşe"]
+    store.close()
+
+    legacy.unlink()
+    assert labels(reopen(base)) == ["Ali", "Ali", "Ayşe"]
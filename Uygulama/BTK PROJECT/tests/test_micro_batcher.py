@@ -0,0 +1,108 @@
+import threading
+import time
+
+import pytest
+
+from inference_server import MicroBatcher
+
+
+class RecordingRun:
+    """Partileri kaydeden, isterse ilk partide `gate` açılana kadar bekleyen çalıştırıcı."""
+
+    def __init__(self, gate=None):
+        self.batches = []
+        self.gate = gate
+        self.started = threading.Event()
+
+    def __call__(self, key, items):
+        self.batches.append((key, list(items)))
+        self.started.set()
+        if self.gate is not None:
+            self.gate.wait(5)
+            self.gate = None
+        return [(key, item) for item in items]
+
+
+@pytest.fixture
+def blocked():
+    """İlk partisi kapıda bekleyen bir yürütücü: sonraki işler kuyrukta birikir."""
+    gate = threading.Event()
+    run = RecordingRun(gate)
+    batcher = MicroBatcher(run, max_batch=4, max_wait=0.05)
+    first = batcher.submit(("analyze", None), ["ilk"])
+    assert run.started.wait(5)
+    yield batcher, run, gate, first
+    gate.set()
+    batcher.stop()
+
+
+def test_results_are_split_back_to_jobs():
+    batcher = MicroBatcher(RecordingRun(), max_batch=8, max_wait=0.05)
+    try:
+        futures = [batcher.submit(("analyze", None), [f"{i}a", f"{i}b"]) for i in range(3)]
+        assert [f.result(5) for f in futures] == [
+            [(("analyze", None), f"{i}a"), (("analyze", None), f"{i}b")] for i in range(3)
+        ]
+    finally:
+        batcher.stop()
+
+
+def test_same_key_jobs_merge_without_exceeding_max_batch(blocked):
+    batcher, run, gate, first = blocked
+    futures = [batcher.submit(("analyze", None), [i, i]) for i in range(3)]
+    gate.set()
+    for future in [first] + futures:
+        future.result(5)
+
+    sizes = [len(items) for _, items in run.batches[1:]]
+    assert sizes == [4, 2]
+    assert all(size <= batcher.max_batch for size in sizes)
+    assert batcher.stats()["requests"] == 4
+
+
+def test_different_keys_are_not_mixed(blocked):
+    batcher, run, gate, first = blocked
+    a = batcher.submit(("analyze", None), [1])
+    b = batcher.submit(("represent", "Facenet"), [2])
+    c = batcher.submit(("analyze", None), [3])
+    gate.set()
+    assert a.result(5) == [(("analyze", None), 1)]
+    assert b.result(5) == [(("represent", "Facenet"), 2)]
+    assert c.result(5) == [(("analyze", None), 3)]
+    assert [key for key, _ in run.batches[1:]] == [("analyze", None), ("represent", "Facenet")]
+
+
+def test_run_error_fails_every_job_in_the_batch():
+    def run(key, items):
+        raise ValueError("model hatası")
+
+    batcher = MicroBatcher(run, max_batch=4, max_wait=0.01)
+    try:
+        future = batcher.submit(("analyze", None), [1])
+        with pytest.raises(ValueError):
+            future.result(5)
+    finally:
+        batcher.stop()
+
+
+def test_stop_fails_queued_and_late_jobs():
+    gate = threading.Event()
+    run = RecordingRun(gate)
+    batcher = MicroBatcher(run, max_batch=1, max_wait=0.01)
+    first = batcher.submit(("analyze", None), [1])
+    assert run.started.wait(5)
+    queued = batcher.submit(("analyze", None), [2])
+
+    stopper = threading.Thread(target=batcher.stop)
+    stopper.start()
+    # Kapı, durdurma isteği işlendikten sonra açılır; kuyruktaki iş artık çalıştırılmamalı
+    while not batcher._stop:
+        time.sleep(0.001)
+    gate.set()
+    stopper.join(5)
+
+    assert first.result(5) == [(("analyze", None), 1)]
+    with pytest.raises(RuntimeError):
+        queued.result(5)
+    with pytest.raises(RuntimeError):
+        batcher.submit(("analyze", None), [3]).result(5)
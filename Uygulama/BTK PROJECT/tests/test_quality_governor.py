@@ -0,0 +1,78 @@
+from quality_governor import QUALITY_LEVELS, QualityGovernor, apply_quality
+
+
+def feed(governor, seconds, count, start, step=0.1):
+    """`count` kareyi `step` saniye arayla bildirir; seviye değişimlerini ve son zamanı döndürür."""
+    changes, now = [], start
+    for _ in range(count):
+        if governor.observe(seconds, now):
+            changes.append((round(now, 3), governor.level))
+        now += step
+    return changes, now
+
+
+def make_governor(**kwargs):
+    governor = QualityGovernor(latency_budget_ms=100, **kwargs)
+    # Bekleme süreleri sabit saatle ölçülsün
+    governor._last_change = 0.0
+    return governor
+
+
+def test_stays_at_full_quality_within_budget():
+    governor = make_governor()
+    changes, _ = feed(governor, 0.08, 50, start=1.0)
+    assert changes == []
+    assert governor.settings is QUALITY_LEVELS[0]
+
+
+def test_degrades_one_level_when_over_budget():
+    governor = make_governor()
+    changes, _ = feed(governor, 0.15, 5, start=1.0)
+    assert changes == [(1.4, 1)]
+
+
+def test_heavy_overload_skips_a_level_and_waits_between_steps():
+    governor = make_governor()
+    changes, _ = feed(governor, 0.5, 30, start=1.0)
+    # Her değişimden sonra ölçümler sıfırlanır; 5 kare ve degrade_after (0.5 s) beklenir
+    assert [level for _, level in changes] == [2, 4]
+    assert changes[1][0] - changes[0][0] >= governor.degrade_after
+
+
+def test_restores_gradually_after_load_drops():
+    governor = make_governor()
+    _, now = feed(governor, 0.5, 30, start=1.0)
+    assert governor.level == 4
+
+    changes, _ = feed(governor, 0.02, 200, start=now)
+    assert [level for _, level in changes] == [3, 2, 1, 0]
+    times = [when for when, _ in changes]
+    assert all(b - a >= governor.restore_after for a, b in zip(times, times[1:]))
+
+
+def test_workers_widen_the_budget():
+    assert QualityGovernor(target_fps=10, workers=2).budget == 0.2
+
+
+def test_on_change_and_reset_apply_settings():
+    applied = []
+    governor = make_governor(on_change=applied.append)
+    feed(governor, 0.15, 5, start=1.0)
+    assert applied == [QUALITY_LEVELS[1]]
+
+    governor.reset()
+    assert governor.level == 0
+    assert applied[-1] is QUALITY_LEVELS[0]
+    governor.reset()
+    assert len(applied) == 2
+
+
+def test_apply_quality_updates_components():
+    class Component:
+        pass
+
+    detector, tracker, colors = Component(), Component(), Component()
+    apply_quality(QUALITY_LEVELS[3], detector, tracker, colors)
+    assert detector.scale == QUALITY_LEVELS[3]["detect_scale"]
+    assert tracker.reanalyze_every == QUALITY_LEVELS[3]["reanalyze_every"]
+    assert colors.max_samples == QUALITY_LEVELS[3]["color_samples"]
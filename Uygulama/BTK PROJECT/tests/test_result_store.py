@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from result_store import ResultStore, clothing_text
+
+GENDERS = ["Man", "Woman"]
+EMOTIONS = ["happy", "sad", "angry"]
+
+
+def make_result(i):
+    return {
+        "Cinsiyet": GENDERS[i % 2],
+        "Saç Rengi": "Siyah",
+        "Göz Rengi": "Mavi" if i % 3 else "Yeşil",
+        "Duygu": EMOTIONS[i % 3],
+        "Yaş": 20 + i % 40,
+        "RGB": [[i % 256, 0, 0], [0, i % 256, 0], [0, 0, i % 256]],
+    }
+
+
+def expected_row(i):
+    result = make_result(i)
+    return (result["Cinsiyet"], result["Yaş"], result["Saç Rengi"], result["Göz Rengi"],
+            result["Duygu"], clothing_text(result["RGB"][2]))
+
+
+@pytest.fixture
+def make_store(tmp_path):
+    stores = []
+
+    def make(**kwargs):
+        store = ResultStore(spill_dir=str(tmp_path / f"spill{len(stores)}"), **kwargs)
+        stores.append(store)
+        return store
+
+    yield make
+    for store in stores:
+        store.close()
+
+
+@pytest.mark.parametrize("capacity, spill_size", [(10, None), (10, 3), (10, 10), (10, 15), (7, 1)])
+def test_rows_and_columns_round_trip_across_spills(make_store, capacity, spill_size):
+    store = make_store(capacity=capacity, spill_size=spill_size)
+    total = 43
+    for start in range(0, total, 4):
+        store.extend([make_result(i) for i in range(start, min(start + 4, total))], timestamp=float(start))
+
+    assert len(store) == total
+    assert store.rows(0, total) == [expected_row(i) for i in range(total)]
+    for start, stop in [(35, 37), (5, 12), (0, 1), (9, 31), (40, 50)]:
+        assert store.rows(start, stop) == [expected_row(i) for i in range(start, min(stop, total))]
+        ages = store.column("age", start, stop)
+        assert ages.tolist() == [make_result(i)["Yaş"] for i in range(start, min(stop, total))]
+    times = store.column("time", 5, 12)
+    assert times.tolist() == [float(i - i % 4) for i in range(5, 12)]
+
+
+def test_counts_and_chunk_include_spilled_rows(make_store):
+    store = make_store(capacity=8, spill_size=3)
+    store.extend([make_result(i) for i in range(30)])
+
+    assert store.counts("emotion") == {"happy": 10, "sad": 10, "angry": 10}
+    columns, labels = store.chunk(4, 20)
+    decoded = np.array(labels["gender"], dtype=object)[columns["gender"]]
+    assert decoded.tolist() == [GENDERS[i % 2] for i in range(4, 20)]
+    assert columns["rgb"][:, 2, 2].tolist() == list(range(4, 20))
+    assert store.stats.count == 30
+
+
+def test_clear_removes_spill_files_and_bumps_generation(make_store, tmp_path):
+    store = make_store(capacity=4, spill_size=2)
+    store.extend([make_result(i) for i in range(10)])
+    spill_files = list((tmp_path / "spill0").iterdir())
+    assert spill_files
+
+    generation = store.generation
+    store.clear()
+    assert len(store) == 0
+    assert store.generation == generation + 1
+    assert not any(path.exists() for path in spill_files)
+    store.extend([make_result(i) for i in range(6)])
+    assert store.rows(0, 6) == [expected_row(i) for i in range(6)]
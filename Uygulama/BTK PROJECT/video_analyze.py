@@ -0,0 +1,315 @@
+"""Video dosyalarını arayüz olmadan, paralel olarak analiz eden komut satırı aracı.
+
+Uzun videolar kare aralıklarına bölünür; her aralık ayrı bir işçi süreçte kendi
+VideoCapture nesnesiyle açılır, başlangıç karesine atlanır (seek) ve yalnızca
+örneklenen kareler çözülür. Sonuçlar kare numarası ve video zamanıyla yazılır.
+
+Örnek:
+    python video_analyze.py kayit.mp4 --fps 5 --csv sonuc.csv --workers 16
+    python video_analyze.py kayitlar/ --every 10 --db face_analysis.db
+"""
+import argparse
+import datetime
+import multiprocessing
+import os
+import sys
+import time
+
+import batch_analyze
+from batch_analyze import ResultSink, init_worker, rgb_text
+from db_writer import db_row
+
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov", ".mkv", ".webm", ".m4v", ".mpg", ".mpeg")
+
+VIDEO_CSV_COLUMNS = [
+    "Dosya", "Kare", "Saniye", "Zaman", "Yüz", "Cinsiyet", "Yaş", "Saç Rengi", "Göz Rengi",
+    "Duygu", "Kıyafet Rengi", "Saç RGB", "Göz RGB", "Kıyafet RGB"
+]
+
+# Adım bu kadar kareden büyükse aradaki kareler atlanmak yerine doğrudan konuma gidilir
+SEEK_THRESHOLD = 48
+
+
+class VideoInfo:
+    """Bir video dosyasının örnekleme ve bölme için gereken bilgileri."""
+
+    def __init__(self, path, fps, frame_count):
+        self.path = path
+        self.fps = fps
+        self.frame_count = frame_count
+
+    @property
+    def duration(self):
+        return self.frame_count / self.fps if self.frame_count > 0 else 0.0
+
+
+def probe_video(path):
+    """Videonun kare hızını ve kare sayısını okur; açılamazsa None döndürür."""
+    import cv2
+
+    cap = cv2.VideoCapture(path)
+    try:
+        if not cap.isOpened():
+            return None
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        # Bazı kapsayıcılar kare sayısı bildirmez (0 veya negatif); bu durumda tek aralık kullanılır
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        return VideoInfo(path, fps if fps and fps > 0 else 25.0, max(frame_count, 0))
+    finally:
+        cap.release()
+
+
+def sample_step(fps, every=None, per_second=None):
+    """Örnekleme adımını kare cinsinden döndürür: her `every` karede bir veya saniyede `per_second` kare."""
+    if every:
+        return max(1, int(every))
+    if per_second:
+        return max(1, int(round(fps / per_second)))
+    return 1
+
+
+def plan_segments(info, step, workers=1, segment_seconds=20.0):
+    """Videoyu [başlangıç, bitiş) kare aralıklarına böler.
+
+    Aralık başlangıçları adımın katlarına hizalanır; böylece bölünmüş ve bölünmemiş
+    analiz aynı kareleri örnekler. Kısa videolar en az `workers` aralığa ayrılır.
+    Son aralığın bitişi None'dır (bildirilen kare sayısı eksikse video sonuna kadar okunur).
+    """
+    if info.frame_count <= 0:
+        return [(0, None)]
+    length = int(info.fps * segment_seconds)
+    length = min(length, -(-info.frame_count // max(1, workers)))
+    # Aralık uzunluğu adımın katına yuvarlanır
+    length = max(step, -(-length // step) * step)
+
+    segments = []
+    for start in range(0, info.frame_count, length):
+        segments.append((start, start + length))
+    segments[-1] = (segments[-1][0], None)
+    return segments
+
+
+def iter_frames(cap, start, stop, step, seek_threshold=SEEK_THRESHOLD):
+    """[start, stop) aralığındaki her `step`inci kareyi (kare no, kare) olarak üretir.
+
+    Küçük adımlarda aradaki kareler `grab()` ile renk dönüşümü yapılmadan geçilir;
+    büyük adımlarda doğrudan sonraki örneğin konumuna atlanır.
+    """
+    import cv2
+
+    if start > 0:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+    index = start
+    while stop is None or index < stop:
+        ret, frame = cap.read()
+        if not ret:
+            return
+        yield index, frame
+        index += step
+        if step > seek_threshold:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, index)
+        else:
+            for _ in range(step - 1):
+                if not cap.grab():
+                    return
+
+
+def analyze_video_range(analyzer, path, start=0, stop=None, step=1, fps=25.0, frame_batch=8,
+                        stop_event=None):
+    """Bir video aralığını analiz eder ve her örnek kare için (kare no, saniye, sonuçlar) üretir.
+
+    Kareler `frame_batch`lik gruplar halinde tek toplu çıkarıma girer (resim modundaki
+    analyze_faces ile aynı tespit ve analiz yolu). `stop_event` ayarlanınca durur.
+    """
+    import cv2
+
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise ValueError(f"Video açılamadı: {path}")
+    try:
+        batch = []
+        for index, frame in iter_frames(cap, start, stop, step):
+            if stop_event is not None and stop_event.is_set():
+                break
+            batch.append((index, frame, analyzer.detector.detect(frame)))
+            if len(batch) == frame_batch:
+                yield from _analyze_batch(analyzer, batch, fps)
+                batch = []
+        if batch:
+            yield from _analyze_batch(analyzer, batch, fps)
+    finally:
+        cap.release()
+
+
+def _analyze_batch(analyzer, batch, fps):
+    results = analyzer.analyze_many([(frame, detections) for _, frame, detections in batch], draw=False)
+    for (index, _, _), frame_results in zip(batch, results):
+        yield index, index / fps, frame_results
+
+
+def analyze_segment(task):
+    """İşçi süreçte bir video aralığını analiz eder.
+
+    (yol, aralık no, kayıtlar, örneklenen kare sayısı, hata) döndürür; kayıtlar
+    (kare no, saniye, sonuçlar) üçlüleridir.
+    """
+    path, segment_id, start, stop, step, fps, frame_batch = task
+    records = []
+    try:
+        for record in analyze_video_range(batch_analyze._analyzer, path, start, stop, step, fps, frame_batch):
+            records.append(record)
+    except Exception as e:
+        return path, segment_id, records, len(records), str(e)
+    return path, segment_id, records, len(records), None
+
+
+def iter_videos(inputs):
+    """Verilen dosya/klasörlerdeki video yollarını üretir."""
+    for item in inputs:
+        if os.path.isfile(item):
+            yield item
+            continue
+        for dirpath, _, filenames in os.walk(item):
+            for filename in sorted(filenames):
+                if filename.lower().endswith(VIDEO_EXTENSIONS):
+                    yield os.path.join(dirpath, filename)
+
+
+def recording_start(info, start_time=None):
+    """Kayıt başlangıcının epoch değeri: verilmediyse dosya zamanından süre çıkarılarak tahmin edilir."""
+    if start_time is not None:
+        return start_time
+    return os.path.getmtime(info.path) - info.duration
+
+
+class VideoResultSink(ResultSink):
+    """Video sonuçlarını kare numarası ve zamanla birlikte CSV ve/veya SQLite'a yazar."""
+
+    def __init__(self, csv_path=None, db_path=None, commit_every=500):
+        super().__init__(csv_path, db_path, commit_every, columns=VIDEO_CSV_COLUMNS)
+
+    def write_frame(self, path, frame_index, seconds, timestamp, results):
+        iso_time = datetime.datetime.fromtimestamp(timestamp).isoformat(timespec="milliseconds")
+        for face_index, data in enumerate(results):
+            hair_rgb, eye_rgb, clothing_rgb = data["RGB"]
+            if self.csv_writer:
+                self.csv_writer.writerow([
+                    path, frame_index, f"{seconds:.3f}", iso_time, face_index,
+                    data["Cinsiyet"], data["Yaş"], data["Saç Rengi"], data["Göz Rengi"],
+                    data["Duygu"], data["Kıyafet Rengi"],
+                    rgb_text(hair_rgb), rgb_text(eye_rgb), rgb_text(clothing_rgb)
+                ])
+            if self.db_connection:
+                self.pending_rows.append(db_row(data, timestamp))
+
+        if len(self.pending_rows) >= self.commit_every:
+            self.flush()
+
+
+def print_progress(frame_count, face_count, video_seconds, error_count, start_time, final=False):
+    elapsed = max(time.perf_counter() - start_time, 1e-9)
+    prefix = "Tamamlandı" if final else "İlerleme"
+    print(
+        f"{prefix}: {frame_count} kare, {face_count} yüz, {video_seconds:.1f} s video, {error_count} hata | "
+        f"{frame_count / elapsed:.2f} kare/s, gerçek zamanın {video_seconds / elapsed:.2f} katı | {elapsed:.1f} s",
+        flush=True
+    )
+
+
+def run_video(inputs, csv_path=None, db_path=None, workers=None, threads_per_worker=1, every=None,
+              per_second=None, segment_seconds=20.0, frame_batch=8, start_time=None, report_interval=5.0):
+    """Videoları aralıklara bölüp süreç havuzuna dağıtır; sonuçlar zaman sırasıyla yazılır."""
+    workers = workers or os.cpu_count() or 1
+    tasks = []
+    plans = {}
+    for path in iter_videos(inputs):
+        info = probe_video(path)
+        if info is None:
+            print(f"Hata ({path}): Video açılamadı", file=sys.stderr)
+            continue
+        step = sample_step(info.fps, every, per_second)
+        segments = plan_segments(info, step, workers, segment_seconds)
+        plans[path] = (info, step, recording_start(info, start_time), len(segments))
+        tasks.extend(
+            (path, segment_id, start, stop, step, info.fps, frame_batch)
+            for segment_id, (start, stop) in enumerate(segments)
+        )
+    if not tasks:
+        print("Analiz edilecek video bulunamadı", file=sys.stderr)
+        return 0, 0, 0
+
+    sink = VideoResultSink(csv_path, db_path)
+    context = multiprocessing.get_context("spawn")
+    frame_count = face_count = error_count = 0
+    video_seconds = 0.0
+    start = time.perf_counter()
+
+    try:
+        with context.Pool(workers, initializer=init_worker, initargs=(threads_per_worker,)) as pool:
+            start = last_report = time.perf_counter()
+            # imap sırayı korur: her videonun kayıtları zamana göre sıralı yazılır
+            for path, segment_id, records, sampled, error in pool.imap(analyze_segment, tasks):
+                info, step, base_time, _ = plans[path]
+                if error:
+                    error_count += 1
+                    print(f"Hata ({path}, aralık {segment_id}): {error}", file=sys.stderr)
+                for frame_index, seconds, results in records:
+                    face_count += len(results)
+                    sink.write_frame(path, frame_index, seconds, base_time + seconds, results)
+                frame_count += sampled
+                video_seconds += sampled * step / info.fps
+
+                now = time.perf_counter()
+                if now - last_report >= report_interval:
+                    print_progress(frame_count, face_count, video_seconds, error_count, start)
+                    last_report = now
+    finally:
+        sink.close()
+
+    print_progress(frame_count, face_count, video_seconds, error_count, start, final=True)
+    return frame_count, face_count, error_count
+
+
+def parse_start_time(text):
+    return datetime.datetime.fromisoformat(text).timestamp()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Video dosyalarını arayüz olmadan paralel analiz eder.")
+    parser.add_argument("inputs", nargs="+", help="Video dosyaları veya klasörleri")
+    parser.add_argument("--csv", dest="csv_path", help="Sonuçların yazılacağı CSV dosyası")
+    parser.add_argument("--db", dest="db_path", help="Sonuçların yazılacağı SQLite veritabanı")
+    sampling = parser.add_mutually_exclusive_group()
+    sampling.add_argument("--every", type=int, help="Her N karede bir kare analiz et")
+    sampling.add_argument("--fps", dest="per_second", type=float, default=5.0,
+                          help="Saniyede analiz edilecek kare sayısı (varsayılan: 5)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="İşçi süreç sayısı")
+    parser.add_argument("--threads-per-worker", type=int, default=1, help="İşçi başına TF/OpenCV iş parçacığı")
+    parser.add_argument("--segment-seconds", type=float, default=20.0,
+                        help="Bir işçiye verilen video aralığının uzunluğu (saniye)")
+    parser.add_argument("--frame-batch", type=int, default=8, help="Birlikte çıkarıma giren kare sayısı")
+    parser.add_argument("--start-time", type=parse_start_time,
+                        help="Kayıt başlangıcı (ISO, ör. 2024-05-01T14:30:00); verilmezse dosya zamanından tahmin edilir")
+    parser.add_argument("--report-interval", type=float, default=5.0, help="İlerleme raporu aralığı (saniye)")
+    args = parser.parse_args(argv)
+
+    if not args.csv_path and not args.db_path:
+        parser.error("En az bir çıktı gerekli: --csv veya --db")
+
+    run_video(
+        args.inputs,
+        csv_path=args.csv_path,
+        db_path=args.db_path,
+        workers=args.workers,
+        threads_per_worker=args.threads_per_worker,
+        every=args.every,
+        per_second=None if args.every else args.per_second,
+        segment_seconds=args.segment_seconds,
+        frame_batch=args.frame_batch,
+        start_time=args.start_time,
+        report_interval=args.report_interval
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,14 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox
 from PIL import Image, ImageTk
-from deepface import DeepFace
 import os
+import sys
+
+# Ortak analiz modülleri "BTK PROJECT" klasöründe bulunur
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "BTK PROJECT"))
+from gallery_cache import GalleryEmbeddingCache
+from inference_client import default_backend
+from model_warmup import ModelWarmup, attach_status_label
 
 class DeepFaceApp:
     def __init__(self, root):
@@ -27,12 +33,29 @@ class DeepFaceApp:
         self.result_text = tk.Text(root, height=15, width=70)
         self.result_text.pack(pady=10)
 
+        # Model yükleme göstergesi
+        self.model_status = tk.Label(root)
+        self.model_status.pack(pady=5)
+
         # Seçilen resim yolu
         self.img_path = None
 
         # Tanınacak yüzlerin bulunduğu klasör
         self.known_faces_folder = "images"
 
+        # Modeller süreç içinde veya FACE_INFERENCE_SERVER ayarlıysa ortak çıkarım sunucusunda çalışır
+        self.backend = default_backend()
+
+        # Galeri embedding'leri arka planda hazırlanır ve değişiklikler izlenir
+        self.gallery = GalleryEmbeddingCache(self.known_faces_folder, backend=self.backend)
+        self.gallery.start(poll_interval=30.0)
+
+        # Analiz ve tanıma modelleri pencere açıkken arka planda yüklenir
+        self.model_warmup = ModelWarmup(
+            self.backend.warmup_steps(("emotion", "gender", "age", "race"), embedding_model=self.gallery.model_name)
+        ).start()
+        attach_status_label(self.model_status, self.model_warmup)
+
     def select_image(self):
         filetypes = [("Görüntü Dosyaları", "*.jpg *.jpeg *.png")]
         path = filedialog.askopenfilename(title="Resim Seç", filetypes=filetypes)
@@ -57,13 +80,11 @@ class DeepFaceApp:
             return
 
         try:
-            results = DeepFace.analyze(
-                img_path=self.img_path,
-                actions=['age', 'gender', 'race', 'emotion'],
-                enforce_detection=False
-            )
+            results = self.backend.analyze_images([self.img_path], actions=('age', 'gender', 'race', 'emotion'))[0]
+            if not results:
+                raise ValueError("Resimde yüz bulunamadı")
 
-            face = results[0] if isinstance(results, list) else results
+            face = results[0]
 
             self.result_text.delete(1.0, tk.END)
             self.result_text.insert(tk.END, "--- Yüz Özellikleri ---\n")
@@ -82,28 +103,18 @@ class DeepFaceApp:
 
         try:
             self.result_text.insert(tk.END, "--- Yüz Tanıma Sonucu ---\n")
-            matched = False
-
-            for filename in os.listdir(self.known_faces_folder):
-                known_path = os.path.join(self.known_faces_folder, filename)
-
-                if known_path == self.img_path:
-                    continue
-                if not filename.lower().endswith((".jpg", ".jpeg", ".png")):
-                    continue
 
-                result = DeepFace.verify(
-                    img1_path=self.img_path,
-                    img2_path=known_path,
-                    enforce_detection=False
-                )
+            if not self.gallery.ready.is_set():
+                self.result_text.insert(tk.END, "Galeri hazırlanıyor, lütfen birazdan tekrar deneyin ⏳\n")
+                return
 
-                if result["verified"]:
-                    self.result_text.insert(tk.END, f"Eşleşen Kişi: {filename} ✅\n")
-                    matched = True
-                    break
+            # Sorgu resmi yalnızca bir kez embed edilir, galeri vektörleri önbellekten gelir
+            query_embedding = self.gallery.embed(self.img_path)
+            path, distance, verified = self.gallery.match(query_embedding, exclude_path=self.img_path)
 
-            if not matched:
+            if verified:
+                self.result_text.insert(tk.END, f"Eşleşen Kişi: {os.path.basename(path)} ✅ (mesafe: {distance:.3f})\n")
+            else:
                 self.result_text.insert(tk.END, "Eşleşme bulunamadı ❌\n")
 
         except Exception as e:
@@ -113,3 +124,4 @@ if __name__ == "__main__":
     root = tk.Tk()
     app = DeepFaceApp(root)
     root.mainloop()
+    app.gallery.stop()
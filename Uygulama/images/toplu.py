@@ -2,15 +2,25 @@
 import cv2
 import numpy as np
 from tkinter import *
-from PIL import Image, ImageTk
-from sklearn.cluster import KMeans
 import threading
-import datetime
-import pickle
 import os
+import sys
 import time
-from deepface import DeepFace
-from deepface.commons import functions
+
+# Ortak analiz modülleri "BTK PROJECT" klasöründe bulunur
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "BTK PROJECT"))
+from color_engine import DominantColorEngine
+from crop_archiver import CropArchiver
+from embedding_index import EmbeddingIndex
+from face_detection import FaceDetector
+from face_tracker import FaceTracker
+from identity_cache import IdentityCache
+from inference_client import default_backend
+from instrumentation import MetricsFileSink, StageTimer, draw_hud
+from known_faces_store import KnownFacesStore
+from model_warmup import ModelWarmup, attach_status_label
+from preview_renderer import PreviewRenderer
+from quality_governor import QualityGovernor, apply_quality
 
 # Renk veri kümesi (Büyük Harf ile yazıldı, sabit olduğu için)
 COLOR_DATASET = {
@@ -23,93 +33,125 @@ COLOR_DATASET = {
 }
 
 # Yüz Tanıma Sabitleri
-KNOWN_FACES_DB = "known_faces.pkl" # Bilinen yüzlerin kaydedileceği dosya
+KNOWN_FACES_DB = "known_faces.pkl" # Eski biçim (varsa ilk açılışta yeni depoya taşınır)
+KNOWN_FACES_STORE = "known_faces" # Yalnızca eklenen yüz deposunun dosya ön eki
 FACE_RECOGNITION_TOLERANCE = 0.4 # Eşleşme toleransı (düşük değer = daha katı eşleşme)
 
+# Yüz fotoğrafı arşivi
+FACES_FOLDER = "faces"
+FACE_CROP_INTERVAL = 5.0 # Aynı kişi için en az bu kadar saniyede bir (kalite artmadıkça) kaydedilir
+FACE_CROP_PACKED = False # True: tek tek JPEG yerine tek bir indeksli arşiv dosyası (faces/faces.pack)
+
+# Hedef kare hızı: aşılınca tespit ölçeği, yeniden analiz aralığı, duygu analizi ve renk örneklemesi düşürülür
+TARGET_FPS = 15.0
+
+# Performans ölçümü (arayüzdeki "Performans HUD" kutusuyla da açılıp kapatılabilir)
+METRICS_FILE = "toplu_metrics.jsonl"
+
+# Baskın renk motoru (KMeans yerine örneklemeli histogram)
+color_engine = DominantColorEngine()
+
+# Kare başına tek tespit/hizalama aşaması (duygu, embedding ve renkler bunu paylaşır)
+face_detector = FaceDetector()
+
+# Bir karedeki tüm yüzleri model başına tek tensörde çalıştıran çıkarım katmanı
+# (FACE_INFERENCE_SERVER ayarlıysa modeller ortak çıkarım sunucusunda çalışır)
+inference_backend = default_backend()
+
+# Duygu ve Facenet modelleri pencere açıldıktan sonra arka planda yüklenir
+model_warmup = ModelWarmup(inference_backend.warmup_steps(("emotion",), embedding_model="Facenet"))
+
+# Kamera döngüsü aşamalarının süreleri (kapalıyken maliyetsiz)
+stage_timer = StageTimer(enabled=False)
+metrics_sink = None
+
+# Yüz takipçisi: modeller yalnızca yeni/kayan izlerde veya 30 karede bir çalışır
+face_tracker = FaceTracker(reanalyze_every=30)
+
+# Ölçülen kare süresine göre kaliteyi ayarlayan denetleyici
+quality_governor = QualityGovernor(
+    target_fps=TARGET_FPS,
+    on_change=lambda settings: apply_quality(settings, face_detector, face_tracker, color_engine)
+)
+
+# İz başına kimlik önbelleği: Facenet yalnızca yeni izlerde ve periyodik doğrulamada çalışır
+identity_cache = IdentityCache(FACE_RECOGNITION_TOLERANCE, verify_every=5.0, verify_uncertain=1.0)
+
 # Global Değişkenler
 running = False # Kamera döngüsünün çalışıp çalışmadığını kontrol eder
 cap = None # Kamera nesnesi
 label = None # Tkinter label for video feed
+preview = None # Kareleri label'a çizen önizleme bileşeni
 btn = None # Tkinter button to toggle camera
 name_entry = None # Tkinter entry for face name
 enroll_button = None # Tkinter button to enroll face
 status_label = None # Tkinter label for status messages
+crop_archiver = None # Yüz fotoğraflarını arka planda yazan aşama (main() içinde oluşturulur)
 
-# Bilinen yüzleri ve embedding'lerini saklayan dictionary
-# Format: {'İsim': [embedding1, embedding2, ...], ...}
-known_faces = {}
+# Bilinen yüzler: kayıt günlüğü + ikili embedding dosyası + sıkıştırılmış anlık görüntü
+known_faces_store = KnownFacesStore(KNOWN_FACES_STORE)
+known_faces_ready = threading.Event()
 
-# --- Veritabanı Yükleme/Kaydetme Fonksiyonları ---
-def load_known_faces(filename=KNOWN_FACES_DB):
-    """Bilinen yüz veritabanını dosyadan yükler."""
-    global known_faces
-    if os.path.exists(filename):
-        try:
-            with open(filename, 'rb') as f:
-                known_faces = pickle.load(f)
-            print(f"Bilinen yüzler '{filename}' dosyasından yüklendi. Toplam {len(known_faces)} kişi.")
-        except Exception as e:
-            print(f"Veritabanı yüklenirken hata oluştu: {e}")
-            known_faces = {} # Hata olursa boş başlat
-    else:
-        print(f"'{filename}' veritabanı dosyası bulunamadı. Yeni veritabanı oluşturuluyor.")
-        known_faces = {}
+# Tanıma için tüm embedding'leri tek float32 matriste tutan dizin (depo açılınca değiştirilir)
+face_index = EmbeddingIndex(metric="cosine")
 
-def save_known_faces(filename=KNOWN_FACES_DB):
-    """Bilinen yüz veritabanını dosyaya kaydeder."""
+# --- Veritabanı Yükleme/Kaydetme Fonksiyonları ---
+def load_known_faces():
+    """Bilinen yüz deposunu açar (anlık görüntü bellek eşlemeli, günlük yeniden oynatılır)."""
+    global face_index
     try:
-        with open(filename, 'wb') as f:
-            pickle.dump(known_faces, f)
-        print(f"Bilinen yüzler '{filename}' dosyasına kaydedildi.")
+        face_index = known_faces_store.open(legacy_pickle=KNOWN_FACES_DB)
+        print(f"Bilinen yüzler yüklendi. Toplam {len(known_faces_store.identities)} kişi, {len(known_faces_store)} embedding.")
+        # Yükleme bitmeden görülen yüzler boş galeriyle "Tanımlanmamış" kaydedilmişti
+        identity_cache.invalidate()
     except Exception as e:
-        print(f"Veritabanı kaydedilirken hata oluştu: {e}")
+        print(f"Veritabanı yüklenirken hata oluştu: {e}")
+    known_faces_ready.set()
 
 # --- Yüz Tanıma Yardımcı Fonksiyonları ---
-def get_face_embedding(img):
-    """DeepFace kullanarak yüz embedding'i çıkarır."""
+def get_face_embedding(face_img):
+    """Tespit edilmiş yüz kesitinden DeepFace (Facenet) embedding'i çıkarır.
+
+    Kesit tespit aşamasından geldiği için DeepFace içinde yeniden yüz aranmaz.
+    """
+    return get_face_embeddings([face_img])[0]
+
+def get_face_embeddings(face_imgs):
+    """Birden fazla yüz kesitinin embedding'lerini tek toplu çıkarımla hesaplar."""
     try:
-        # DeepFace'in beklediği formatta ön işleme yap
-        img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        face_img = functions.preprocess_face(img=img_rgb, target_size=(152, 152), 
-                                           enforce_detection=False, detector_backend='opencv')
-        if face_img.shape[1:3] == (152, 152): # Geçerli bir yüz bulundu
-            embedding = DeepFace.represent(img_path=face_img, model_name='Facenet', enforce_detection=False)
-            return embedding[0]["embedding"]
-        return None
+        return inference_backend.represent(face_imgs, model_name='Facenet')
     except Exception as e:
         print(f"Embedding çıkarılırken hata: {e}")
-        return None
+        return [None] * len(face_imgs)
+
+def analyze_emotions(face_imgs):
+    """Yüz kesitlerinde duygu analizini tek toplu çıkarımla yapar (yeniden tespit yapılmaz)."""
+    try:
+        analyses = inference_backend.analyze(face_imgs, actions=('emotion',))
+    except Exception as e:
+        print(f"Duygu analizi hatası: {e}")
+        analyses = [None] * len(face_imgs)
+    return [a['dominant_emotion'] if a else "Tespit Edilemedi" for a in analyses]
 
 def recognize_face(face_embedding):
     """Verilen embedding'i bilinen yüzlerle karşılaştırır ve ismi döndürür."""
-    if not known_faces or face_embedding is None:
-        return "Tanımlanmamış"
+    return recognize_faces([face_embedding])[0]
 
-    # Bilinen tüm embedding'leri ve isimlerini ayrı listelere al
-    known_encodings = []
-    known_names = []
-    
-    for name, embeddings in known_faces.items():
-        for emb in embeddings:
-            known_encodings.append(emb)
-            known_names.append(name)
-
-    if not known_encodings:
-        return "Tanımlanmamış"
-
-    # DeepFace'in distance metriğini kullanarak karşılaştırma
-    distances = []
-    for known_emb in known_encodings:
-        distance = functions.find_distance(known_emb, face_embedding)
-        distances.append(distance)
-
-    min_distance = min(distances)
-    best_match_index = distances.index(min_distance)
-    
-    if min_distance < FACE_RECOGNITION_TOLERANCE:
-        return known_names[best_match_index]
-    else:
-        return "Tanımlanmamış"
+def recognize_faces(face_embeddings):
+    """Birden fazla embedding'i tek vektörel mesafe hesabıyla bilinen yüzlerle eşleştirir."""
+    return [name for name, _ in match_faces(face_embeddings)]
+
+def match_faces(face_embeddings):
+    """Her embedding için (isim, en yakın mesafe) döndürür; eşleşme yoksa isim "Tanımlanmamış"tır."""
+    matches = [("Tanımlanmamış", None)] * len(face_embeddings)
+    valid = [i for i, emb in enumerate(face_embeddings) if emb is not None]
+    if not len(face_index) or not valid:
+        return matches
+
+    # Kosinüs mesafesi; tüm kayıtlar için tek matris çarpımı + argmin
+    for i, (name, distance) in zip(valid, face_index.search_batch([face_embeddings[i] for i in valid])):
+        matches[i] = (name if distance < FACE_RECOGNITION_TOLERANCE else "Tanımlanmamış", float(distance))
+    return matches
 
 # --- Mevcut Analiz Fonksiyonları ---
 
@@ -118,26 +160,11 @@ def detect_dominant_color(image, k=3):
     if image is None or image.size == 0 or image.shape[0] == 0 or image.shape[1] == 0:
         return (0, 0, 0)
         
-    h, w, channels = image.shape
-    if channels == 1:
+    if image.ndim < 3 or image.shape[2] == 1:
         return (0,0,0)
-        
-    pixels = image.reshape(h * w, channels)
     
-    if pixels.shape[0] < k:
-         k = pixels.shape[0]
-         if k < 1:
-             return (0,0,0)
-    
-    try:
-        kmeans = KMeans(n_clusters=k, n_init=10, random_state=42) 
-        kmeans.fit(pixels)
-        counts = np.bincount(kmeans.labels_)
-        dominant = kmeans.cluster_centers_[np.argmax(counts)]
-        return tuple(dominant.astype(int))
-    except Exception as e:
-        print(f"KMeans hatası: {e}")
-        return (0,0,0)
+    # Sonuç toplu.py'nin geri kalanının beklediği gibi BGR sırasındadır
+    return color_engine.dominant_color(image, to_rgb=False)
 
 # Renk sınıflandırma
 def classify_color(bgr_color):
@@ -178,6 +205,9 @@ def toggle():
                   status_label.config(text="Hata: Kamera başlatılamadı", fg="red")
                   return
         
+        face_tracker.reset()
+        identity_cache.clear()
+        quality_governor.reset()
         thread = threading.Thread(target=camera_loop)
         thread.daemon = True
         thread.start()
@@ -199,26 +229,31 @@ def enroll_face():
          status_label.config(text="Kayıt için önce kamerayı açın.", fg="orange")
          return
 
+    if not known_faces_ready.is_set():
+        status_label.config(text="Yüz veritabanı yükleniyor, lütfen bekleyin.", fg="orange")
+        return
+
     ret, frame = cap.read()
     if not ret:
         status_label.config(text="Kareden veri alınamadı.", fg="red")
         return
         
-    # DeepFace ile yüz tespiti
+    # Yüz tespiti (birden fazla yüz varsa en büyüğü kaydedilir)
     try:
-        face_embedding = get_face_embedding(frame)
+        detections = face_detector.detect(frame)
+        if not detections:
+            status_label.config(text="Yüz bulunamadı veya embedding çıkarılamadı.", fg="orange")
+            return
+        largest = max(detections, key=lambda d: d.box[2] * d.box[3])
+        face_embedding = get_face_embedding(largest.crop)
         if face_embedding is None:
             status_label.config(text="Yüz bulunamadı veya embedding çıkarılamadı.", fg="orange")
             return
 
-        # Embedding'i veritabanına ekle
-        if name not in known_faces:
-            known_faces[name] = []
-            
-        known_faces[name].append(face_embedding)
-
-        # Veritabanını kaydet
-        save_known_faces()
+        # Embedding'i depoya ekle (günlüğe tek satır; dizin de güncellenir)
+        known_faces_store.add(name, face_embedding)
+        # Görünen yüzler yeni kayda göre yeniden doğrulanır
+        identity_cache.invalidate()
 
         status_label.config(text=f"'{name}' adlı yüz başarıyla kaydedildi.", fg="blue")
         name_entry.delete(0, END)
@@ -228,127 +263,121 @@ def enroll_face():
 # --- Kamera İşleme Döngüsü ---
 def camera_loop():
     global running, cap, label, status_label
-    
-    eye_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + "haarcascade_eye.xml") 
 
     while running:
         if cap is None or not cap.isOpened():
              running = False
              break
              
-        ret, frame = cap.read()
+        with stage_timer.span("capture"):
+            ret, frame = cap.read()
         if not ret:
             print("Uyarı: Kameradan kare alınamadı.")
             continue
+        frame_started = time.perf_counter()
 
         # DeepFace ile yüz analizi
         try:
-            # Yüz tespiti ve analizi
-            analysis = DeepFace.analyze(img_path=frame, actions=['emotion'], enforce_detection=False, silent=True)
+            # Yüz tespiti ve hizalama kare başına bir kez yapılır
+            with stage_timer.span("detect"):
+                detections = face_detector.detect(frame)
+            with stage_timer.span("track"):
+                tracks = face_tracker.update(detections, frame)
+            
+            # Pahalı modeller yalnızca yeni, kaymış veya süresi dolmuş izler için çalışır
+            stale = [track for track in tracks if face_tracker.needs_analysis(track)]
             
-            if isinstance(analysis, list) and len(analysis) > 0:
-                # Tüm tespit edilen yüzler için işlem yap
-                for face_info in analysis:
-                    # Yüz konum bilgisi
-                    x = face_info['region']['x']
-                    y = face_info['region']['y']
-                    w = face_info['region']['w']
-                    h = face_info['region']['h']
-                    
-                    # Yüz bölgesini al
-                    face_roi = frame[y:y+h, x:x+w]
-                    
-                    # Yüz tanıma
-                    face_embedding = get_face_embedding(face_roi)
-                    name = recognize_face(face_embedding)
-                    
-                    # Duygu analizi (DeepFace'ten alınan)
-                    emotion = face_info['dominant_emotion']
-                    
-                    # Yüz çevresine dikdörtgen çiz
-                    box_color = (255, 255, 0) if name == "Tanımlanmamış" else (0, 255, 0)
-                    cv2.rectangle(frame, (x, y), (x+w, y+h), box_color, 2)
-                    
-                    # Bilgileri ekrana yazdır
-                    cv2.putText(frame, f"Isim: {name}", (x, y-30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255,255,255), 2)
-                    cv2.putText(frame, f"Duygu: {emotion}", (x, y-10), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0,255,0), 2)
-                    
-                    # Saç rengi analizi (orijinal fonksiyonumuzu kullanıyoruz)
-                    hair_y1 = max(0, y - int(h * 0.4))
-                    hair_y2 = y
-                    hair_x1 = x
-                    hair_x2 = x + w
-                    
-                    hair_y1 = max(0, hair_y1)
-                    hair_y2 = min(frame.shape[0], hair_y2)
-                    hair_x1 = max(0, hair_x1)
-                    hair_x2 = min(frame.shape[1], frame.shape[1])
-                    
-                    hair_roi = frame[hair_y1:hair_y2, hair_x1:hair_x2]
-                    
-                    if hair_roi.size > 0 and hair_roi.shape[0] > 0 and hair_roi.shape[1] > 0:
-                        hair_color = detect_dominant_color(hair_roi)
-                        hair_name = classify_color(hair_color)
-                        cv2.putText(frame, f"Saç: {hair_name}", (x, y + h + 20), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0,0,255), 2)
-                    else:
-                         cv2.putText(frame, "Saç: Tespit Edilemedi", (x, y + h + 20), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0,0,255), 2)
-                    
-                    # Göz rengi analizi
-                    roi_gray = cv2.cvtColor(face_roi, cv2.COLOR_BGR2GRAY) if face_roi.size > 0 and face_roi.shape[2] > 1 else None
-                    
-                    eye_name = "Tespit Edilemedi"
-                    if roi_gray is not None and roi_gray.shape[0] > 0 and roi_gray.shape[1] > 0:
-                        eyes = eye_cascade.detectMultiScale(roi_gray, scaleFactor=1.1, minNeighbors=5, minSize=(20, 20))
-                        
-                        if len(eyes) > 0:
-                            ex, ey, ew, eh = eyes[0]
-                            eye_x1 = x + ex
-                            eye_y1 = y + ey
-                            eye_x2 = x + ex + ew
-                            eye_y2 = y + ey + eh
-                            
-                            eye_roi = frame[eye_y1:eye_y2, eye_x1:eye_x2]
-                            
-                            if eye_roi.size > 0 and eye_roi.shape[0] > 0 and eye_roi.shape[1] > 0 and eye_roi.shape[2] > 1:
-                                eye_color = detect_dominant_color(eye_roi)
-                                eye_name = classify_color(eye_color)
-                    cv2.putText(frame, f"Göz: {eye_name}", (x, y + h + 40), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255,0,255), 2)
-                    
-                    # Fotoğrafı kaydet
-                    if face_roi.size > 0 and face_roi.shape[0] > 0 and face_roi.shape[1] > 0:
-                        try:
-                            safe_name = name.replace(" ", "_").replace("Tanımlanmamış", "Unknown")
-                            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
-                            filename = f"faces/{safe_name}.jpg"
-                            os.makedirs(os.path.dirname(filename), exist_ok=True)
-                            cv2.imwrite(filename, face_roi)
-                        except Exception as e:
-                            print(f"Yüz fotoğrafı kaydedilirken hata oluştu: {e}")
+            # Bu izlerin saç ve göz bölgeleri tek çağrıda işlenir
+            color_boxes = []
+            for track in stale:
+                x, y, w, h = track.detection.box
+                color_boxes.append((x, max(0, y - int(h * 0.4)), min(frame.shape[1], x + w), y))
+                if track.detection.eyes:
+                    ex, ey, ew, eh = track.detection.eyes[0]
+                    color_boxes.append((ex, ey, ex + ew, ey + eh))
+                else:
+                    color_boxes.append((0, 0, 0, 0))
+            with stage_timer.span("colors"):
+                colors = color_engine.dominant_colors(frame, color_boxes, to_rgb=False)
+            
+            # Duygu modeli bu izlerin kesitleri için tek seferde çalışır (yük altında yalnızca yeni yüzler)
+            if "emotion" in quality_governor.settings["actions"]:
+                emotion_tracks = stale
+            else:
+                emotion_tracks = [track for track in stale if track.result is None]
+            crops = [track.detection.crop for track in emotion_tracks]
+            with stage_timer.span("emotion"):
+                analyzed = analyze_emotions(crops) if crops else []
+            emotions = dict(zip((track.track_id for track in emotion_tracks), analyzed))
+            
+            # Kimlik: embedding yalnızca yeni izlerde, süresi dolan veya güveni düşük eşleşmelerde hesaplanır
+            now = time.monotonic()
+            identity_cache.expire(now)
+            verify = [track for track in tracks if identity_cache.needs_verification(track, now)]
+            if verify and not len(face_index):
+                # Galeri boşken Facenet çalıştırılmaz; kayıt veya yükleme sonrası önbellek yeniden doğrulatılır
+                for track in verify:
+                    identity_cache.store(track, "Tanımlanmamış", None, None, now)
+                    if track.result is not None:
+                        track.result["name"] = "Tanımlanmamış"
+            elif verify:
+                with stage_timer.span("identity"):
+                    embeddings = get_face_embeddings([track.detection.crop for track in verify])
+                    matches = match_faces(embeddings)
+                for track, embedding, (name, distance) in zip(verify, embeddings, matches):
+                    identity_cache.store(track, name, embedding, distance, now)
+                    if track.result is not None:
+                        track.result["name"] = name
+            
+            for i, track in enumerate(stale):
+                detection = track.detection
+                x, y, w, h = detection.box
+                
+                # Hizalanmış yüz kesiti
+                face_roi = detection.crop
+                
+                # Kimlik önbellekten, duygu toplu çıkarımdan
+                entry = identity_cache.get(track)
+                name = entry.name if entry is not None else "Tanımlanmamış"
+                emotion = emotions.get(track.track_id) or track.result["emotion"]
+                
+                # Saç ve göz rengi (tespit aşamasındaki kutulardan)
+                hair_name = classify_color(colors[2 * i]) if y > 0 else "Tespit Edilemedi"
+                eye_name = classify_color(colors[2 * i + 1]) if detection.eyes else "Tespit Edilemedi"
+                
+                face_tracker.store(track, {"name": name, "emotion": emotion, "hair": hair_name, "eye": eye_name})
+                
+                # Fotoğraf arka planda kaydedilir (kimlik başına hız sınırı ve kalite denetimiyle)
+                crop_archiver.submit(name, face_roi)
+            
+            # Tüm görünen izler önbellekteki sonuçlarla çizilir
+            draw_started = time.perf_counter()
+            for track in tracks:
+                x, y, w, h = track.box
+                info = track.result
+                
+                # Yüz çevresine dikdörtgen çiz
+                box_color = (255, 255, 0) if info["name"] == "Tanımlanmamış" else (0, 255, 0)
+                cv2.rectangle(frame, (x, y), (x+w, y+h), box_color, 2)
+                
+                # Bilgileri ekrana yazdır
+                cv2.putText(frame, f"Isim: {info['name']} #{track.track_id}", (x, y-30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255,255,255), 2)
+                cv2.putText(frame, f"Duygu: {info['emotion']}", (x, y-10), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0,255,0), 2)
+                cv2.putText(frame, f"Saç: {info['hair']}", (x, y + h + 20), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0,0,255), 2)
+                cv2.putText(frame, f"Göz: {info['eye']}", (x, y + h + 40), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255,0,255), 2)
+            if stage_timer.enabled:
+                stage_timer.record("draw", time.perf_counter() - draw_started)
         except Exception as e:
             print(f"DeepFace analiz hatası: {e}")
 
-        # Görüntüyü Tkinter'a aktar
-        img_bgr = frame
-        img_rgb = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2RGB)
-        img = Image.fromarray(img_rgb)
-        
-        img_width, img_height = img.size
-        display_width = 960
-        display_height = 540
-        
-        if img_width > 0 and img_height > 0:
-            ratio = min(display_width / img_width, display_height / img_height)
-            new_width = int(img_width * ratio)
-            new_height = int(img_height * ratio)
-            if new_width > 0 and new_height > 0:
-                 img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-            else:
-                 img = Image.new('RGB', (display_width, display_height), color = (0, 0, 0))
+        frame_time = time.perf_counter() - frame_started
+        quality_governor.observe(frame_time)
+        if stage_timer.enabled:
+            stage_timer.record("frame", frame_time)
+            draw_hud(frame, stage_timer.snapshot(), [f"Yüz: {len(face_tracker.tracks)}", quality_governor.status()])
 
-        imgtk = ImageTk.PhotoImage(image=img)
-        label.config(image=imgtk)
-        label.image = imgtk
-        label.update()
+        # Görüntü Tk döngüsünde çizilir (yalnızca en son kare tutulur)
+        preview.submit(frame)
 
     # Döngü bittiğinde kaynakları serbest bırak
     if cap is not None and cap.isOpened():
@@ -356,47 +385,90 @@ def camera_loop():
         cap = None
     cv2.destroyAllWindows()
 
-# --- Arayüz ---
-app = Tk()
-app.title("DeepFace ile Yüz, Saç, Göz ve Duygu Analizi + Tanıma")
-app.geometry("1024x700")
-
-# Video akışını gösterecek label
-label = Label(app)
-label.pack(pady=5)
-
-# İsim girişi ve Kayıt düğmesi için Frame
-control_frame = Frame(app)
-control_frame.pack(pady=5)
-
-name_label = Label(control_frame, text="Kayıt Edilecek İsim:", font="Arial 12")
-name_label.pack(side=LEFT, padx=5)
-
-name_entry = Entry(control_frame, font="Arial 12", width=20)
-name_entry.pack(side=LEFT, padx=5)
-
-enroll_button = Button(control_frame, text="Bu Yüzü Kaydet", font="Arial 12", command=enroll_face)
-enroll_button.pack(side=LEFT, padx=5)
-
-# Kamera Aç/Kapat düğmesi
-btn = Button(app, text="Kamerayı Aç", font="Arial 14", command=toggle)
-btn.pack(pady=5)
-
-# Durum mesajları için label
-status_label = Label(app, text="Uygulama Başlatıldı", font="Arial 12", fg="black")
-status_label.pack(pady=5)
-
-# Uygulama başlatıldığında bilinen yüzleri yükle
-load_known_faces()
-
-# Tkinter ana döngüsü
-app.mainloop()
+def toggle_metrics():
+    """Aşama ölçümünü, kare üstü HUD'u ve metrik dosyasına periyodik yazmayı açar/kapatır."""
+    global metrics_sink
+    if metrics_sink is not None:
+        stage_timer.enabled = False
+        metrics_sink.stop()
+        metrics_sink = None
+        status_label.config(text=f"Performans ölçümü kapatıldı ({METRICS_FILE})", fg="black")
+        return
+    stage_timer.reset()
+    stage_timer.enabled = True
+    metrics_sink = MetricsFileSink(stage_timer, METRICS_FILE, interval=5.0, extra=lambda: {"tracker": face_tracker.stats()})
+    status_label.config(text=f"Performans ölçümü açık ({METRICS_FILE})", fg="black")
 
-# Program kapatılırken kaynakları serbest bırak
-running = False
-time.sleep(0.1)
-if cap is not None and cap.isOpened():
-    cap.release()
-    cap = None
-cv2.destroyAllWindows()
-print("Program kapatıldı.")
\ No newline at end of file
+# --- Arayüz ---
+def main():
+    """Arayüzü kurar ve çalıştırır (modül, benchmark vb. için pencere açmadan içe aktarılabilir)."""
+    global running, cap, label, preview, btn, name_entry, enroll_button, status_label, crop_archiver
+
+    # Yüz fotoğraflarını kamera döngüsünü bekletmeden yazan arka plan aşaması
+    crop_archiver = CropArchiver(
+        FACES_FOLDER, min_interval=FACE_CROP_INTERVAL,
+        packed_path=os.path.join(FACES_FOLDER, "faces.pack") if FACE_CROP_PACKED else None
+    )
+
+    app = Tk()
+    app.title("DeepFace ile Yüz, Saç, Göz ve Duygu Analizi + Tanıma")
+    app.geometry("1024x700")
+
+    # Video akışını gösterecek label
+    label = Label(app)
+    label.pack(pady=5)
+    preview = PreviewRenderer(app, label, (960, 540), timer=stage_timer)
+    preview.start()
+
+    # İsim girişi ve Kayıt düğmesi için Frame
+    control_frame = Frame(app)
+    control_frame.pack(pady=5)
+
+    name_label = Label(control_frame, text="Kayıt Edilecek İsim:", font="Arial 12")
+    name_label.pack(side=LEFT, padx=5)
+
+    name_entry = Entry(control_frame, font="Arial 12", width=20)
+    name_entry.pack(side=LEFT, padx=5)
+
+    enroll_button = Button(control_frame, text="Bu Yüzü Kaydet", font="Arial 12", command=enroll_face)
+    enroll_button.pack(side=LEFT, padx=5)
+
+    # Kamera Aç/Kapat düğmesi
+    btn = Button(app, text="Kamerayı Aç", font="Arial 14", command=toggle)
+    btn.pack(pady=5)
+
+    # Aşama süreleri HUD'u ve metrik dosyası
+    metrics_check = Checkbutton(app, text="Performans HUD", font="Arial 10", command=toggle_metrics)
+    metrics_check.pack(pady=2)
+
+    # Durum mesajları için label
+    status_label = Label(app, text="Uygulama Başlatıldı", font="Arial 12", fg="black")
+    status_label.pack(pady=5)
+
+    # Model yükleme göstergesi
+    model_status_label = Label(app, font="Arial 10")
+    model_status_label.pack(pady=2)
+
+    # Bilinen yüzler arka planda yüklenir; pencere beklemeden açılır
+    threading.Thread(target=load_known_faces, daemon=True).start()
+    model_warmup.start()
+    attach_status_label(model_status_label, model_warmup)
+
+    # Tkinter ana döngüsü
+    app.mainloop()
+
+    # Program kapatılırken kaynakları serbest bırak
+    running = False
+    time.sleep(0.1)
+    if cap is not None and cap.isOpened():
+        cap.release()
+        cap = None
+    cv2.destroyAllWindows()
+    crop_archiver.stop()
+    if metrics_sink is not None:
+        metrics_sink.stop()
+    known_faces_store.close()
+    print("Program kapatıldı.")
+
+if __name__ == "__main__":
+    main()